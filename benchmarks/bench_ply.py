@@ -0,0 +1,66 @@
+"""Benchmark the NumPy PLY writer and reader, and Open3D if it is installed.
+
+Usage: python benchmarks/bench_ply.py [--vertices 100000 1000000]
+"""
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+
+import numpy as np
+from pyviz3d import ply
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def write_open3d(path, vertices, triangles, normals, colors):
+    import open3d as o3d
+    mesh = o3d.geometry.TriangleMesh()
+    mesh.vertices = o3d.utility.Vector3dVector(vertices)
+    mesh.triangles = o3d.utility.Vector3iVector(triangles)
+    mesh.vertex_normals = o3d.utility.Vector3dVector(normals)
+    mesh.vertex_colors = o3d.utility.Vector3dVector(colors / 255.0)
+    o3d.io.write_triangle_mesh(path, mesh)
+
+
+def read_open3d(path):
+    import open3d as o3d
+    o3d.io.read_triangle_mesh(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--vertices', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    has_open3d = importlib.util.find_spec('open3d') is not None
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'mesh.ply')
+    print("%10s %8s %12s %12s %12s %12s" % ('vertices', 'MB', 'write MB/s', 'read MB/s', 'o3d write', 'o3d read'))
+    rng = np.random.default_rng(0)
+    for num_vertices in args.vertices:
+        vertices = rng.random((num_vertices, 3))
+        normals = rng.random((num_vertices, 3))
+        colors = rng.integers(0, 256, (num_vertices, 3), dtype=np.uint8)
+        triangles = rng.integers(0, num_vertices, (2 * num_vertices, 3))
+        write_seconds = timed(ply.write_mesh, path, vertices, triangles, normals, colors)
+        megabytes = os.path.getsize(path) / 1e6
+        read_seconds = timed(ply.read_ply, path)
+        open3d_columns = ('-', '-')
+        if has_open3d:
+            open3d_write = timed(write_open3d, path, vertices, triangles, normals, colors)
+            open3d_read = timed(read_open3d, path)
+            open3d_columns = ('%.1f' % (megabytes / open3d_write), '%.1f' % (megabytes / open3d_read))
+        print("%10d %8.1f %12.1f %12.1f %12s %12s" % (
+            num_vertices, megabytes, megabytes / write_seconds, megabytes / read_seconds, *open3d_columns))
+        os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
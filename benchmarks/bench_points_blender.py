@@ -0,0 +1,78 @@
+"""Benchmark exporting point clouds for Blender against the Open3D sphere concatenation.
+
+Times the vertex-only PLY of Points.write_blender(), and a mesh with one
+sphere per point built from a single template as PLY. If Open3D is
+installed, the previous per-point create_sphere() loop is timed on the
+smaller clouds as well.
+
+Usage: python benchmarks/bench_points_blender.py [--points 10000 100000 1000000]
+"""
+import argparse
+import importlib.util
+import os
+import tempfile
+import time
+
+import numpy as np
+from pyviz3d import ply
+from pyviz3d import primitives
+from pyviz3d.points import Points
+
+OPEN3D_MAX_POINTS = 5000  # The loop grows one mesh point by point and gets slow quickly
+
+
+def write_sphere_mesh(path, positions, colors, radius, resolution):
+    vertices, triangles = primitives.spheres_mesh(positions, radius, resolution)
+    num_template_vertices = len(vertices) // max(len(positions), 1)
+    normals = (vertices - np.repeat(positions, num_template_vertices, axis=0)) / radius
+    ply.write_mesh(path, vertices, triangles, normals, np.repeat(colors, num_template_vertices, axis=0))
+
+
+def write_open3d_spheres(path, positions, colors, radius, resolution):
+    import open3d as o3d
+    mesh = o3d.geometry.TriangleMesh()
+    for position, color in zip(positions, colors):
+        sphere = o3d.geometry.TriangleMesh.create_sphere(radius=radius, resolution=resolution)
+        sphere.translate(position)
+        sphere.paint_uniform_color(color / 255.0)
+        mesh += sphere
+    o3d.io.write_triangle_mesh(path, mesh)
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--resolution', type=int, default=3)
+    args = parser.parse_args()
+    has_open3d = importlib.util.find_spec('open3d') is not None
+
+    radius = 0.025
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'points.ply')
+    print("%10s %16s %10s %16s %10s %12s" % (
+        'points', 'vertex-only [s]', 'us/point', 'sphere mesh [s]', 'us/point', 'open3d [s]'))
+    rng = np.random.default_rng(0)
+    for num_points in args.points:
+        positions = rng.random((num_points, 3), dtype=np.float32)
+        colors = rng.integers(0, 255, (num_points, 3), dtype=np.uint8)
+        points = Points(positions, colors, None, radius * 1000, args.resolution, True, 1.0)
+        vertex_seconds = timed(points.write_blender, path)
+        mesh_seconds = timed(write_sphere_mesh, path, positions, colors, radius, args.resolution)
+        open3d_seconds = '-'
+        if has_open3d and num_points <= OPEN3D_MAX_POINTS:
+            open3d_seconds = '%.3f' % timed(write_open3d_spheres, path, positions, colors, radius, args.resolution)
+        print("%10d %16.4f %10.3f %16.4f %10.3f %12s" % (
+            num_points, vertex_seconds, vertex_seconds / num_points * 1e6,
+            mesh_seconds, mesh_seconds / num_points * 1e6, open3d_seconds))
+        os.remove(path)
+    os.rmdir(directory)
+
+
+if __name__ == '__main__':
+    main()
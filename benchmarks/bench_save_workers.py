@@ -0,0 +1,60 @@
+"""Benchmark how Visualizer.save() scales with the number of writer threads.
+
+Saves with 1, 2, 4, 8 and os.cpu_count() workers and reports the speedup over one.
+
+Usage: python benchmarks/bench_save_workers.py [--elements 50 200] [--points 50000] [--repeats 3]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import pyviz3d as viz
+
+
+def build_scene(num_elements, num_points):
+    v = viz.Visualizer()
+    rng = np.random.default_rng(0)
+    for i in range(num_elements):
+        positions = rng.random((num_points, 3), dtype=np.float32)
+        colors = (rng.random((num_points, 3)) * 255).astype(np.uint8)
+        if i % 2:
+            v.add_lines('Lines;%d' % i, positions, positions + 0.01, colors)
+        else:
+            v.add_points('Points;%d' % i, positions, colors)
+    return v
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--elements', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--points', type=int, default=50000)
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, cpu_count})
+    directory = tempfile.mkdtemp()
+    print("%d cores, %d points per element" % (cpu_count, args.points))
+    print("%9s %8s %10s %8s" % ('elements', 'workers', 'seconds', 'speedup'))
+    try:
+        for num_elements in args.elements:
+            v = build_scene(num_elements, args.points)
+            baseline = None
+            for workers in worker_counts:
+                times = []
+                for _ in range(args.repeats):
+                    start = time.perf_counter()
+                    v.save(os.path.join(directory, 'scene'), verbose=False, workers=workers)
+                    times.append(time.perf_counter() - start)
+                seconds = min(times)
+                baseline = baseline or seconds
+                print("%9d %8d %10.3f %7.2fx" % (num_elements, workers, seconds, baseline / seconds))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""Benchmark vectorized superquadric meshing against the previous loop-based version.
+
+Usage: python benchmarks/bench_superquadric.py [--resolutions 20 50 100]
+"""
+import argparse
+import time
+
+import numpy as np
+from pyviz3d.superquadric import superquadric_mesh
+from reference_superquadric import loop_superquadric_mesh
+
+SHAPES = {
+    'ellipsoid': (np.array([1.0, 0.6, 0.4]), np.array([1.0, 1.0, 1.0]), np.zeros(2), np.zeros(6)),
+    'box-like': (np.array([0.5, 0.5, 0.3]), np.array([0.1, 0.1, 0.1]), np.zeros(2), np.zeros(6)),
+    'tapered, bent': (np.array([0.3, 0.4, 1.0]), np.array([0.5, 0.8, 0.5]), np.array([0.3, -0.2]),
+                      np.array([0.5, 0.3, 0.0, 0.0, 0.2, 1.0])),
+}
+
+
+def best_time(function, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return min(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--resolutions', type=int, nargs='+', default=[20, 50, 100])
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    print("%-14s %10s %9s %10s %12s %9s %12s" % (
+        'shape', 'resolution', 'vertices', 'loops [s]', 'numpy [s]', 'speedup', 'max diff'))
+    for shape, (scalings, exponents, tapering, bending) in SHAPES.items():
+        for resolution in args.resolutions:
+            loop_seconds, (loop_vertices, loop_faces) = best_time(
+                lambda: loop_superquadric_mesh(scalings, exponents, resolution, tapering, bending), 1)
+            numpy_seconds, (vertices, faces) = best_time(
+                lambda: superquadric_mesh(scalings, exponents, resolution, tapering, bending), args.repeats)
+            assert np.array_equal(faces, loop_faces)
+            print("%-14s %10d %9d %10.3f %12.4f %8.0fx %12.2e" % (
+                shape, resolution, len(vertices), loop_seconds, numpy_seconds, loop_seconds / numpy_seconds,
+                np.abs(vertices - loop_vertices).max()))
+
+
+if __name__ == '__main__':
+    main()
@@ -25,6 +25,12 @@ def main():
                 stroke_width=0.04,
                 head_width=0.1)
 
+    # Add a whole field of arrows at once, they are stored in one file and drawn with instancing.
+    x, y = np.meshgrid(np.linspace(-1, 1, 20), np.linspace(-1, 1, 20))
+    starts = np.stack([x.ravel(), y.ravel(), np.full(x.size, -0.5)], axis=1)
+    ends = starts + 0.08 * np.stack([-starts[:, 1], starts[:, 0], np.zeros(x.size)], axis=1)
+    v.add_arrows('Arrow_field', starts, ends, stroke_width=0.005, head_width=0.015)
+
     v.save('examples_output/example_arrow')
 
 if __name__ == '__main__':
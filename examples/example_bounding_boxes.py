@@ -36,6 +36,16 @@ def main():
                            color=np.array([255, 255, 0]),
                            alpha=0.1,
                            edge_width=0.02)
+
+    # Add many bounding boxes at once, they are stored in one file and drawn with instancing.
+    num_boxes = 1000
+    rng = np.random.default_rng(0)
+    v.add_bounding_boxes('Boxes',
+                         positions=rng.uniform(-5.0, 5.0, size=(num_boxes, 3)) + np.array([0.0, 0.0, 8.0]),
+                         sizes=rng.uniform(0.1, 0.5, size=(num_boxes, 3)),
+                         rotations=np.array([viz.euler_to_quaternion(0.0, 0.0, a) for a in rng.uniform(0, np.pi, num_boxes)]),
+                         colors=rng.integers(0, 255, size=(num_boxes, 3)),
+                         edge_width=0.005)
     v.save('examples_output/example_bounding_boxes')
 
 
@@ -4,3 +4,4 @@ from .visualizer import Visualizer
 from .visualizer import euler_to_quaternion
 from .blender_config import BlenderConfig
 from .superquadric import Superquadric
+from .blender_render import BlenderRenderPool
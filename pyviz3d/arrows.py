@@ -0,0 +1,63 @@
+"""Arrows class i.e. a field of arrows rendered with instancing."""
+from . import encoding
+from . import ply
+from . import primitives
+
+
+class Arrows:
+    """Set of 3D arrows sharing alpha, stroke width and head width."""
+
+    def __init__(self, starts, ends, colors, alpha, stroke_width, head_width, visible):
+        """Initialize the arrows.
+
+        Args:
+            starts: Nx3 float32 start positions.
+            ends: Nx3 float32 end positions.
+            colors: Nx3 uint8 RGB colors.
+            alpha: Transparency value in [0, 1].
+            stroke_width: Width of the arrow shafts.
+            head_width: Width of the arrow heads.
+            visible: Whether the arrows are visible.
+        """
+        self.starts = starts
+        self.ends = ends
+        self.colors = colors
+        self.alpha = alpha
+        self.stroke_width = stroke_width
+        self.head_width = head_width
+        self.visible = visible
+
+    def get_properties(self, binary_filename):
+        """Return JSON-serializable properties for the arrows.
+
+        Args:
+            binary_filename: Name of the binary data file containing the arrows.
+
+        Returns:
+            A dict of properties for the web viewer.
+        """
+        json_dict = {
+            'type': 'arrows',
+            'num_arrows': self.starts.shape[0],
+            'alpha': float(self.alpha),
+            'stroke_width': float(self.stroke_width),
+            'head_width': float(self.head_width),
+            'visible': self.visible,
+            'binary_filename': binary_filename}
+        return json_dict
+
+    def write_binary(self, path):
+        """Write starts, ends and colors to a binary file."""
+        with open(path, "wb") as f:
+            for array in (self.starts, self.ends, self.colors):
+                encoding.write_array(f, array)
+
+    def write_blender(self, path):
+        """Write a Blender-friendly mesh of all arrows as binary PLY.
+
+        The arrows have the same shape as those of Arrow.write_blender(), built
+        from one cylinder and one cone template placed for all arrows at once.
+        """
+        vertices, triangles, arrow_ids = primitives.arrows_mesh(
+            self.starts, self.ends, self.stroke_width, self.head_width)
+        ply.write_mesh(path, vertices, triangles, primitives.vertex_normals(vertices, triangles), self.colors[arrow_ids])
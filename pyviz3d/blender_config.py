@@ -6,7 +6,7 @@ from typing import Dict, List, Optional
 @dataclass
 class BlenderConfig:
     """Settings used when exporting and rendering with Blender."""
-    blender_path: str 
+    blender_path: str  # Blender executable, split like a shell command line, e.g. '~/blender --factory-startup'.
     render: bool = True  # Whether or not to render in blender
     render_resolution: List[int] = field(default_factory=lambda: [800, 600])
     render_film_transparent: bool = True
@@ -17,6 +17,9 @@ class BlenderConfig:
     animation_look_at_path: Optional[List[List[float]]] = field(default_factory=lambda: None)  # Look-at path points; use one point for a fixed target.
     cycles_samples: int = 10  # Number of cycles samples
     file_format: str = 'PNG'
+    workers: int = 1  # Number of Blender processes that render the animation frames in parallel.
+    cache_dir: Optional[str] = None  # Directory of the render cache; None re-renders on every save.
+    cache_max_bytes: int = 2 * 2**30  # Size limit of the render cache, least recently used renders are evicted.
 
     # color_mode='RGBA'
     address: Dict[str, str] = field(default_factory=lambda: {"city": "Unknown", "state": "Unknown"})
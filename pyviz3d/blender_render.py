@@ -0,0 +1,390 @@
+"""Running Blender on an exported scene, optionally with several processes in parallel."""
+
+import itertools
+import json
+import os
+import re
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import CancelledError, Future, InvalidStateError
+
+FRAME_PATTERN = re.compile(r'Fra:(\d+)')  # Blender prints this for every frame it renders
+
+
+def split_frames(num_frames, workers, first_frame=1):
+    """Split the frames into contiguous inclusive ranges of nearly equal length.
+
+    Args:
+        num_frames: Number of frames to render.
+        workers: Maximum number of ranges.
+        first_frame: Number of the first frame.
+
+    Returns:
+        List of (frame_start, frame_end) tuples.
+    """
+    workers = max(1, min(workers, num_frames))
+    ranges = []
+    frame_start = first_frame
+    for i in range(workers):
+        length = num_frames // workers + (1 if i < num_frames % workers else 0)
+        ranges.append((frame_start, frame_start + length - 1))
+        frame_start += length
+    return ranges
+
+
+def blender_args(blender_config, frame_range=None):
+    """Arguments for blender_tools.main(), passed after "--" on the Blender command line."""
+    if not blender_config.render:
+        return []
+    args = [blender_config.output_prefix]
+    if frame_range is not None:
+        args += ['--frame-start', str(frame_range[0]), '--frame-end', str(frame_range[1])]
+    return args
+
+
+def blender_executable(blender_path):
+    """Split blender_path into argv as the shell did for os.system().
+
+    Quote paths with spaces, e.g. '"~/Blender 4.2/blender" --factory-startup'.
+    A leading ~ of the executable is expanded.
+    """
+    argv = shlex.split(blender_path)
+    return [os.path.expanduser(argv[0])] + argv[1:]
+
+
+def blender_command(blender_config, frame_range=None):
+    """Command line running blender_script.py, restricted to frame_range if given."""
+    cmd = blender_executable(blender_config.blender_path) + ['--background', '--python', 'blender_script.py']
+    args = blender_args(blender_config, frame_range)
+    if args:
+        cmd += ['--'] + args
+    return cmd
+
+
+def stitch_animation(output_prefix):
+    """Combine the rendered frames output_prefix0001.png, ... into an .mp4 video and a .gif."""
+    output_filepath = output_prefix + '.mp4'
+    subprocess.run(["ffmpeg", "-y", "-i", f'{output_prefix}%04d.png',
+                    "-vcodec", "libx264", "-crf", "18", "-preset", "slow",
+                    "-vf", "format=yuv420p", output_filepath])
+
+    # Generate high-quality GIF using two-pass palette generation
+    # Pass 1: Generate optimal color palette from video
+    palette_path = output_prefix + '_palette.png'
+    subprocess.run(["ffmpeg", "-y", "-i", output_filepath,
+                    "-vf", "palettegen=stats_mode=diff:max_colors=256",
+                    palette_path])
+
+    # Pass 2: Use the palette with dithering for better quality
+    gif_path = output_filepath[:-3] + 'gif'
+    subprocess.run(["ffmpeg", "-y", "-i", output_filepath, "-i", palette_path,
+                    "-lavfi", "paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle",
+                    gif_path])
+
+    if os.path.exists(palette_path):
+        os.remove(palette_path)
+
+
+def run_blender(directory, blender_config, verbose=True, progress=None, timeout=None, cancel_event=None):
+    """Run Blender on the scene in directory and stitch rendered animations.
+
+    Animations are split into blender_config.workers frame ranges that render
+    in concurrent Blender processes. The output of worker i goes to
+    blender_<i>.log in directory.
+
+    Args:
+        directory: Scene directory containing blender_script.py.
+        blender_config: Blender render configuration.
+        verbose: Whether to print rendering progress.
+        progress: Optional callback progress(frame, num_started, num_frames), called
+            from a reader thread whenever Blender starts rendering a new frame.
+        timeout: Optional maximum number of seconds for rendering.
+        cancel_event: Optional threading.Event that stops rendering when set.
+
+    Returns:
+        The list of commands that were run.
+
+    Raises:
+        RuntimeError: If a Blender process exits with a non-zero code.
+        TimeoutError: If rendering takes longer than timeout seconds.
+        concurrent.futures.CancelledError: If cancel_event was set.
+    """
+    animation = blender_config.render and blender_config.animation
+    num_frames = blender_config.animation_length if animation else 1
+    if animation:
+        frame_ranges = split_frames(blender_config.animation_length, blender_config.workers)
+    else:
+        frame_ranges = [None]
+    commands = [blender_command(blender_config, frame_range) for frame_range in frame_ranges]
+
+    frames = set()
+    lock = threading.Lock()
+
+    def follow(process, log):
+        for line in process.stdout:
+            log.write(line)
+            match = FRAME_PATTERN.search(line)
+            if match:
+                with lock:
+                    if match.group(1) in frames:
+                        continue
+                    frames.add(match.group(1))
+                    num_started = len(frames)
+                if verbose:
+                    print('Rendering frame %d/%d' % (num_started, num_frames))
+                if progress is not None:
+                    progress(int(match.group(1)), num_started, num_frames)
+
+    deadline = None if timeout is None else time.time() + timeout
+    cancel_event = cancel_event or threading.Event()
+    processes, logs, readers = [], [], []
+    try:
+        for i, cmd in enumerate(commands):
+            logs.append(open(os.path.join(directory, 'blender_%d.log' % i), 'w'))
+            processes.append(subprocess.Popen(cmd, cwd=directory, stdout=subprocess.PIPE,
+                                              stderr=subprocess.STDOUT, text=True))
+            readers.append(threading.Thread(target=follow, args=(processes[-1], logs[-1]), daemon=True))
+            readers[-1].start()
+        while any(process.poll() is None for process in processes):
+            if cancel_event.wait(0.05):
+                raise CancelledError("Blender rendering of %s was cancelled" % directory)
+            if deadline is not None and time.time() > deadline:
+                raise TimeoutError("Blender rendering of %s did not finish within %s seconds" % (directory, timeout))
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+            process.wait()
+        for reader in readers:
+            reader.join()
+        for log in logs:
+            log.close()
+
+    failed = [i for i, process in enumerate(processes) if process.returncode != 0]
+    if failed:
+        raise RuntimeError("Blender exited with code %d, see %s" % (
+            processes[failed[0]].returncode, os.path.join(directory, 'blender_%d.log' % failed[0])))
+    if animation:
+        stitch_animation(os.path.join(directory, blender_config.output_prefix))
+    return commands
+
+
+class RenderFuture(Future):
+    """Future of a Blender render that stops the render when cancelled.
+
+    Unlike a plain Future, cancel() also works while the render runs. The
+    future stays pending until the render finishes, so cancel() succeeds
+    and cancelled() is True at any time before that. Cancelling kills the
+    Blender processes, or withdraws the job from a render pool queue.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """Cancel the render. Returns False if it already finished."""
+        if not super().cancel():
+            return False
+        self.cancel_event.set()
+        return True
+
+
+def render_async(directory, blender_config, verbose=False, progress=None, timeout=None, render_pool=None):
+    """Render the scene in directory in a background thread.
+
+    Args:
+        directory: Scene directory containing blender_script.py.
+        blender_config: Blender render configuration.
+        verbose: Whether to print rendering progress.
+        progress: Optional frame progress callback, see run_blender().
+        timeout: Optional maximum number of seconds for rendering.
+        render_pool: Optional BlenderRenderPool to render with instead of new Blender processes.
+
+    Returns:
+        RenderFuture whose result is the list of commands run by run_blender(),
+        or the result dict of the pool job.
+    """
+    future = RenderFuture()
+
+    def render():
+        if future.cancelled():
+            return
+        try:
+            try:
+                if render_pool is None:
+                    result = run_blender(directory, blender_config, verbose, progress, timeout, future.cancel_event)
+                else:
+                    result = render_pool.render(directory, blender_config, timeout, future.cancel_event)
+                    if blender_config.render and blender_config.animation:
+                        stitch_animation(os.path.join(directory, blender_config.output_prefix))
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass  # Cancelled while rendering, the outcome is discarded
+
+    threading.Thread(target=render, daemon=True).start()
+    return future
+
+
+WORKER_SCRIPT = """import sys
+sys.path.append(%r)
+import blender_tools
+blender_tools.worker_loop(%r)
+"""
+
+
+class BlenderRenderPool:
+    """Long-running Blender processes that render scene directories from a file queue.
+
+    Starting Blender is expensive, so the workers stay alive and run
+    blender_tools.worker_loop(), which renders one submitted scene after the
+    other. Jobs and results are json files in queue_dir, see worker_loop().
+    """
+
+    def __init__(self, blender_path, num_workers=1, queue_dir=None, poll_interval=0.1):
+        """Start the Blender workers.
+
+        Args:
+            blender_path: Path of the Blender executable, optionally followed by
+                Blender options, see blender_executable().
+            num_workers: Number of Blender processes.
+            queue_dir: Directory of the job queue. Defaults to a temporary directory.
+            poll_interval: Seconds between checks for new jobs and results.
+        """
+        self.queue_dir = os.path.abspath(queue_dir) if queue_dir else tempfile.mkdtemp(prefix='pyviz3d_queue_')
+        self.poll_interval = poll_interval
+        for subdirectory in ('pending', 'running', 'done'):
+            os.makedirs(os.path.join(self.queue_dir, subdirectory), exist_ok=True)
+        if os.path.exists(os.path.join(self.queue_dir, 'stop')):
+            os.remove(os.path.join(self.queue_dir, 'stop'))
+        self._job_ids = itertools.count()
+        self._abandoned = set()  # Ids of timed out jobs that a worker still runs, their results are deleted
+
+        src_directory = os.path.realpath(os.path.join(os.path.dirname(__file__), 'src'))
+        script_path = os.path.join(self.queue_dir, 'worker_script.py')
+        with open(script_path, 'w') as f:
+            f.write(WORKER_SCRIPT % (src_directory, self.queue_dir))
+        self.workers = []
+        for i in range(num_workers):
+            with open(os.path.join(self.queue_dir, 'worker_%d.log' % i), 'w') as log:
+                self.workers.append(subprocess.Popen(
+                    blender_executable(blender_path) + ['--background', '--python', script_path],
+                    cwd=self.queue_dir, stdout=log, stderr=subprocess.STDOUT))
+
+    def submit(self, directory, blender_config):
+        """Queue the exported scene in directory for rendering.
+
+        Args:
+            directory: Scene directory containing nodes.json and blender_config.json.
+            blender_config: Blender render configuration of the scene.
+
+        Returns:
+            Job id to pass to result().
+        """
+        job_id = '%020d_%06d' % (time.time_ns(), next(self._job_ids))
+        job = {'directory': os.path.abspath(directory), 'args': blender_args(blender_config)}
+        # Written outside of pending and then moved, so workers never read a partial job
+        tmp_path = os.path.join(self.queue_dir, job_id + '.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(job, f)
+        os.replace(tmp_path, os.path.join(self.queue_dir, 'pending', job_id + '.json'))
+        return job_id
+
+    def result(self, job_id, timeout=None):
+        """Wait for a job to finish.
+
+        Args:
+            job_id: Id returned by submit().
+            timeout: Optional maximum number of seconds to wait.
+
+        Returns:
+            Dict with the id of the worker process and the render time in seconds.
+
+        Raises:
+            RuntimeError: If the job failed or all workers exited.
+            TimeoutError: If the job did not finish within timeout seconds.
+        """
+        result_path = os.path.join(self.queue_dir, 'done', job_id + '.json')
+        deadline = None if timeout is None else time.time() + timeout
+        while not os.path.exists(result_path):
+            if all(worker.poll() is not None for worker in self.workers):
+                raise RuntimeError("All Blender workers exited, see the logs in " + self.queue_dir)
+            if deadline is not None and time.time() > deadline:
+                raise TimeoutError("Render job %s did not finish within %s seconds" % (job_id, timeout))
+            time.sleep(self.poll_interval)
+        self._remove_abandoned_results()
+        with open(result_path) as f:
+            result = json.load(f)
+        os.remove(result_path)
+        if result['status'] != 'ok':
+            raise RuntimeError("Render job %s failed:\n%s" % (job_id, result['error']))
+        return result
+
+    def cancel(self, job_id):
+        """Remove a job from the queue. Returns False if a worker already claimed it."""
+        try:
+            os.remove(os.path.join(self.queue_dir, 'pending', job_id + '.json'))
+            return True
+        except OSError:
+            return False
+
+    def _remove_abandoned_results(self):
+        for job_id in list(self._abandoned):
+            try:
+                os.remove(os.path.join(self.queue_dir, 'done', job_id + '.json'))
+                self._abandoned.discard(job_id)
+            except FileNotFoundError:
+                pass  # Still running
+
+    def render(self, directory, blender_config, timeout=None, cancel_event=None):
+        """Submit a scene and wait for its result.
+
+        Args:
+            directory: Scene directory containing nodes.json and blender_config.json.
+            blender_config: Blender render configuration of the scene.
+            timeout: Optional maximum number of seconds to wait.
+            cancel_event: Optional threading.Event that withdraws the job while it is still queued.
+
+        Returns:
+            The result dict, see result().
+
+        Raises:
+            concurrent.futures.CancelledError: If the job was withdrawn.
+            TimeoutError: If the job did not finish within timeout seconds. The
+                message tells whether the job was removed from the queue or still
+                runs in a worker, whose result is then deleted by result() or close().
+        """
+        job_id = self.submit(directory, blender_config)
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            try:
+                return self.result(job_id, self.poll_interval)
+            except TimeoutError:
+                if cancel_event is not None and cancel_event.is_set() and self.cancel(job_id):
+                    raise CancelledError("Render job %s was cancelled" % job_id)
+                if deadline is not None and time.time() > deadline:
+                    if self.cancel(job_id):
+                        state = "it was removed from the queue"
+                    else:
+                        self._abandoned.add(job_id)
+                        state = "a worker is still rendering it, its result will be discarded"
+                    raise TimeoutError("Render job %s did not finish within %s seconds, %s" % (job_id, timeout, state))
+
+    def close(self, timeout=None):
+        """Let the workers finish the queued jobs, wait for them to exit and delete abandoned results."""
+        open(os.path.join(self.queue_dir, 'stop'), 'w').close()
+        for worker in self.workers:
+            worker.wait(timeout)
+        self._remove_abandoned_results()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
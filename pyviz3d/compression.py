@@ -0,0 +1,81 @@
+"""Precompressed sidecar files for the binary payloads."""
+
+import gzip
+import importlib.util
+import time
+import zlib
+
+import numpy as np
+
+COMPRESSION_SUFFIXES = {
+    'zlib': '.zlib',
+    'gzip': '.gz',
+    'brotli': '.br',
+}
+SHUFFLE_STRIDE = 4  # Width of float32, int32 and of the padded blocks in the payloads.
+
+
+def check_compression(compression):
+    """Raise a ValueError for unknown compression methods and an ImportError if brotli is missing.
+
+    Called before anything is written, so a missing module does not abort a save halfway.
+    """
+    if compression is not None and compression not in COMPRESSION_SUFFIXES:
+        raise ValueError("Unknown compression %r, expected one of %s" % (compression, list(COMPRESSION_SUFFIXES)))
+    if compression == 'brotli' and importlib.util.find_spec('brotli') is None:
+        raise ImportError("compression='brotli' requires the brotli package, "
+                          "install it with: pip install pyviz3d[brotli]")
+
+
+def shuffle_bytes(data, stride=SHUFFLE_STRIDE):
+    """Group byte k of every stride-wide word into plane k.
+
+    The high bytes of neighbouring floats and integers are often equal, so
+    the planes compress much better than the interleaved words.
+    """
+    data = data + b'\0' * (-len(data) % stride)
+    return np.frombuffer(data, dtype=np.uint8).reshape(-1, stride).T.tobytes()
+
+
+def compress_file(path, compression):
+    """Write a compressed copy of a binary file next to it.
+
+    zlib and gzip sidecars are byte-shuffled and decoded by the viewer.
+    brotli sidecars hold the unmodified payload. The viewer never requests
+    them, a web server has to serve them in place of the .bin file with
+    Content-Encoding: br, e.g. nginx with brotli_static.
+
+    Args:
+        path: Path of the binary file.
+        compression: One of COMPRESSION_SUFFIXES.
+
+    Returns:
+        Tuple (sidecar path, raw size, compressed size, seconds).
+    """
+    check_compression(compression)
+    with open(path, 'rb') as f:
+        data = f.read()
+    start = time.perf_counter()
+    if compression == 'zlib':
+        compressed = zlib.compress(shuffle_bytes(data), 6)
+    elif compression == 'gzip':
+        compressed = gzip.compress(shuffle_bytes(data), 6)
+    else:
+        import brotli
+        compressed = brotli.compress(data)
+    seconds = time.perf_counter() - start
+    sidecar_path = path + COMPRESSION_SUFFIXES[compression]
+    with open(sidecar_path, 'wb') as f:
+        f.write(compressed)
+    return sidecar_path, len(data), len(compressed), seconds
+
+
+def compression_properties(sidecar_filename, compression):
+    """Return the properties the viewer needs to load a sidecar file."""
+    if compression == 'brotli':
+        return {}
+    return {
+        'binary_compression': compression,
+        'binary_compressed_filename': sidecar_filename,
+        'binary_shuffle': SHUFFLE_STRIDE,
+    }
@@ -1,5 +1,9 @@
 """Cuboid (bounding box) scene element."""
 
+import numpy as np
+from . import ply
+from . import primitives
+
 
 class Cuboid:
     """An oriented 3D bounding box."""
@@ -50,6 +54,9 @@ class Cuboid:
         return
 
     def write_blender(self, path):
-        """Write a Blender-friendly asset for this element (not implemented)."""
-        print(type(self).__name__ + '.write_blender() not yet implemented.')
-        return
\ No newline at end of file
+        """Write the cuboid edges as a binary PLY mesh of tubes and corner spheres."""
+        vertices, triangles, _ = primitives.wire_boxes_mesh(
+            np.asarray(self.position)[np.newaxis], np.asarray(self.size)[np.newaxis],
+            np.asarray(self.rotation)[np.newaxis], self.edge_width)
+        colors = np.repeat(np.asarray(self.color)[np.newaxis], len(vertices), axis=0)
+        ply.write_mesh(path, vertices, triangles, primitives.vertex_normals(vertices, triangles), colors)
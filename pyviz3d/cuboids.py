@@ -0,0 +1,60 @@
+"""Cuboids class i.e. many bounding boxes rendered with instancing."""
+from . import encoding
+from . import ply
+from . import primitives
+
+
+class Cuboids:
+    """Set of oriented 3D bounding boxes sharing alpha and edge width."""
+
+    def __init__(self, positions, sizes, rotations, colors, alpha, edge_width, visible):
+        """Initialize the bounding boxes.
+
+        Args:
+            positions: Nx3 float32 box centers.
+            sizes: Nx3 float32 box dimensions.
+            rotations: Nx4 float32 unit quaternions [x, y, z, w].
+            colors: Nx3 uint8 RGB colors.
+            alpha: Transparency value in [0, 1].
+            edge_width: Edge line width.
+            visible: Whether the boxes are visible.
+        """
+        self.positions = positions
+        self.sizes = sizes
+        self.rotations = rotations
+        self.colors = colors
+        self.alpha = alpha
+        self.edge_width = edge_width
+        self.visible = visible
+
+    def get_properties(self, binary_filename):
+        """Return JSON-serializable properties for the bounding boxes.
+
+        Args:
+            binary_filename: Name of the binary data file containing the boxes.
+
+        Returns:
+            A dict of properties for the web viewer.
+        """
+        json_dict = {
+            'type': 'cuboids',
+            'num_cuboids': self.positions.shape[0],
+            'alpha': float(self.alpha),
+            'edge_width': float(self.edge_width),
+            'visible': self.visible,
+            'binary_filename': binary_filename}
+        return json_dict
+
+    def write_binary(self, path):
+        """Write positions, sizes, rotations and colors to a binary file."""
+        with open(path, "wb") as f:
+            for array in (self.positions, self.sizes, self.rotations, self.colors):
+                encoding.write_array(f, array)
+
+    def write_blender(self, path):
+        """Write the edges of all boxes as one binary PLY mesh of tubes and corner spheres."""
+        vertices, triangles, box_ids = primitives.wire_boxes_mesh(
+            self.positions, self.sizes, self.rotations, self.edge_width)
+        ply.write_mesh(path, vertices, triangles, primitives.vertex_normals(vertices, triangles),
+                       self.colors[box_ids])
+
@@ -0,0 +1,150 @@
+"""Compact encodings of vertex attributes in the binary payloads."""
+
+import mmap
+import os
+
+import numpy as np
+
+POSITION_ENCODINGS = {
+    'float32': np.float32,
+    'int16': np.int16,
+}
+
+NORMAL_ENCODINGS = {
+    'float32': np.float32,
+    'oct16': np.int16,
+    'oct8': np.int8,
+}
+
+
+def check_position_encoding(encoding):
+    """Raise a ValueError for unknown position encodings."""
+    if encoding not in POSITION_ENCODINGS:
+        raise ValueError("Unknown position_encoding %r, expected one of %s" % (encoding, list(POSITION_ENCODINGS)))
+
+
+def position_quantization(positions, encoding, bounds=None):
+    """Compute the dequantization parameters for a set of positions.
+
+    Quantized positions are signed integers relative to the center of the
+    bounding box, such that position = quantized * scale + offset.
+
+    Args:
+        positions: Nx3 positions.
+        encoding: One of POSITION_ENCODINGS.
+        bounds: Optional precomputed (lower, upper) corners of the bounding box.
+
+    Returns:
+        Tuple (scale, offset) of float64 arrays with shape (3,).
+    """
+    check_position_encoding(encoding)
+    if encoding == 'float32' or positions.shape[0] == 0:
+        return np.ones(3), np.zeros(3)
+    if bounds is None:
+        bounds = (positions.min(axis=0), positions.max(axis=0))
+    lower = np.asarray(bounds[0], dtype=np.float64)
+    upper = np.asarray(bounds[1], dtype=np.float64)
+    max_int = np.iinfo(POSITION_ENCODINGS[encoding]).max
+    scale = (upper - lower) / (2 * max_int)
+    scale[scale == 0] = 1.0
+    offset = (upper + lower) / 2.0
+    return scale, offset
+
+
+def encode_positions(positions, encoding, scale, offset):
+    """Quantize positions with the parameters from position_quantization()."""
+    check_position_encoding(encoding)
+    if encoding == 'float32':
+        return positions.astype(np.float32, copy=False)
+    dtype = POSITION_ENCODINGS[encoding]
+    max_int = np.iinfo(dtype).max
+    quantized = np.rint((positions - offset) / scale)
+    return np.clip(quantized, -max_int, max_int).astype(dtype)
+
+
+def check_normal_encoding(encoding):
+    """Raise a ValueError for unknown normal encodings."""
+    if encoding not in NORMAL_ENCODINGS:
+        raise ValueError("Unknown normal_encoding %r, expected one of %s" % (encoding, list(NORMAL_ENCODINGS)))
+
+
+def encode_normals(normals, encoding):
+    """Encode normals as 3 floats or as 2 signed integers of an octahedral mapping.
+
+    The octahedral mapping projects the unit sphere onto the octahedron
+    |x| + |y| + |z| = 1 and unfolds the lower half onto the corners of the
+    square [-1, 1]^2, which is then quantized to int8 or int16.
+
+    Args:
+        normals: Nx3 normals, not necessarily unit length.
+        encoding: One of NORMAL_ENCODINGS.
+
+    Returns:
+        Nx3 float32 array or Nx2 integer array.
+    """
+    check_normal_encoding(encoding)
+    if encoding == 'float32':
+        return normals.astype(np.float32, copy=False)
+    normals = normals.astype(np.float32)
+    l1_norm = np.abs(normals).sum(axis=1, keepdims=True)
+    l1_norm[l1_norm == 0] = 1.0
+    normals /= l1_norm
+    xy = normals[:, 0:2]
+    lower = normals[:, 2] < 0
+    signs = np.where(xy[lower] >= 0, 1.0, -1.0)
+    xy[lower] = (1.0 - np.abs(xy[lower][:, ::-1])) * signs
+    dtype = NORMAL_ENCODINGS[encoding]
+    max_int = np.iinfo(dtype).max
+    return np.clip(np.rint(xy * max_int), -max_int, max_int).astype(dtype)
+
+
+def padding(num_bytes, alignment=4):
+    """Zero bytes needed after a block so that the next block is aligned."""
+    return b'\0' * (-num_bytes % alignment)
+
+
+def _memmap_file_range(array):
+    """Return (filename, offset) of a contiguous array whose bytes are those of its memory-mapped file, else None.
+
+    Copy-on-write mappings (mode 'c') may differ from the file in memory, and
+    changes to shared writable mappings are flushed to the file first.
+    """
+    if not isinstance(array, np.memmap) or array.filename is None or not array.flags.c_contiguous:
+        return None
+    if array.mode not in ('r', 'r+', 'w+'):
+        return None
+    mapped = getattr(array, '_mmap', None)
+    if mapped is None or mapped.closed:
+        return None
+    if array.mode != 'r':
+        mapped.flush()
+    # np.memmap maps the file from the allocation granularity boundary below its offset
+    map_start = array.offset - array.offset % mmap.ALLOCATIONGRANULARITY
+    map_address = np.frombuffer(mapped, dtype=np.uint8).ctypes.data
+    return array.filename, map_start + array.ctypes.data - map_address
+
+
+def write_array(f, array):
+    """Write the raw bytes of an array to a binary file without copying it.
+
+    Contiguous arrays are written from their buffer directly. Arrays viewing
+    a memory-mapped file are copied between the files by the kernel where
+    os.sendfile() is available.
+    """
+    if array.size == 0:
+        return
+    file_range = _memmap_file_range(array) if hasattr(os, 'sendfile') else None
+    if file_range is not None:
+        f.flush()
+        filename, offset = file_range
+        with open(filename, 'rb') as source:
+            remaining = array.nbytes
+            while remaining > 0:
+                sent = os.sendfile(f.fileno(), source.fileno(), offset, remaining)
+                if sent == 0:
+                    raise IOError("Unexpected end of file in %s" % filename)
+                offset += sent
+                remaining -= sent
+        f.seek(0, os.SEEK_END)
+        return
+    f.write(np.ascontiguousarray(array).reshape(-1).view(np.uint8))
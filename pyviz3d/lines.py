@@ -1,11 +1,12 @@
 """Lines class e.g. to visualize normals."""
 import numpy as np
+from . import encoding
 
 
 class Lines:
     """Set of line segments defined by start and end points."""
 
-    def __init__(self, lines_start, lines_end, colors_start, colors_end, visible):
+    def __init__(self, lines_start, lines_end, colors_start, colors_end, visible, position_encoding='float32'):
         """Initialize line segments.
 
         Args:
@@ -14,6 +15,8 @@ class Lines:
             colors_start: Nx3 RGB colors for start vertices.
             colors_end: Nx3 RGB colors for end vertices.
             visible: Whether lines are visible.
+            position_encoding: 'float32', or 'int16' to quantize the positions
+                relative to their bounding box.
         """
         # Interleave start and end positions for WebGL.
         self.num_lines = lines_start.shape[0]
@@ -24,6 +27,8 @@ class Lines:
         self.colors[0::2] = colors_start
         self.colors[1::2] = colors_end
         self.visible = visible
+        self.position_encoding = position_encoding
+        self.position_scale, self.position_offset = encoding.position_quantization(self.positions, position_encoding)
 
     def get_properties(self, binary_filename):
         """Return JSON-serializable properties for this element.
@@ -38,16 +43,22 @@ class Lines:
             'type': 'lines',
             'visible': self.visible,
             'num_lines': self.num_lines,
+            'position_encoding': self.position_encoding,
             'binary_filename': binary_filename}
+        if self.position_encoding != 'float32':
+            json_dict['position_scale'] = self.position_scale.tolist()
+            json_dict['position_offset'] = self.position_offset.tolist()
         return json_dict
 
     def write_binary(self, path):
         """Write interleaved line positions and colors to binary file."""
 
-        bin_positions = self.positions.tobytes()
+        bin_positions = encoding.encode_positions(
+            self.positions, self.position_encoding, self.position_scale, self.position_offset).tobytes()
         bin_colors = self.colors.tobytes()
         with open(path, "wb") as f:
             f.write(bin_positions)
+            f.write(encoding.padding(len(bin_positions)))
             f.write(bin_colors)
 
     def write_blender(self, path):
@@ -0,0 +1,113 @@
+"""Content hashes used to detect unchanged scene elements between saves."""
+
+import functools
+import hashlib
+import json
+import os
+
+import numpy as np
+
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def _new_hash():
+    return hashlib.blake2b(digest_size=16)
+
+
+def hash_element(element, properties):
+    """Return a digest covering an element's properties and binary payload.
+
+    Args:
+        element: Scene element (Points, Lines, Cuboid, ...).
+        properties: Output of element.get_properties().
+
+    Returns:
+        Hex digest string.
+    """
+    h = _new_hash()
+    h.update(type(element).__name__.encode())
+    h.update(json.dumps(properties, sort_keys=True).encode())
+    for key, value in sorted(vars(element).items()):
+        if key.startswith('_'):
+            continue  # Caches derived from the other attributes
+        h.update(key.encode())
+        _hash_value(h, value)
+    return h.hexdigest()
+
+
+def _hash_value(h, value):
+    """Hash arrays by their bytes, also inside lists, tuples and dicts, and other values as json.
+
+    repr() would summarize large arrays with '...', so edits could keep the hash.
+    """
+    if isinstance(value, np.ndarray):
+        h.update(b'ndarray')
+        h.update(str(value.dtype).encode())
+        h.update(str(value.shape).encode())
+        h.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, (list, tuple)):
+        h.update(b'%s %d' % (type(value).__name__.encode(), len(value)))
+        for item in value:
+            _hash_value(h, item)
+    elif isinstance(value, dict):
+        h.update(b'dict %d' % len(value))
+        for key in sorted(value, key=str):
+            h.update(json.dumps(str(key)).encode())
+            _hash_value(h, value[key])
+    elif isinstance(value, np.generic):
+        _hash_value(h, value.item())
+    else:
+        h.update(json.dumps(value, sort_keys=True, default=repr).encode())
+
+
+def hash_file(path):
+    """Return a digest of a file's content, cached while its size and mtime are unchanged."""
+    stat = os.stat(path)
+    return _hash_file(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=1024)
+def _hash_file(path, size, mtime_ns):
+    h = _new_hash()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def ignore_bytecode(directory, names):
+    """Names of Python bytecode caches, which are neither hashed nor copied with the viewer."""
+    return [name for name in names if name == '__pycache__' or name.endswith('.pyc')]
+
+
+def hash_directory(directory):
+    """Return a digest of all file names and contents below a directory, except bytecode caches."""
+    h = _new_hash()
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(set(dirs) - set(ignore_bytecode(root, dirs)))
+        for filename in sorted(set(files) - set(ignore_bytecode(root, files))):
+            file_path = os.path.join(root, filename)
+            h.update(os.path.relpath(file_path, directory).encode())
+            with open(file_path, 'rb') as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def load_manifest(directory):
+    """Load the manifest of a previous save, or None if there is none."""
+    manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+    if not os.path.isfile(manifest_path):
+        return None
+    try:
+        with open(manifest_path) as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+
+def write_json_atomic(path, data, **kwargs):
+    """Write a json file via a temporary file so readers never see partial data."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as outfile:
+        json.dump(data, outfile, **kwargs)
+    os.replace(tmp_path, path)
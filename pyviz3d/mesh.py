@@ -1,11 +1,14 @@
 """Polygon mesh element."""
 from shutil import copyfile
 import os
+import threading
+from . import manifest
+from .triangle_mesh import TriangleMesh
 
 class Mesh:
     """Polygon mesh defined by an .obj file and a solid color."""
 
-    def __init__(self, filename, translation=None, rotation=None, scale=None, color=None, visible=True):
+    def __init__(self, filename, translation=None, rotation=None, scale=None, color=None, visible=True, convert=False):
         """Initialize a mesh reference.
 
         Args:
@@ -15,21 +18,37 @@ class Mesh:
             scale: Scale vector (3,).
             color: RGB color array-like in 0-255.
             visible: Whether the mesh is visible.
+            convert: If True, load the file with trimesh during save() and write
+                indexed binary buffers that the viewer uploads without parsing.
         """
         self.filename_source = filename
         mesh_file = os.path.split(filename)[-1]
         # splitext handles names like 'mesh_aligned_0.05.ply' → ('mesh_aligned_0.05', '.ply')
-        mesh_file_name, ext = os.path.splitext(mesh_file)
+        _, ext = os.path.splitext(mesh_file)
         if not ext:
             raise ValueError("Mesh filename must include a supported file extension: %r" % filename)
         self.mesh_file_extension = ext.lstrip('.')
-        mesh_file_size = os.path.getsize(filename)
-        self.filename_destination = mesh_file_name + '_' + str(mesh_file_size) + '.' + self.mesh_file_extension
+        # Named by content, so every copy of a mesh file is written and loaded by the viewer once
+        self.filename_destination = 'mesh_' + manifest.hash_file(filename) + '.' + self.mesh_file_extension
         self.translation = translation.tolist()
         self.rotation = rotation.tolist()
         self.scale = scale.tolist()
         self.color = color.tolist()
         self.visible = visible
+        self.convert = convert
+        self._triangle_mesh = None
+
+    def get_triangle_mesh(self):
+        """Load the mesh file with trimesh into a TriangleMesh with the same pose and color."""
+        if self._triangle_mesh is None:
+            import trimesh
+            mesh = trimesh.load(self.filename_source, force='mesh')
+            colors = mesh.visual.vertex_colors[:, :3] if mesh.visual.kind == 'vertex' else None
+            # TriangleMesh computes the normals, trimesh is very slow at it without scipy
+            self._triangle_mesh = TriangleMesh(
+                mesh.vertices, mesh.faces, vertex_colors=colors, translation=self.translation,
+                rotation=self.rotation, scale=self.scale, color=self.color, visible=self.visible)
+        return self._triangle_mesh
 
     def get_properties(self, filename):
         """Return JSON-serializable properties for this mesh.
@@ -40,6 +59,8 @@ class Mesh:
         Returns:
             A dict of properties for the web viewer.
         """
+        if self.convert:
+            return self.get_triangle_mesh().get_properties(filename)
         json_dict = {
             'type': 'mesh',
             'filename': self.filename_destination,
@@ -52,15 +73,22 @@ class Mesh:
         return json_dict
 
     def write_binary(self, path):
-        """Copy the mesh file into the destination directory."""
+        """Write the converted vertices, normals, faces and colors, or copy the mesh file."""
+        if self.convert:
+            self.get_triangle_mesh().write_binary(path)
+            return
         destination_dir = os.path.dirname(path)
         destination_path = os.path.join(destination_dir, self.filename_destination)
         # Cache by checking the actual destination path, not the basename
         # (which would resolve relative to cwd and silently skip the copy
         # if a same-named file happened to exist there).
         if not os.path.exists(destination_path):
-            copyfile(self.filename_source, destination_path)
+            # Elements sharing the file may be written by concurrent workers
+            tmp_path = '%s.tmp-%d-%d' % (destination_path, os.getpid(), threading.get_ident())
+            copyfile(self.filename_source, tmp_path)
+            os.replace(tmp_path, destination_path)
 
     def write_blender(self, path):
-        """Write a Blender-friendly asset for this element (no-op)."""
-        return
\ No newline at end of file
+        """Write converted meshes as binary PLY, Blender imports other meshes from their file."""
+        if self.convert:
+            self.get_triangle_mesh().write_blender(path)
\ No newline at end of file
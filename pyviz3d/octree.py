@@ -0,0 +1,97 @@
+"""Octree level-of-detail hierarchy for large point clouds."""
+
+import numpy as np
+
+
+def _spread_bits(v):
+    """Insert two zero bits after each of the lower 21 bits of v."""
+    v = v.astype(np.uint64) & np.uint64(0x1fffff)
+    v = (v | v << np.uint64(32)) & np.uint64(0x1f00000000ffff)
+    v = (v | v << np.uint64(16)) & np.uint64(0x1f0000ff0000ff)
+    v = (v | v << np.uint64(8)) & np.uint64(0x100f00f00f00f00f)
+    v = (v | v << np.uint64(4)) & np.uint64(0x10c30c30c30c30c3)
+    v = (v | v << np.uint64(2)) & np.uint64(0x1249249249249249)
+    return v
+
+
+def _compact_bits(v):
+    """Inverse of _spread_bits."""
+    v = v & np.uint64(0x1249249249249249)
+    v = (v | v >> np.uint64(2)) & np.uint64(0x10c30c30c30c30c3)
+    v = (v | v >> np.uint64(4)) & np.uint64(0x100f00f00f00f00f)
+    v = (v | v >> np.uint64(8)) & np.uint64(0x1f0000ff0000ff)
+    v = (v | v >> np.uint64(16)) & np.uint64(0x1f00000000ffff)
+    v = (v | v >> np.uint64(32)) & np.uint64(0x1fffff)
+    return v
+
+
+def morton_codes(cells):
+    """Interleave the bits of Nx3 integer cell coordinates into Morton codes."""
+    return _spread_bits(cells[:, 0]) | _spread_bits(cells[:, 1]) << np.uint64(1) | _spread_bits(cells[:, 2]) << np.uint64(2)
+
+
+def morton_cells(codes):
+    """Inverse of morton_codes."""
+    return np.stack([_compact_bits(codes >> np.uint64(i)) for i in range(3)], axis=1).astype(np.int64)
+
+
+def build_octree(positions, node_size, max_depth=12, seed=0):
+    """Distribute points over the nodes of an octree, coarse to fine.
+
+    Every node holds a random subsample of at most node_size of the points
+    inside its cell that were not taken by its ancestors, so the points of
+    a node and of all its ancestors form an evenly thinned version of the
+    cloud. Nodes at max_depth hold all remaining points.
+
+    Args:
+        positions: Nx3 point positions.
+        node_size: Maximum number of points per node above max_depth.
+        max_depth: Depth of the finest level (at most 21).
+        seed: Seed of the random subsampling.
+
+    Returns:
+        Tuple (order, cube, nodes). order is a permutation of the points that
+        groups them by node, cube is [min_x, min_y, min_z, size] of the root
+        cell, and nodes is an int64 array with one row [level, x, y, z, start,
+        count] per node, where x, y, z is the cell at that level and start
+        indexes into order.
+    """
+    num_points = positions.shape[0]
+    if num_points == 0:
+        return np.zeros(0, dtype=np.int64), [0.0, 0.0, 0.0, 1.0], np.zeros((0, 6), dtype=np.int64)
+    lower = positions.min(axis=0).astype(np.float64)
+    size = float((positions.max(axis=0) - lower).max()) or 1.0
+    resolution = 1 << max_depth
+    cells = np.clip(((positions - lower) / size * resolution).astype(np.int64), 0, resolution - 1)
+    codes = morton_codes(cells)
+    priority = np.random.default_rng(seed).permutation(num_points)
+
+    orders = []
+    nodes = []
+    start = 0
+    remaining = np.arange(num_points)
+    for level in range(max_depth + 1):
+        keys = codes[remaining] >> np.uint64(3 * (max_depth - level))
+        sorting = np.lexsort((priority[remaining], keys))
+        remaining = remaining[sorting]
+        keys = keys[sorting]
+        node_keys, node_starts, node_counts = np.unique(keys, return_index=True, return_counts=True)
+        if level < max_depth:
+            rank = np.arange(len(keys)) - np.repeat(node_starts, node_counts)
+            taken = rank < node_size
+        else:
+            taken = np.ones(len(keys), dtype=bool)
+        orders.append(remaining[taken])
+        node_counts = np.minimum(node_counts, node_size) if level < max_depth else node_counts
+        node_cells = morton_cells(node_keys)
+        level_nodes = np.zeros((len(node_keys), 6), dtype=np.int64)
+        level_nodes[:, 0] = level
+        level_nodes[:, 1:4] = node_cells
+        level_nodes[:, 4] = start + np.concatenate([[0], np.cumsum(node_counts)[:-1]])
+        level_nodes[:, 5] = node_counts
+        nodes.append(level_nodes)
+        start += int(node_counts.sum())
+        remaining = remaining[~taken]
+        if len(remaining) == 0:
+            break
+    return np.concatenate(orders), lower.tolist() + [size], np.concatenate(nodes)
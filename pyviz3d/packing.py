@@ -0,0 +1,50 @@
+"""Packing of per-element binary files into a few shared containers."""
+
+import os
+import shutil
+
+PACK_ALIGNMENT = 8  # Every element starts at a multiple of 8 bytes, valid for all typed-array views.
+
+
+def pack_binaries(directory, names, nodes_dict, size_limit):
+    """Move the <name>.bin files of a scene into size-capped container files.
+
+    The properties of every packed element are updated in place so that
+    'binary_filename' points to its container and 'binary_offset' /
+    'binary_length' locate its bytes within it.
+
+    Args:
+        directory: Scene directory containing the <name>.bin files.
+        names: Element names in the order they should be packed.
+        nodes_dict: Element properties as written to nodes.json.
+        size_limit: Soft maximum container size in bytes. A single element
+            larger than the limit gets a container of its own.
+
+    Returns:
+        List of container filenames that were written.
+    """
+    containers = []
+    f = None
+    try:
+        for name in names:
+            binary_path = os.path.join(directory, name + '.bin')
+            if not os.path.isfile(binary_path):
+                continue
+            length = os.path.getsize(binary_path)
+            if f is None or (f.tell() > 0 and f.tell() + length > size_limit):
+                if f is not None:
+                    f.close()
+                containers.append('scene_%d.pack' % len(containers))
+                f = open(os.path.join(directory, containers[-1]), 'wb')
+            offset = f.tell()
+            with open(binary_path, 'rb') as binary_file:
+                shutil.copyfileobj(binary_file, f)
+            f.write(b'\0' * (-f.tell() % PACK_ALIGNMENT))
+            os.remove(binary_path)
+            nodes_dict[name]['binary_filename'] = containers[-1]
+            nodes_dict[name]['binary_offset'] = offset
+            nodes_dict[name]['binary_length'] = length
+    finally:
+        if f is not None:
+            f.close()
+    return containers
@@ -0,0 +1,153 @@
+"""Binary PLY files written from NumPy structured arrays."""
+
+import numpy as np
+
+PLY_TYPES = {
+    'i1': 'char',
+    'u1': 'uchar',
+    'i2': 'short',
+    'u2': 'ushort',
+    'i4': 'int',
+    'u4': 'uint',
+    'f4': 'float',
+    'f8': 'double',
+}
+
+
+def vertex_array(positions, normals=None, colors=None, radii=None):
+    """Pack vertex attributes into a structured array with the PLY property names.
+
+    Args:
+        positions: Nx3 positions, stored as float32.
+        normals: Optional Nx3 normals, stored as float32.
+        colors: Optional Nx3 RGB colors in 0-255, stored as uint8.
+        radii: Optional N radii, stored as float32.
+
+    Returns:
+        Structured array with fields x, y, z, and optionally nx, ny, nz, red, green, blue and radius.
+    """
+    fields = [('x', '<f4'), ('y', '<f4'), ('z', '<f4')]
+    if normals is not None:
+        fields += [('nx', '<f4'), ('ny', '<f4'), ('nz', '<f4')]
+    if colors is not None:
+        fields += [('red', 'u1'), ('green', 'u1'), ('blue', 'u1')]
+    if radii is not None:
+        fields.append(('radius', '<f4'))
+    vertices = np.empty(len(positions), dtype=fields)
+    for i, axis in enumerate('xyz'):
+        vertices[axis] = positions[:, i]
+        if normals is not None:
+            vertices['n' + axis] = normals[:, i]
+    if colors is not None:
+        for i, channel in enumerate(('red', 'green', 'blue')):
+            vertices[channel] = colors[:, i]
+    if radii is not None:
+        vertices['radius'] = radii
+    return vertices
+
+
+def face_array(triangles):
+    """Pack Fx3 triangle indices into a structured array of PLY vertex_indices lists."""
+    faces = np.empty(len(triangles), dtype=[('count', 'u1'), ('vertex_indices', '<i4', (3,))])
+    faces['count'] = 3
+    faces['vertex_indices'] = triangles
+    return faces
+
+
+def _property_type(dtype):
+    return PLY_TYPES[dtype.str.lstrip('<>|=')]
+
+
+def write_ply(path, vertices, faces=None):
+    """Write a binary little-endian PLY file.
+
+    Args:
+        path: Destination file path.
+        vertices: Structured array with one field per vertex property, see vertex_array().
+        faces: Optional structured array of face lists, see face_array().
+    """
+    header = ['ply', 'format binary_little_endian 1.0', 'element vertex %d' % len(vertices)]
+    header += ['property %s %s' % (_property_type(vertices.dtype[name]), name) for name in vertices.dtype.names]
+    if faces is not None:
+        header += ['element face %d' % len(faces),
+                   'property list uchar %s vertex_indices' % _property_type(faces.dtype['vertex_indices'].base)]
+    header.append('end_header')
+    with open(path, 'wb') as f:
+        f.write(('\n'.join(header) + '\n').encode('ascii'))
+        f.write(np.ascontiguousarray(vertices).tobytes())
+        if faces is not None:
+            f.write(np.ascontiguousarray(faces).tobytes())
+
+
+def write_mesh(path, vertices, triangles, normals=None, colors=None):
+    """Write a triangle mesh with optional per-vertex normals and colors as binary PLY.
+
+    Args:
+        path: Destination file path.
+        vertices: Vx3 positions.
+        triangles: Fx3 vertex indices.
+        normals: Optional Vx3 normals.
+        colors: Optional Vx3 RGB colors in 0-255.
+    """
+    write_ply(path, vertex_array(vertices, normals, colors), face_array(triangles))
+
+
+def read_ply(path):
+    """Read a binary PLY file into NumPy structured arrays.
+
+    List properties must have the same length for all entries of an element,
+    which holds for triangle meshes.
+
+    Args:
+        path: PLY file path.
+
+    Returns:
+        Dict mapping element names (e.g. 'vertex', 'face') to structured arrays.
+    """
+    with open(path, 'rb') as f:
+        if f.readline().strip() != b'ply':
+            raise ValueError("Not a PLY file: %r" % path)
+        elements = []
+        byte_order = None
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError("Truncated PLY header: %r" % path)
+            words = line.decode('ascii').split()
+            if not words or words[0] in ('comment', 'obj_info'):
+                continue
+            if words[0] == 'end_header':
+                break
+            if words[0] == 'format':
+                if words[1] not in ('binary_little_endian', 'binary_big_endian'):
+                    raise ValueError("Unsupported PLY format %r: %r" % (words[1], path))
+                byte_order = '<' if words[1] == 'binary_little_endian' else '>'
+            elif words[0] == 'element':
+                elements.append((words[1], int(words[2]), []))
+            elif words[0] == 'property':
+                elements[-1][2].append(words[1:])
+        data = f.read()
+
+    ply_to_numpy = {name: key for key, name in PLY_TYPES.items()}
+    ply_to_numpy.update({'int8': 'i1', 'uint8': 'u1', 'int16': 'i2', 'uint16': 'u2',
+                         'int32': 'i4', 'uint32': 'u4', 'float32': 'f4', 'float64': 'f8'})
+    result = {}
+    offset = 0
+    for name, count, properties in elements:
+        fields = []
+        for prop in properties:
+            if prop[0] == 'list':
+                count_type = np.dtype(byte_order + ply_to_numpy[prop[1]])
+                item_type = byte_order + ply_to_numpy[prop[2]]
+                length = int(np.frombuffer(data, count_type, 1, offset + np.dtype(fields).itemsize)[0]) if count else 0
+                fields += [('count_' + prop[3], count_type), (prop[3], item_type, (length,))]
+            else:
+                fields.append((prop[1], byte_order + ply_to_numpy[prop[0]]))
+        dtype = np.dtype(fields)
+        array = np.frombuffer(data, dtype, count, offset)
+        for field in dtype.names:
+            if field.startswith('count_') and np.any(array[field] != array.dtype[field[6:]].shape[0]):
+                raise ValueError("PLY list %r of element %r has varying lengths: %r" % (field[6:], name, path))
+        result[name] = array
+        offset += dtype.itemsize * count
+    return result
@@ -1,20 +1,37 @@
 """Points class i.e. point cloud."""
+import numpy as np
+from . import encoding
+from . import octree
+from . import ply
+
+WRITE_CHUNK_SIZE = 1 << 20  # Points encoded at once by write_binary()
+
 
 class Points:
     """Set of points defined by positions, colors, normals and more."""
 
-    def __init__(self, positions, colors, normals, point_size, resolution, visible, alpha, shading_type=1):
+    def __init__(self, positions, colors, normals, point_size, resolution, visible, alpha, shading_type=1,
+                 position_encoding='float32', normal_encoding='float32', lod=False, lod_node_size=100000,
+                 bounds=None):
         """Initialize point cloud data.
 
         Args:
             positions: Nx3 float32 positions.
             colors: Nx3 uint8 RGB colors.
-            normals: Nx3 float32 normals.
+            normals: Nx3 float32 normals, or None.
             point_size: Point size in viewer units.
             resolution: Blender sphere resolution.
             visible: Whether points are visible.
             alpha: Transparency in [0, 1].
             shading_type: 0 for uniform, 1 for Phong.
+            position_encoding: 'float32', or 'int16' to quantize the positions
+                relative to their bounding box.
+            normal_encoding: 'float32', or 'oct16'/'oct8' for two integers per
+                normal using an octahedral mapping.
+            lod: Whether to store the points in an octree whose nodes the viewer
+                loads depending on the camera.
+            lod_node_size: Maximum number of points per octree node.
+            bounds: Optional precomputed (lower, upper) corners of the bounding box.
         """
         self.positions = positions
         self.colors = colors
@@ -24,6 +41,12 @@ class Points:
         self.visible = visible
         self.alpha = alpha
         self.shading_type = shading_type
+        self.position_encoding = position_encoding
+        self.normal_encoding = normal_encoding
+        self.lod = lod
+        self.lod_node_size = lod_node_size
+        self._octree = None
+        self.position_scale, self.position_offset = encoding.position_quantization(positions, position_encoding, bounds)
 
     def get_properties(self, binary_filename):
         """Return JSON-serializable properties for this element.
@@ -40,36 +63,78 @@ class Points:
             'alpha': self.alpha,
             'shading_type': self.shading_type,
             'point_size': self.point_size,
+            'resolution': self.resolution,
             'num_points': self.positions.shape[0],
+            'position_encoding': self.position_encoding,
+            'normal_encoding': None if self.normals is None else self.normal_encoding,
             'binary_filename': binary_filename}
+        if self.position_encoding != 'float32':
+            json_dict['position_scale'] = self.position_scale.tolist()
+            json_dict['position_offset'] = self.position_offset.tolist()
+        if self.lod:
+            _, cube, nodes = self.get_octree()
+            block_sizes = [self.block_size(count) for count in nodes[:, 5]]
+            block_offsets = np.concatenate([[0], np.cumsum(block_sizes)[:-1]]).astype(np.int64)
+            json_dict['lod_cube'] = cube
+            # One row [level, x, y, z, num_points, byte_offset, byte_length] per octree node
+            json_dict['lod_nodes'] = [[int(v) for v in node[:4]] + [int(node[5]), int(offset), int(size)]
+                                      for node, offset, size in zip(nodes, block_offsets, block_sizes)]
         return json_dict
 
+    def get_octree(self):
+        """Return the octree of the points, see octree.build_octree()."""
+        if self._octree is None:
+            self._octree = octree.build_octree(self.positions, self.lod_node_size)
+        return self._octree
+
+    def block_size(self, num_points):
+        """Size in bytes of the binary block of num_points points, padded to 4 bytes."""
+        position_bytes = 3 * num_points * np.dtype(encoding.POSITION_ENCODINGS[self.position_encoding]).itemsize
+        normal_bytes = 0
+        if self.normals is not None:
+            normal_itemsize = np.dtype(encoding.NORMAL_ENCODINGS[self.normal_encoding]).itemsize
+            normal_bytes = (3 if self.normal_encoding == 'float32' else 2) * num_points * normal_itemsize
+        color_bytes = 3 * num_points
+        return sum(n + (-n % 4) for n in (position_bytes, normal_bytes, color_bytes))
+
+    def write_block(self, f, index):
+        """Write positions, normals (if any), and colors of the indexed points.
+
+        The attributes are encoded and written in chunks, so that memory use
+        stays bounded for clouds backed by memory-mapped files. Attributes that
+        need no encoding are written straight from the array buffers.
+        """
+        def write_chunked(array, encode):
+            num_bytes = 0
+            for start in range(0, array.shape[0], WRITE_CHUNK_SIZE):
+                chunk = encode(array[start:start + WRITE_CHUNK_SIZE])
+                encoding.write_array(f, chunk)
+                num_bytes += chunk.nbytes
+            f.write(encoding.padding(num_bytes))
+
+        write_chunked(self.positions[index], lambda positions: encoding.encode_positions(
+            positions, self.position_encoding, self.position_scale, self.position_offset))
+        if self.normals is not None:
+            write_chunked(self.normals[index], lambda normals: encoding.encode_normals(normals, self.normal_encoding))
+        colors = self.colors[index]
+        for start in range(0, colors.shape[0], WRITE_CHUNK_SIZE):
+            encoding.write_array(f, colors[start:start + WRITE_CHUNK_SIZE])
+
     def write_binary(self, path):
-        """Write positions, normals, and colors to a binary file."""
-        bin_positions = self.positions.tobytes()
-        bin_normals = self.normals.tobytes()
-        bin_colors = self.colors.tobytes()
+        """Write the points to a binary file, one block per octree node if lod is enabled."""
         with open(path, "wb") as f:
-            f.write(bin_positions)
-            f.write(bin_normals)
-            f.write(bin_colors)
+            if not self.lod:
+                self.write_block(f, slice(None))
+                return
+            order, _, nodes = self.get_octree()
+            for start, count in nodes[:, 4:6]:
+                self.write_block(f, order[start:start + count])
+                f.write(encoding.padding(3 * int(count)))
 
     def write_blender(self, path):
-        """Write a Blender-friendly mesh for the points using Open3D."""
-        import open3d as o3d
-        pcd_combined = o3d.geometry.TriangleMesh()
-
-        def _create_sphere_at_xyz(xyz, colors, radius, resolution):
-            sphere = o3d.geometry.TriangleMesh.create_sphere(radius=radius, resolution=resolution)
-            sphere.compute_vertex_normals()
-            sphere.paint_uniform_color(colors)
-            sphere = sphere.translate(xyz)
-            return sphere
-
-        for i in range(self.positions.shape[0]):
-            pcd_combined += _create_sphere_at_xyz(self.positions[i],
-                                                  self.colors[i] / 255.0,
-                                                  self.point_size / 1000.0,
-                                                  resolution=self.resolution)
-
-        o3d.io.write_triangle_mesh(path, pcd_combined)
\ No newline at end of file
+        """Write the points with their colors and radius as a vertex-only binary PLY.
+
+        Blender instances a single sphere on these vertices with Geometry Nodes.
+        """
+        radii = np.full(self.positions.shape[0], self.point_size / 1000.0, dtype=np.float32)
+        ply.write_ply(path, ply.vertex_array(self.positions, colors=self.colors, radii=radii))
@@ -1,5 +1,9 @@
 """Polyline element."""
 
+import numpy as np
+from . import ply
+from . import primitives
+
 
 class Polyline:
     """A connected series of line segments."""
@@ -44,5 +48,12 @@ class Polyline:
         return
 
     def write_blender(self, path):
-        """Write a Blender-friendly asset for this element (no-op)."""
-        return
\ No newline at end of file
+        """Write the polyline as tubes joined by spheres into one binary PLY mesh."""
+        positions = np.asarray(self.positions, dtype=np.float64)
+        if len(positions) <= 1:
+            return
+        vertices, triangles = primitives.concatenate_meshes([
+            primitives.tubes_mesh(positions[:-1], positions[1:], self.edge_width),
+            primitives.spheres_mesh(positions, self.edge_width)])
+        colors = np.repeat(np.asarray(self.color)[np.newaxis], len(vertices), axis=0)
+        ply.write_mesh(path, vertices, triangles, primitives.vertex_normals(vertices, triangles), colors)
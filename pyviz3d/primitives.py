@@ -0,0 +1,276 @@
+"""Template meshes and batched transforms for exporting many primitives at once."""
+
+import numpy as np
+
+
+def cylinder_mesh(resolution=15):
+    """Closed cylinder of radius 1 along z from 0 to 1.
+
+    Returns:
+        Tuple (vertices, triangles) with float64 and int64 arrays.
+    """
+    angles = 2.0 * np.pi * np.arange(resolution) / resolution
+    ring = np.stack([np.cos(angles), np.sin(angles), np.zeros(resolution)], axis=1)
+    vertices = np.concatenate([ring, ring + [0.0, 0.0, 1.0], [[0.0, 0.0, 0.0], [0.0, 0.0, 1.0]]])
+    k = np.arange(resolution)
+    k1 = (k + 1) % resolution
+    bottom_center = np.full(resolution, 2 * resolution)
+    top_center = bottom_center + 1
+    triangles = np.concatenate([
+        np.stack([k, k1, k1 + resolution], axis=1),
+        np.stack([k, k1 + resolution, k + resolution], axis=1),
+        np.stack([bottom_center, k1, k], axis=1),
+        np.stack([top_center, k + resolution, k1 + resolution], axis=1)])
+    return vertices, triangles
+
+
+def cone_mesh(resolution=15):
+    """Closed cone with base radius 1 at z=0 and its apex at z=1.
+
+    Returns:
+        Tuple (vertices, triangles) with float64 and int64 arrays.
+    """
+    angles = 2.0 * np.pi * np.arange(resolution) / resolution
+    ring = np.stack([np.cos(angles), np.sin(angles), np.zeros(resolution)], axis=1)
+    vertices = np.concatenate([ring, [[0.0, 0.0, 1.0], [0.0, 0.0, 0.0]]])
+    k = np.arange(resolution)
+    k1 = (k + 1) % resolution
+    apex = np.full(resolution, resolution)
+    triangles = np.concatenate([
+        np.stack([k, k1, apex], axis=1),
+        np.stack([apex + 1, k1, k], axis=1)])
+    return vertices, triangles
+
+
+def frames_from_directions(directions):
+    """Rotation matrices that map the z axis onto each of the given directions.
+
+    Args:
+        directions: Nx3 unit vectors.
+
+    Returns:
+        Nx3x3 rotation matrices whose third columns are the directions.
+    """
+    helpers = np.zeros_like(directions, dtype=np.float64)
+    near_z = np.abs(directions[:, 2]) > 0.9
+    helpers[~near_z, 2] = 1.0
+    helpers[near_z, 0] = 1.0
+    x_axes = np.cross(helpers, directions)
+    x_axes /= np.linalg.norm(x_axes, axis=1, keepdims=True)
+    y_axes = np.cross(directions, x_axes)
+    return np.stack([x_axes, y_axes, directions], axis=2)
+
+
+def instance_mesh(vertices, triangles, rotations, scales, translations):
+    """Place scaled and rotated copies of a template mesh.
+
+    Every instance is transformed as rotation @ (scale * vertex) + translation.
+
+    Args:
+        vertices: Vx3 template vertices.
+        triangles: Fx3 template triangles.
+        rotations: Nx3x3 rotation matrices.
+        scales: Nx3 scales along the template axes.
+        translations: Nx3 translations.
+
+    Returns:
+        Tuple (vertices, triangles) of the N*V vertices and N*F triangles.
+    """
+    num_instances = rotations.shape[0]
+    scaled = vertices[np.newaxis, :, :] * scales[:, np.newaxis, :]
+    placed = np.einsum('nij,nvj->nvi', rotations, scaled) + translations[:, np.newaxis, :]
+    offsets = np.arange(num_instances)[:, np.newaxis, np.newaxis] * vertices.shape[0]
+    return placed.reshape(-1, 3), (triangles[np.newaxis] + offsets).reshape(-1, 3)
+
+
+def vertex_normals(vertices, triangles):
+    """Area-weighted vertex normals of a triangle mesh.
+
+    Returns:
+        Vx3 float32 unit normals, zero for vertices without area.
+    """
+    corners = vertices[triangles].astype(np.float64)
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    normals = np.stack([np.bincount(triangles.ravel(), np.repeat(face_normals[:, axis], 3), minlength=len(vertices))
+                        for axis in range(3)], axis=1)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return (normals / np.where(lengths > 0, lengths, 1.0)).astype(np.float32)
+
+
+def quaternions_to_matrices(quaternions):
+    """Convert Nx4 unit quaternions [x, y, z, w] to Nx3x3 rotation matrices."""
+    x, y, z, w = (quaternions[:, i].astype(np.float64) for i in range(4))
+    return np.stack([
+        np.stack([1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - w * z), 2.0 * (x * z + w * y)], axis=1),
+        np.stack([2.0 * (x * y + w * z), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - w * x)], axis=1),
+        np.stack([2.0 * (x * z - w * y), 2.0 * (y * z + w * x), 1.0 - 2.0 * (x * x + y * y)], axis=1)], axis=1)
+
+
+def matrices_to_quaternions(matrices):
+    """Convert Nx3x3 rotation matrices to Nx4 unit quaternions [x, y, z, w]."""
+    m = matrices.astype(np.float64)
+    # Each row computes the quaternion from its largest component, which is numerically stable
+    diagonal = np.stack([m[:, 0, 0], m[:, 1, 1], m[:, 2, 2]], axis=1)
+    trace = diagonal.sum(axis=1)
+    candidates = np.stack([
+        np.stack([1.0 + 2.0 * diagonal[:, 0] - trace, m[:, 0, 1] + m[:, 1, 0], m[:, 0, 2] + m[:, 2, 0], m[:, 2, 1] - m[:, 1, 2]], axis=1),
+        np.stack([m[:, 0, 1] + m[:, 1, 0], 1.0 + 2.0 * diagonal[:, 1] - trace, m[:, 1, 2] + m[:, 2, 1], m[:, 0, 2] - m[:, 2, 0]], axis=1),
+        np.stack([m[:, 0, 2] + m[:, 2, 0], m[:, 1, 2] + m[:, 2, 1], 1.0 + 2.0 * diagonal[:, 2] - trace, m[:, 1, 0] - m[:, 0, 1]], axis=1),
+        np.stack([m[:, 2, 1] - m[:, 1, 2], m[:, 0, 2] - m[:, 2, 0], m[:, 1, 0] - m[:, 0, 1], 1.0 + trace], axis=1)], axis=1)
+    best = np.argmax(np.concatenate([diagonal, trace[:, np.newaxis]], axis=1), axis=1)
+    quaternions = candidates[np.arange(len(m)), best]
+    return quaternions / np.linalg.norm(quaternions, axis=1, keepdims=True)
+
+
+def uv_sphere_mesh(resolution=3):
+    """Unit UV sphere with 2 * resolution meridians and resolution - 1 rings between the poles.
+
+    The layout follows open3d.geometry.TriangleMesh.create_sphere(): the two
+    poles come first, followed by the rings from top to bottom.
+
+    Returns:
+        Tuple (vertices, triangles) with float64 and int64 arrays.
+    """
+    num_meridians = 2 * resolution
+    theta = np.pi * np.arange(1, resolution) / resolution
+    phi = 2.0 * np.pi * np.arange(num_meridians) / num_meridians
+    rings = np.stack([
+        np.outer(np.sin(theta), np.cos(phi)),
+        np.outer(np.sin(theta), np.sin(phi)),
+        np.repeat(np.cos(theta)[:, np.newaxis], num_meridians, axis=1)], axis=-1).reshape(-1, 3)
+    vertices = np.concatenate([[[0.0, 0.0, 1.0], [0.0, 0.0, -1.0]], rings])
+
+    k = np.arange(num_meridians)
+    k1 = (k + 1) % num_meridians
+    first = 2
+    last = 2 + (resolution - 2) * num_meridians
+    triangles = [
+        np.stack([np.zeros_like(k), first + k, first + k1], axis=1),
+        np.stack([np.ones_like(k), last + k1, last + k], axis=1)]
+    for ring in range(resolution - 2):
+        top = 2 + ring * num_meridians
+        bottom = top + num_meridians
+        triangles.append(np.stack([top + k, bottom + k, bottom + k1], axis=1))
+        triangles.append(np.stack([top + k, bottom + k1, top + k1], axis=1))
+    return vertices, np.concatenate(triangles)
+
+
+def tubes_mesh(starts, ends, radius, resolution=16):
+    """Cylinders of the given radius between pairs of points.
+
+    Zero-length segments become flat cylinders, so every segment contributes
+    the same number of vertices and triangles.
+
+    Args:
+        starts: Nx3 segment start points.
+        ends: Nx3 segment end points.
+        radius: Cylinder radius.
+        resolution: Number of segments around each cylinder.
+
+    Returns:
+        Tuple (vertices, triangles) of all cylinders.
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    directions = np.asarray(ends, dtype=np.float64).reshape(-1, 3) - starts
+    lengths = np.linalg.norm(directions, axis=1)
+    directions = np.where(lengths[:, np.newaxis] > 0, directions / np.maximum(lengths, 1e-12)[:, np.newaxis],
+                          [0.0, 0.0, 1.0])
+    scales = np.stack([np.full(len(starts), radius), np.full(len(starts), radius), lengths], axis=1)
+    return instance_mesh(*cylinder_mesh(resolution), frames_from_directions(directions), scales, starts)
+
+
+def spheres_mesh(centers, radius, resolution=8):
+    """UV spheres of the given radius around each of the Nx3 centers.
+
+    Returns:
+        Tuple (vertices, triangles) of all spheres.
+    """
+    centers = np.asarray(centers, dtype=np.float64).reshape(-1, 3)
+    rotations = np.broadcast_to(np.eye(3), (len(centers), 3, 3))
+    return instance_mesh(*uv_sphere_mesh(resolution), rotations, np.full((len(centers), 3), radius), centers)
+
+
+BOX_EDGES = np.array([[0, 1], [2, 3], [4, 5], [6, 7],
+                      [0, 2], [1, 3], [4, 6], [5, 7],
+                      [0, 4], [1, 5], [2, 6], [3, 7]])
+
+
+def box_corners(positions, sizes, rotations):
+    """Corners of oriented boxes.
+
+    Args:
+        positions: Nx3 box centers.
+        sizes: Nx3 box dimensions.
+        rotations: Nx4 unit quaternions [x, y, z, w].
+
+    Returns:
+        Nx8x3 corners; corner i has the sign pattern of its bits (x, y, z) = (i & 1, i & 2, i & 4).
+    """
+    signs = np.array([[(i & 1) * 2 - 1, (i >> 1 & 1) * 2 - 1, (i >> 2 & 1) * 2 - 1] for i in range(8)], dtype=np.float64)
+    local = 0.5 * signs[np.newaxis, :, :] * np.asarray(sizes, dtype=np.float64)[:, np.newaxis, :]
+    return (np.einsum('nij,nvj->nvi', quaternions_to_matrices(np.asarray(rotations)), local)
+            + np.asarray(positions, dtype=np.float64)[:, np.newaxis, :])
+
+
+def concatenate_meshes(meshes):
+    """Merge a list of (vertices, triangles) into a single mesh."""
+    offsets = np.cumsum([0] + [len(vertices) for vertices, _ in meshes[:-1]])
+    return (np.concatenate([vertices for vertices, _ in meshes]),
+            np.concatenate([triangles + offset for (_, triangles), offset in zip(meshes, offsets)]))
+
+
+def wire_boxes_mesh(positions, sizes, rotations, radius, resolution=8):
+    """Boxes drawn as tubes along their 12 edges with spheres at their 8 corners.
+
+    Returns:
+        Tuple (vertices, triangles, box_ids) where box_ids holds the index of
+        the box each vertex belongs to.
+    """
+    corners = box_corners(positions, sizes, rotations)
+    edges = corners[:, BOX_EDGES]
+    tubes = tubes_mesh(edges[:, :, 0].reshape(-1, 3), edges[:, :, 1].reshape(-1, 3), radius, resolution)
+    spheres = spheres_mesh(corners.reshape(-1, 3), radius, resolution // 2)
+    vertices, triangles = concatenate_meshes([tubes, spheres])
+    num_boxes = len(corners)
+    box_ids = np.concatenate([np.repeat(np.arange(num_boxes), len(tubes[0]) // max(num_boxes, 1)),
+                              np.repeat(np.arange(num_boxes), len(spheres[0]) // max(num_boxes, 1))])
+    return vertices, triangles, box_ids
+
+
+def arrows_mesh(starts, ends, stroke_width, head_width, resolution=20):
+    """Arrows made of a cylinder shaft and a cone head, shaped like in the viewer.
+
+    The widths are used as radii and each head is 2 * head_width long, or as
+    long as its arrow if that is shorter. Zero-length arrows are skipped.
+
+    Args:
+        starts: Nx3 arrow start points.
+        ends: Nx3 arrow end points.
+        stroke_width: Radius of the shafts.
+        head_width: Radius of the heads at their base.
+        resolution: Number of segments around each shaft and head.
+
+    Returns:
+        Tuple (vertices, triangles, arrow_ids) where arrow_ids holds the index
+        of the arrow each vertex belongs to.
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    directions = np.asarray(ends, dtype=np.float64).reshape(-1, 3) - starts
+    lengths = np.linalg.norm(directions, axis=1)
+    ids = np.flatnonzero(lengths > 0)
+    starts, lengths = starts[ids], lengths[ids]
+    directions = directions[ids] / lengths[:, np.newaxis]
+    head_lengths = np.minimum(2.0 * head_width, lengths)
+    shaft_lengths = lengths - head_lengths
+    rotations = frames_from_directions(directions)
+    ones = np.ones(len(ids))
+
+    shafts = instance_mesh(*cylinder_mesh(resolution), rotations,
+                           np.stack([ones * stroke_width, ones * stroke_width, shaft_lengths], axis=1), starts)
+    heads = instance_mesh(*cone_mesh(resolution), rotations,
+                          np.stack([ones * head_width, ones * head_width, head_lengths], axis=1),
+                          starts + directions * shaft_lengths[:, np.newaxis])
+    vertices, triangles = concatenate_meshes([shafts, heads])
+    arrow_ids = np.concatenate([np.repeat(ids, len(shafts[0]) // max(len(ids), 1)),
+                                np.repeat(ids, len(heads[0]) // max(len(ids), 1))])
+    return vertices, triangles, arrow_ids
@@ -0,0 +1,157 @@
+"""Cache of Blender renders keyed by the scene content and the render configuration."""
+
+import contextlib
+import glob
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from . import manifest
+
+BLEND_FILENAME = 'blender_scene.blend'
+STATS_FILENAME = 'stats.json'
+STATS_LOCK_FILENAME = 'stats.lock'
+STALE_LOCK_SECONDS = 10.0  # A lock this old was left behind by a killed process
+CONFIG_KEYS_IGNORED = ('workers', 'cache_dir', 'cache_max_bytes')  # Settings that do not change the render
+
+
+class RenderCache:
+    """Size-bounded directory of previous render outputs with least-recently-used eviction.
+
+    Every entry is a subdirectory named by the render key that holds the
+    rendered images, videos and the .blend file of one save. Hit and miss
+    counts are kept in stats.json, updated under stats.lock so that they add
+    up across processes.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache entries, created if missing.
+            max_bytes: Maximum total size of all entries in bytes.
+        """
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_bytes = max_bytes
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def key(self, blender_config, element_hashes, blender_tools_path):
+        """Return the render key of a scene.
+
+        Args:
+            blender_config: Blender render configuration.
+            element_hashes: Dict of element name to manifest.hash_element() digest.
+            blender_tools_path: Path of the blender_tools.py script that builds the scene.
+
+        Returns:
+            Hex digest string.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        config = {k: v for k, v in blender_config.to_dict().items() if k not in CONFIG_KEYS_IGNORED}
+        h.update(json.dumps(config, sort_keys=True).encode())
+        h.update(json.dumps(element_hashes).encode())  # Keeps the element order, which is the Blender import order
+        with open(blender_tools_path, 'rb') as f:
+            h.update(f.read())
+        return h.hexdigest()
+
+    def output_files(self, directory, blender_config):
+        """Paths relative to directory of the files Blender produced for blender_config."""
+        paths = glob.glob(glob.escape(os.path.join(directory, blender_config.output_prefix)) + '*')
+        paths.append(os.path.join(directory, BLEND_FILENAME))
+        return [os.path.relpath(p, directory) for p in paths if os.path.isfile(p)]
+
+    def restore(self, key, directory):
+        """Copy the outputs of a cached render into directory.
+
+        Returns:
+            True on a hit, False on a miss. Both are counted in the stats.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        hit = os.path.isdir(entry)
+        if hit:
+            for root, _, files in os.walk(entry):
+                for filename in files:
+                    source = os.path.join(root, filename)
+                    destination = os.path.join(directory, os.path.relpath(source, entry))
+                    os.makedirs(os.path.dirname(destination), exist_ok=True)
+                    shutil.copyfile(source, destination)
+            os.utime(entry)  # Mark as recently used
+        self._count('hits' if hit else 'misses')
+        return hit
+
+    def store(self, key, directory, files):
+        """Add the given files of directory as the entry for key and evict old entries."""
+        entry = os.path.join(self.cache_dir, key)
+        tmp_entry = entry + '.tmp-%d' % os.getpid()
+        for f in files:
+            os.makedirs(os.path.dirname(os.path.join(tmp_entry, f)), exist_ok=True)
+            shutil.copyfile(os.path.join(directory, f), os.path.join(tmp_entry, f))
+        os.makedirs(tmp_entry, exist_ok=True)
+        if os.path.isdir(entry):
+            shutil.rmtree(tmp_entry)
+        else:
+            os.replace(tmp_entry, entry)
+        self.evict(keep=key)
+
+    def entries(self):
+        """Return (key, size in bytes, last use time) of all entries, least recently used first."""
+        result = []
+        for key in os.listdir(self.cache_dir):
+            entry = os.path.join(self.cache_dir, key)
+            if not os.path.isdir(entry) or '.tmp-' in key:
+                continue
+            size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(entry) for f in files)
+            result.append((key, size, os.path.getmtime(entry)))
+        return sorted(result, key=lambda item: item[2])
+
+    def evict(self, keep=None):
+        """Delete least recently used entries until the cache fits into max_bytes.
+
+        Args:
+            keep: Optional key that is never evicted, e.g. the entry just stored.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for key, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+            total -= size
+
+    def stats(self):
+        """Return the dict of hit and miss counts."""
+        try:
+            with open(os.path.join(self.cache_dir, STATS_FILENAME)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'hits': 0, 'misses': 0}
+
+    def _count(self, name):
+        with self._stats_lock():
+            stats = self.stats()
+            stats[name] = stats.get(name, 0) + 1
+            manifest.write_json_atomic(os.path.join(self.cache_dir, STATS_FILENAME), stats)
+
+    @contextlib.contextmanager
+    def _stats_lock(self):
+        """Hold stats.lock, which only one process at a time can create."""
+        lock_path = os.path.join(self.cache_dir, STATS_LOCK_FILENAME)
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > STALE_LOCK_SECONDS:
+                        os.remove(lock_path)
+                except OSError:
+                    pass  # Released in the meantime
+                time.sleep(0.001)
+        try:
+            yield
+        finally:
+            os.remove(lock_path)
@@ -1,10 +1,10 @@
 import bpy
-import math
 import mathutils
 import numpy as np
-import subprocess
 import json
 import os
+import time
+import traceback
 
 C = bpy.context
 D = bpy.data
@@ -16,15 +16,27 @@ try:
 except ValueError:
    argv = []
 
+
+def parse_frame_range(args):
+  """Optional frame range of this process when an animation is split across several Blender processes."""
+  if "--frame-start" in args and "--frame-end" in args:
+    return (int(args[args.index("--frame-start") + 1]), int(args[args.index("--frame-end") + 1]))
+  return None
+
+
 def clear_scene():
-  # Remove all meshes from the scene, keep the light and camera
+  # Remove everything from the scene except the lights and the camera
   for o in C.scene.objects:
     print(o)
-    if o.type == 'MESH':
+    if o.type not in ('CAMERA', 'LIGHT'):
         o.select_set(True)
     else:
         o.select_set(False)
   bpy.ops.object.delete()
+  for constraint in list(C.scene.objects['Camera'].constraints):
+    C.scene.objects['Camera'].constraints.remove(constraint)
+  # Free meshes, materials and node groups of previous scenes in a long-running worker
+  bpy.data.orphans_purge(do_recursive=True)
 
 
 def create_bezier_curve_from_points(control_points, name="BezierPath"):
@@ -59,10 +71,11 @@ def create_bezier_curve_from_points(control_points, name="BezierPath"):
   return curve_obj
 
 
-def render(output_prefix, configuration):
+def render(output_prefix, configuration, frame_range=None):
   """
   :path: the file path of the rendered image
   :file_format: {PNG, JPEG}
+  :frame_range: optional (frame_start, frame_end) of the animation to render
   """
   
   if configuration['animation']:
@@ -158,32 +171,11 @@ def render(output_prefix, configuration):
     if not forward_mode:
       bpy.ops.constraint.followpath_path_animate(constraint="Follow Path", owner='OBJECT')
 
-  bpy.ops.render.render(use_viewport=True, animation=configuration['animation'], write_still=True)
-
-  # Combine individual frames into video using ffmpeg
   if configuration['animation']:
-    output_filepath = output_prefix + '.mp4'
-    subprocess.run(["ffmpeg", "-y", "-i", f'{output_prefix}%04d.png',
-                     "-vcodec", "libx264", "-crf", "18", "-preset", "slow",
-                     "-vf", "format=yuv420p", output_filepath])
-    
-    # Generate high-quality GIF using two-pass palette generation
-    # Pass 1: Generate optimal color palette from video
-    palette_path = output_prefix + '_palette.png'
-    subprocess.run(["ffmpeg", "-y", "-i", output_filepath,
-                    "-vf", "palettegen=stats_mode=diff:max_colors=256",
-                    palette_path])
-    
-    # Pass 2: Use the palette with dithering for better quality
-    gif_path = output_filepath[:-3] + 'gif'
-    subprocess.run(["ffmpeg", "-y", "-i", output_filepath, "-i", palette_path,
-                    "-lavfi", "paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle",
-                    gif_path])
-    
-    # Clean up temporary palette file
-    import os
-    if os.path.exists(palette_path):
-        os.remove(palette_path)
+    bpy.context.scene.frame_start, bpy.context.scene.frame_end = frame_range or (1, configuration['animation_length'])
+
+  # The video is stitched from the rendered frames by the calling process
+  bpy.ops.render.render(use_viewport=True, animation=configuration['animation'], write_still=True)
 
 
 def save_blender_scene(path: str) -> None:
@@ -247,12 +239,18 @@ def init_scene(configuration):
   #   C.scene.objects[f'Point.{str(i+1).zfill(3)}'].data.color = (1, 0.795182, 0.375358)
 
 
-def create_mat(obj, color=None, alpha=1.0):
+def create_mat(obj, color=None, alpha=1.0, instancer=False):
     mat = bpy.data.materials.new(name="material")
     mat.use_backface_culling = True
     obj.data.materials.append(mat)
     mat.use_nodes = True
-    mat.node_tree.nodes.new(type="ShaderNodeVertexColor")
+    if instancer:
+      # Read the colors that Instance on Points copied from the points to the instances
+      attribute = mat.node_tree.nodes.new(type="ShaderNodeAttribute")
+      attribute.attribute_type = 'INSTANCER'
+      attribute.attribute_name = "Col"
+    else:
+      mat.node_tree.nodes.new(type="ShaderNodeVertexColor")
     bsdf = mat.node_tree.nodes["Principled BSDF"]
 
     # Subtle specular + controlled roughness for soft highlights
@@ -268,44 +266,71 @@ def create_mat(obj, color=None, alpha=1.0):
     bsdf.inputs["Sheen Weight"].default_value = 0.05
     bsdf.inputs["Sheen Roughness"].default_value = 0.4
 
+    bsdf.inputs["Alpha"].default_value = alpha
     if color:
       print('mesh color', color)
       bsdf.inputs["Base Color"].default_value = (color[0]/255.0, color[1]/255.0, color[2]/255.0, 1.0)
-      bsdf.inputs["Alpha"].default_value = alpha
+    elif instancer:
+      mat.node_tree.links.new(bsdf.inputs["Base Color"], attribute.outputs["Color"])
     else:
       mat.node_tree.nodes["Color Attribute"].layer_name = "Col"
       mat.node_tree.links.new(
         bsdf.inputs["Base Color"],
         mat.node_tree.nodes["Color Attribute"].outputs["Color"])
+    return mat
+
+
+def instance_spheres_on_points(obj, radius, resolution):
+    """Render every vertex of obj as a sphere using a Geometry Nodes modifier.
+
+    All points share one UV sphere, so memory stays proportional to the
+    number of points rather than the number of sphere vertices. The radius
+    vertex attribute scales the spheres when the importer provides it.
+    """
+    mat = create_mat(obj, instancer=True)
+    tree = bpy.data.node_groups.new(obj.name + "_instances", 'GeometryNodeTree')
+    tree.interface.new_socket(name="Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    tree.interface.new_socket(name="Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    nodes, links = tree.nodes, tree.links
+
+    group_input = nodes.new('NodeGroupInput')
+    group_output = nodes.new('NodeGroupOutput')
+    sphere = nodes.new('GeometryNodeMeshUVSphere')
+    sphere.inputs['Segments'].default_value = 2 * resolution
+    sphere.inputs['Rings'].default_value = resolution
+    shade_smooth = nodes.new('GeometryNodeSetShadeSmooth')
+    set_material = nodes.new('GeometryNodeSetMaterial')
+    set_material.inputs['Material'].default_value = mat
+    instance = nodes.new('GeometryNodeInstanceOnPoints')
+
+    if 'radius' in obj.data.attributes:
+      sphere.inputs['Radius'].default_value = 1.0
+      radius_attribute = nodes.new('GeometryNodeInputNamedAttribute')
+      radius_attribute.data_type = 'FLOAT'
+      radius_attribute.inputs['Name'].default_value = 'radius'
+      links.new(radius_attribute.outputs['Attribute'], instance.inputs['Scale'])
+    else:
+      sphere.inputs['Radius'].default_value = radius
 
+    links.new(sphere.outputs['Mesh'], shade_smooth.inputs['Geometry'])
+    links.new(shade_smooth.outputs['Geometry'], set_material.inputs['Geometry'])
+    links.new(group_input.outputs['Geometry'], instance.inputs['Points'])
+    links.new(set_material.outputs['Geometry'], instance.inputs['Instance'])
+    links.new(instance.outputs['Instances'], group_output.inputs['Geometry'])
+
+    modifier = obj.modifiers.new(name="PointSpheres", type='NODES')
+    modifier.node_group = tree
+    return modifier
 
-def cylinder_between(x1, y1, z1, x2, y2, z2, r, color, alpha):
-    dx = x2 - x1
-    dy = y2 - y1
-    dz = z2 - z1    
-    dist = math.sqrt(dx**2 + dy**2 + dz**2)
-    bpy.ops.mesh.primitive_cylinder_add(
-        radius = r, 
-        depth = dist,
-        location = (dx/2 + x1, dy/2 + y1, dz/2 + z1)   
-    ) 
-    phi = math.atan2(dy, dx) 
-    theta = math.acos(dz/dist) 
-    C.object.rotation_euler[1] = theta 
-    C.object.rotation_euler[2] = phi
-
-    mat = bpy.data.materials.new(name="test")
-    mat.use_backface_culling = True
-    C.object.data.materials.append(mat)
-    mat.use_nodes = True
-    mat.node_tree.nodes["Principled BSDF"].inputs[7].default_value = 0  # specular
-    mat.node_tree.nodes["Principled BSDF"].inputs[12].default_value = 0  #
-    mat.node_tree.nodes["Principled BSDF"].inputs[0].default_value = (color[0]/255.0, color[1]/255.0, color[2]/255.0, 1.0)
-    mat.node_tree.nodes["Principled BSDF"].inputs[4].default_value = alpha
-    return C.object   
 
+def main(args=None):
+    """Build and render the scene of the current directory.
 
-def main():
+    args are the command line arguments after "--": the output prefix and
+    an optional frame range.
+    """
+    args = argv if args is None else args
+    frame_range = parse_frame_range(args)
     
     with open('nodes.json') as f:
         nodes_dict = json.load(f)    
@@ -320,9 +345,8 @@ def main():
 
         if properties['type'] == 'points':
            bpy.ops.wm.ply_import(filepath=name+'.ply')
-           bpy.ops.object.shade_smooth()
            obj = bpy.data.objects[name]
-           create_mat(obj)
+           instance_spheres_on_points(obj, properties['point_size'] / 1000.0, properties.get('resolution', 3))
 
         if properties['type'] == 'camera':
            eye = mathutils.Vector(properties['position'])
@@ -331,112 +355,22 @@ def main():
            look_at(C.scene.objects['Camera'], eye, at, up)
            C.scene.objects['Camera'].data.lens = properties['focal_length']
 
-        if properties['type'] == 'cuboid':
-           obj = bpy.ops.mesh.primitive_cube_add(
-              size=1, enter_editmode=False, align='WORLD',
-              location=mathutils.Vector(properties['position']),
-              scale=mathutils.Vector(properties['size']))
-
-        if properties['type'] == 'polyline':
-            if len(properties['positions']) <= 1:
-                continue
-            for i in range(len(properties['positions']) - 1):
-                x1, y1, z1 = properties['positions'][i]
-                x2, y2, z2 = properties['positions'][i + 1]
-                obj = cylinder_between(
-                   x1, y1, z1,
-                   x2, y2, z2,
-                   properties['edge_width'],
-                   properties['color'],
-                   properties['alpha'])
-            for i in range(len(properties['positions'])):
-                x, y, z = properties['positions'][i]
-                bpy.ops.mesh.primitive_uv_sphere_add(
-                    radius=properties['edge_width'],
-                    location=(x, y, z),
-                    segments=16,
-                    ring_count=8
-                )
-                sphere = bpy.context.active_object
-                # Reuse cylinder material if available
-                if getattr(obj, "active_material", None) is not None:
-                    sphere.active_material = obj.active_material
-
-                # mat = bpy.data.materials.new(name="test")
-                # mat.use_backface_culling = True
-                # C.object.data.materials.append(mat)
-                # mat.use_nodes = True
-                # mat.node_tree.nodes["Principled BSDF"].inputs[0].default_value = (color[0]/255.0, color[1]/255.0, color[2]/255.0, alpha)
-
-
-        if properties['type'] == 'arrow':
-            start = mathutils.Vector(properties['start'])
-            end   = mathutils.Vector(properties['end'])
-            color = properties['color']
-            alpha = float(properties['alpha'])
-            r_shaft = float(properties['stroke_width'])
-            r_head  = float(properties['head_width'])
-            visible = bool(properties['visible'])
-
-            d = end - start
-            L = d.length
-            if L <= 1e-9:
-                return None, None
-            n = d.normalized()
-            head_h  = 2.0 * r_head
-            shaft_h = max(1e-6, L - head_h)
-
-            # Material
-            mat = bpy.data.materials.new(name="ArrowMat")
-            mat.use_nodes = True
-
-            #bpy.ops.node.add_node(use_transform=True, type="ShaderNodeBsdfDiffuse")
-
-            bsdf = mat.node_tree.nodes["Principled BSDF"]
-            bsdf.inputs["Base Color"].default_value = (color[0], color[1], color[2], 1.0)
-            bsdf.inputs["Alpha"].default_value = alpha
-            # match old Diffuse-style look
-            bsdf.inputs["Metallic"].default_value = 0.0
-            bsdf.inputs["Specular"].default_value = 0.0
-            bsdf.inputs["Roughness"].default_value = 1.0
-
-            # make sure it's not glowing
-            bsdf.inputs["Emission"].default_value = (0.0, 0.0, 0.0, 1.0)
-            bsdf.inputs["Emission Strength"].default_value = 0.0
-            bsdf.inputs["Clearcoat"].default_value = 0.0
-            bsdf.inputs["Sheen"].default_value = 0.0
-            mat.blend_method = 'BLEND'
-            mat.shadow_method = 'HASHED'
-
-            # Rotation: +Z -> direction
-            rot = mathutils.Vector((0,0,1)).rotation_difference(n)
-
-            # Shaft: cylinder along +Z, centered at start + n * (shaft_h/2)
-            bpy.ops.mesh.primitive_cylinder_add(radius=r_shaft, depth=shaft_h, location=(0,0,0))
-            shaft = bpy.context.active_object
-            shaft.rotation_mode = 'QUATERNION'
-            shaft.rotation_quaternion = rot
-            shaft.location = start + n * (shaft_h * 0.5)
-            shaft.data.materials.append(mat)
-
-            # Head: cone along +Z, centered at end - n * (head_h/2)
-            bpy.ops.mesh.primitive_cone_add(radius1=r_head, radius2=0.0, depth=head_h, location=(0,0,0))
-            head = bpy.context.active_object
-            head.rotation_mode = 'QUATERNION'
-            head.rotation_quaternion = rot
-            head.location = end - n * (head_h * 0.5)
-            head.data.materials.append(mat)
-
-            # Visibility
-            for obj in (shaft, head):
-                obj.hide_set(not visible)
-                obj.hide_render = not visible
-
+        if properties['type'] in ('arrow', 'arrows', 'cuboid', 'cuboids', 'polyline', 'superquadrics'):
+          # Prebuilt by write_blender() during save(), degenerate elements have no file
+          if not os.path.exists(name + '.ply'):
+            continue
+          bpy.ops.wm.ply_import(filepath=name + '.ply', forward_axis='Y', up_axis='Z')
+          obj = bpy.context.view_layer.objects.active
+          create_mat(obj, alpha=properties.get('alpha', 1.0))
+          obj.hide_set(not properties['visible'])
+          obj.hide_render = not properties['visible']
 
         if properties['type'] == 'mesh':
-          if properties['filename'].split('.')[-1] == 'ply':
+          if 'filename' not in properties:  # Converted during save()
+            bpy.ops.wm.ply_import(filepath=name + '.ply', forward_axis='Y', up_axis='Z')
+          elif properties['filename'].split('.')[-1] == 'ply':
             bpy.ops.wm.ply_import(filepath=properties['filename'], forward_axis='Y', up_axis='Z')
-          if properties['filename'].split('.')[-1] == 'obj':
+          elif properties['filename'].split('.')[-1] == 'obj':
             bpy.ops.wm.obj_import(filepath=properties['filename'], forward_axis='Y', up_axis='Z')          
           bpy.ops.object.shade_smooth()
           obj = bpy.context.view_layer.objects.active
@@ -444,10 +378,13 @@ def main():
           obj.rotation_mode = 'QUATERNION'  # blender quats are WXYZ
           obj.rotation_quaternion = [properties['rotation'][3], properties['rotation'][0], properties['rotation'][1], properties['rotation'][2]]
           obj.location = [properties['translation'][0], properties['translation'][1], properties['translation'][2]]
-          try:
-            create_mat(obj, properties['color'])
-          except KeyError:
+          if properties.get('has_colors'):
             create_mat(obj)
+          else:
+            try:
+              create_mat(obj, properties['color'])
+            except KeyError:
+              create_mat(obj)
 
         if properties['type'] == 'superquadric':
           bpy.ops.wm.ply_import(filepath=name + '.ply', forward_axis='Y', up_axis='Z')
@@ -460,11 +397,57 @@ def main():
 
     # Render if output filename is provided
     if configuration['render']:
-        render(os.path.abspath(argv[0]), configuration)
+        render(os.path.abspath(args[0]), configuration, frame_range)
+
+    # With parallel frame ranges only the process rendering the first range saves the scene
+    if frame_range is None or frame_range[0] == 1:
+      output_blender_file = os.path.abspath('blender_scene.blend')
+      save_blender_scene(output_blender_file)
+      print('Saved blender file to:', output_blender_file)
+
+def worker_loop(queue_dir, poll_interval=0.1):
+  """Render the scenes submitted to a BlenderRenderPool until the pool stops.
+
+  Jobs are json files in queue_dir/pending. A worker claims a job by renaming
+  it to queue_dir/running, which is atomic so no job runs twice, renders it
+  with main() and writes the result to queue_dir/done.
+  """
+  pending_dir = os.path.join(queue_dir, 'pending')
+  running_dir = os.path.join(queue_dir, 'running')
+  done_dir = os.path.join(queue_dir, 'done')
+  while True:
+    jobs = sorted(f for f in os.listdir(pending_dir) if f.endswith('.json'))
+    if not jobs:
+      if os.path.exists(os.path.join(queue_dir, 'stop')):
+        return
+      time.sleep(poll_interval)
+      continue
+    claimed_path = os.path.join(running_dir, '%d_%s' % (os.getpid(), jobs[0]))
+    try:
+      os.rename(os.path.join(pending_dir, jobs[0]), claimed_path)
+    except OSError:
+      continue  # Claimed by another worker
+    with open(claimed_path) as f:
+      job = json.load(f)
+
+    result = {'status': 'ok', 'worker': os.getpid()}
+    cwd = os.getcwd()
+    start = time.time()
+    try:
+      os.chdir(job['directory'])
+      main(job['args'])
+    except Exception:
+      result = {'status': 'error', 'worker': os.getpid(), 'error': traceback.format_exc()}
+    finally:
+      os.chdir(cwd)
+    result['seconds'] = time.time() - start
+
+    result_path = os.path.join(done_dir, jobs[0])
+    with open(result_path + '.tmp', 'w') as f:
+      json.dump(result, f)
+    os.replace(result_path + '.tmp', result_path)
+    os.remove(claimed_path)
 
-    output_blender_file = os.path.abspath('blender_scene.blend')
-    save_blender_scene(output_blender_file)
-    print('Saved blender file to:', output_blender_file)
 
 # def create_video(input_dir, pattern, output_filepath):
 #   trans_to_white = "format=yuva444p,\
@@ -25,26 +25,85 @@ function onDoubleClick(event) {
 	console.log(intersections);
 }
 
+// Containers of packed scenes, fetched once and shared by all elements stored in them.
+const binary_containers = new Map();
+
+// Formats of DecompressionStream for the compressed sidecar files.
+const decompression_formats = {'zlib': 'deflate', 'gzip': 'gzip'};
+
+function unshuffle_bytes(buffer, stride){
+	// Inverse of the byte shuffle applied before compression: plane k holds byte k of every word.
+	const shuffled = new Uint8Array(buffer);
+	const num_words = shuffled.length / stride;
+	const bytes = new Uint8Array(shuffled.length);
+	for (let k = 0; k < stride; k++) {
+		for (let i = 0; i < num_words; i++) {
+			bytes[i * stride + k] = shuffled[k * num_words + i];
+		}
+	}
+	return bytes.buffer;
+}
+
+function fetch_array_buffer(properties){
+	// Fetches the binary file of an element, preferring its compressed sidecar if the browser can decode it.
+	const format = decompression_formats[properties['binary_compression']];
+	if (format === undefined || typeof DecompressionStream === 'undefined') {
+		return fetch(properties['binary_filename']).then(response => response.arrayBuffer());
+	}
+	return fetch(properties['binary_compressed_filename'])
+		.then(response => new Response(response.body.pipeThrough(new DecompressionStream(format))).arrayBuffer())
+		.then(buffer => unshuffle_bytes(buffer, properties['binary_shuffle']));
+}
+
+function fetch_binary(properties){
+	// Resolves to [buffer, byte_offset] locating the binary payload of an element.
+	if (!('binary_offset' in properties)) {
+		return fetch_array_buffer(properties).then(buffer => [buffer, 0]);
+	}
+	const binary_filename = properties['binary_filename'];
+	if (!binary_containers.has(binary_filename)) {
+		binary_containers.set(binary_filename, fetch_array_buffer(properties));
+	}
+	return binary_containers.get(binary_filename).then(buffer => [buffer, properties['binary_offset']]);
+}
+
+const position_arrays = {'float32': Float32Array, 'int16': Int16Array};
+
+function get_position_attribute(buffer, offset, num_vertices, properties){
+	// Returns the position attribute and its size in bytes, including the padding to 4 bytes.
+	// Quantized positions are uploaded as integers and dequantized on the GPU.
+	const position_encoding = properties['position_encoding'] || 'float32';
+	const positions = new position_arrays[position_encoding](buffer, offset, 3 * num_vertices);
+	const num_bytes = Math.ceil(positions.byteLength / 4) * 4;
+	if (position_encoding === 'float32') {
+		return [new THREE.Float32BufferAttribute(positions, 3), num_bytes];
+	}
+	return [new THREE.BufferAttribute(positions, 3), num_bytes];
+}
+
 function get_lines(properties){
     var geometry = new THREE.BufferGeometry();
-    let binary_filename = properties['binary_filename'];
-    var positions = [];
     let num_lines = properties['num_lines'];
 
-    fetch(binary_filename)
-    .then(response => response.arrayBuffer())
-    .then(buffer => {
-        positions = new Float32Array(buffer, 0, 3 * num_lines * 2);
-        let colors_uint8 = new Uint8Array(buffer, (3 * num_lines * 2) * 4, 3 * num_lines * 2);
+    fetch_binary(properties)
+    .then(([buffer, offset]) => {
+        const [positions, positions_bytes] = get_position_attribute(buffer, offset, num_lines * 2, properties);
+        let colors_uint8 = new Uint8Array(buffer, offset + positions_bytes, 3 * num_lines * 2);
         let colors_float32 = Float32Array.from(colors_uint8);
         for (let i=0; i<colors_float32.length; i++) {
          	colors_float32[i] /= 255.0;
         }
-        geometry.setAttribute('position', new THREE.Float32BufferAttribute(positions, 3));
+        geometry.setAttribute('position', positions);
         geometry.setAttribute('color', new THREE.Float32BufferAttribute(colors_float32, 3));
     }).then(step_progress_bar).then(render);
 	var material = new THREE.LineBasicMaterial({color: 0xFFFFFF, vertexColors: true});
-	return new THREE.LineSegments( geometry, material );
+	let lines = new THREE.LineSegments( geometry, material );
+	if ('position_scale' in properties) {
+		// Dequantize with the model matrix of the line segments.
+		lines.scale.fromArray(properties['position_scale']);
+		lines.position.fromArray(properties['position_offset']);
+	}
+	return lines;
 }
 
 function get_cube(){
@@ -113,46 +172,260 @@ function set_camera_properties(properties){
 	controls.update();
 }
 
+function get_normal_encoding(properties){
+	// Older scenes always contain float32 normals, null means the normal block is omitted.
+	return ('normal_encoding' in properties) ? properties['normal_encoding'] : 'float32';
+}
+
+function set_points_attributes(geometry, buffer, offset, num_points, properties){
+	// Reads a block of positions, normals and colors starting at offset into the geometry.
+	const normal_encoding = get_normal_encoding(properties);
+	const [positions, positions_bytes] = get_position_attribute(buffer, offset, num_points, properties);
+	let normals_bytes = 0;
+	if (normal_encoding === 'float32') {
+		const normals = new Float32Array(buffer, offset + positions_bytes, 3 * num_points);
+		geometry.setAttribute('normal', new THREE.Float32BufferAttribute(normals, 3));
+		normals_bytes = normals.byteLength;
+	} else if (normal_encoding !== null) {
+		// Octahedral normals are normalized to [-1, 1] on upload and decoded in the vertex shader.
+		const array_type = (normal_encoding === 'oct16') ? Int16Array : Int8Array;
+		const normals = new array_type(buffer, offset + positions_bytes, 2 * num_points);
+		geometry.setAttribute('normal_oct', new THREE.BufferAttribute(normals, 2, true));
+		normals_bytes = Math.ceil(normals.byteLength / 4) * 4;
+	}
+	let colors_uint8 = new Uint8Array(buffer, offset + positions_bytes + normals_bytes, 3 * num_points);
+	let colors_float32 = Float32Array.from(colors_uint8);
+	for(let i=0; i<colors_float32.length; i++) {
+		colors_float32[i] /= 255.0;
+	}
+	geometry.setAttribute('position', positions);
+	geometry.setAttribute('color', new THREE.Float32BufferAttribute(colors_float32, 3));
+}
+
+function get_points_material(properties){
+	let uniforms = {
+		pointSize: { value: properties['point_size'] },
+		alpha: {value: properties['alpha']},
+		shading_type: {value: properties['shading_type']},
+	};
+	let defines = {};
+	if ('position_scale' in properties) {
+		defines['QUANTIZED_POSITIONS'] = 1;
+		uniforms['position_scale'] = {value: new THREE.Vector3().fromArray(properties['position_scale'])};
+		uniforms['position_offset'] = {value: new THREE.Vector3().fromArray(properties['position_offset'])};
+	}
+	const normal_encoding = get_normal_encoding(properties);
+	if (normal_encoding === 'oct16' || normal_encoding === 'oct8') {
+		defines['OCT_NORMALS'] = 1;
+	}
+	return new THREE.ShaderMaterial( {
+		uniforms:       uniforms,
+		defines:        defines,
+		vertexShader:   document.getElementById( 'vertexshader' ).textContent,
+		fragmentShader: document.getElementById( 'fragmentshader' ).textContent,
+		transparent:    true});
+}
+
 function get_points(properties){
 	// Add points
 	// https://github.com/mrdoob/three.js/blob/master/examples/webgl_buffergeometry_points.html
-	let positions = [];
-	let normals = [];
-	let num_points = properties['num_points'];
+	if ('lod_nodes' in properties) {
+		return get_points_lod(properties);
+	}
 	let geometry = new THREE.BufferGeometry();
-	let binary_filename = properties['binary_filename'];
-
-	fetch(binary_filename)
-	    .then(response => response.arrayBuffer())
-		.then(buffer => {
-			positions = new Float32Array(buffer, 0, 3 * num_points);
-			normals = new Float32Array(buffer, (3 * num_points) * 4, 3 * num_points);
-		    let colors_uint8 = new Uint8Array(buffer, (3 * num_points) * 8, 3 * num_points);
-		    let colors_float32 = Float32Array.from(colors_uint8);
-		    for(let i=0; i<colors_float32.length; i++) {
-			    colors_float32[i] /= 255.0;
-			}
-		    geometry.setAttribute('position', new THREE.Float32BufferAttribute(positions, 3));
-			geometry.setAttribute('normal', new THREE.Float32BufferAttribute(normals, 3));
-			geometry.setAttribute('color', new THREE.Float32BufferAttribute(colors_float32, 3));
-		})
+
+	fetch_binary(properties)
+		.then(([buffer, offset]) => set_points_attributes(geometry, buffer, offset, properties['num_points'], properties))
 		.then(step_progress_bar)
-        .then(render);
+		.then(render);
 
-	 let uniforms = {
-        pointSize: { value: properties['point_size'] },
-		alpha: {value: properties['alpha']},
-		shading_type: {value: properties['shading_type']},
-     };
+	let points = new THREE.Points(geometry, get_points_material(properties));
+	return points
+}
 
-	 let material = new THREE.ShaderMaterial( {
-		uniforms:       uniforms,
-        vertexShader:   document.getElementById( 'vertexshader' ).textContent,
-        fragmentShader: document.getElementById( 'fragmentshader' ).textContent,
-        transparent:    true});
+// Level of detail: octree nodes are loaded until the summed points of all
+// loaded nodes reach the budget, refining the nodes largest on screen first.
+const lod_point_budget = 5000000;
+const lod_min_node_pixel_size = 150;
+let lod_clouds = [];
+
+function get_points_lod(properties){
+	const cube = properties['lod_cube'];
+	const cloud = {properties: properties, group: new THREE.Group(), material: get_points_material(properties),
+	               nodes: new Map(), roots: [], buffer: null, range_probe: null, ranges_supported: false,
+	               num_loaded: 0};
+	for (const [level, x, y, z, num_points, byte_offset, byte_length] of properties['lod_nodes']) {
+		const cell_size = cube[3] / Math.pow(2, level);
+		const min = new THREE.Vector3(cube[0] + x * cell_size, cube[1] + y * cell_size, cube[2] + z * cell_size);
+		const box = new THREE.Box3(min, min.clone().addScalar(cell_size));
+		const node = {level: level, num_points: num_points, byte_offset: byte_offset, byte_length: byte_length,
+		              box: box, sphere: box.getBoundingSphere(new THREE.Sphere()), children: [],
+		              object: null, loading: false, selected: false};
+		cloud.nodes.set(level + '/' + x + '/' + y + '/' + z, node);
+		const parent = cloud.nodes.get((level - 1) + '/' + (x >> 1) + '/' + (y >> 1) + '/' + (z >> 1));
+		if (parent === undefined) {
+			cloud.roots.push(node);
+		} else {
+			parent.children.push(node);
+		}
+	}
+	lod_clouds.push(cloud);
+	return cloud.group;
+}
 
-	let points = new THREE.Points(geometry, material);
-	return points
+function fetch_lod_node(cloud, node){
+	// Resolves to [buffer, byte_offset] of a node. Requests only the node's bytes if the
+	// server supports Range requests, otherwise falls back to fetching the whole file once.
+	const properties = cloud.properties;
+	if (cloud.buffer === null && ('binary_offset' in properties || 'binary_compression' in properties)) {
+		cloud.buffer = fetch_binary(properties);
+	}
+	if (cloud.buffer !== null) {
+		return cloud.buffer.then(([buffer, offset]) => [buffer, offset + node.byte_offset]);
+	}
+	if (cloud.range_probe !== null && !cloud.ranges_supported) {
+		// Wait for the first response to tell whether the server supports ranges.
+		return cloud.range_probe.then(() => fetch_lod_node(cloud, node));
+	}
+	const range = 'bytes=' + node.byte_offset + '-' + (node.byte_offset + node.byte_length - 1);
+	const request = fetch(properties['binary_filename'], {headers: {'Range': range}}).then(response => {
+		if (response.status === 206) {
+			cloud.ranges_supported = true;
+			return response.arrayBuffer().then(buffer => [buffer, 0]);
+		}
+		cloud.buffer = response.arrayBuffer().then(buffer => [buffer, 0]);
+		return cloud.buffer.then(([buffer, offset]) => [buffer, offset + node.byte_offset]);
+	});
+	if (cloud.range_probe === null) {
+		cloud.range_probe = request;
+	}
+	return request;
+}
+
+function load_lod_node(cloud, node){
+	node.loading = true;
+	fetch_lod_node(cloud, node).then(([buffer, offset]) => {
+		node.loading = false;
+		if (!node.selected) {
+			return;
+		}
+		const geometry = new THREE.BufferGeometry();
+		set_points_attributes(geometry, buffer, offset, node.num_points, cloud.properties);
+		node.object = new THREE.Points(geometry, cloud.material);
+		node.object.frustumCulled = false;
+		cloud.group.add(node.object);
+		if (cloud.num_loaded++ === 0) {
+			step_progress_bar();
+		}
+		render();
+	});
+}
+
+function get_node_pixel_size(node){
+	const distance = camera.position.distanceTo(node.sphere.center);
+	if (distance < node.sphere.radius) {
+		return Infinity;
+	}
+	const pixels_per_unit = renderer.domElement.height / (2.0 * Math.tan(THREE.MathUtils.degToRad(camera.fov) / 2.0));
+	return node.sphere.radius / distance * pixels_per_unit;
+}
+
+function heap_push(heap, item){
+	// Binary max-heap on item.pixel_size
+	heap.push(item);
+	let i = heap.length - 1;
+	while (i > 0) {
+		const parent = (i - 1) >> 1;
+		if (heap[parent].pixel_size >= heap[i].pixel_size) {
+			break;
+		}
+		[heap[parent], heap[i]] = [heap[i], heap[parent]];
+		i = parent;
+	}
+}
+
+function heap_pop(heap){
+	const top = heap[0];
+	const last = heap.pop();
+	if (heap.length > 0) {
+		heap[0] = last;
+		let i = 0;
+		while (true) {
+			const left = 2 * i + 1;
+			const right = left + 1;
+			let largest = i;
+			if (left < heap.length && heap[left].pixel_size > heap[largest].pixel_size) {
+				largest = left;
+			}
+			if (right < heap.length && heap[right].pixel_size > heap[largest].pixel_size) {
+				largest = right;
+			}
+			if (largest === i) {
+				break;
+			}
+			[heap[largest], heap[i]] = [heap[i], heap[largest]];
+			i = largest;
+		}
+	}
+	return top;
+}
+
+function update_lod(){
+	if (lod_clouds.length === 0) {
+		return;
+	}
+	camera.updateMatrixWorld();
+	const frustum = new THREE.Frustum().setFromProjectionMatrix(
+		new THREE.Matrix4().multiplyMatrices(camera.projectionMatrix, camera.matrixWorldInverse));
+
+	// The roots of every cloud stay loaded, also while hidden or out of view, so that
+	// each cloud completes its step of the progress bar and shows up without delay.
+	let num_points = 0;
+	let candidates = [];
+	for (const cloud of lod_clouds) {
+		for (const node of cloud.nodes.values()) {
+			node.selected = false;
+		}
+		for (const root of cloud.roots) {
+			root.selected = true;
+			num_points += root.num_points;
+			if (cloud.group.visible && frustum.intersectsBox(root.box)) {
+				for (const child of root.children) {
+					heap_push(candidates, {node: child, pixel_size: get_node_pixel_size(child)});
+				}
+			}
+		}
+	}
+
+	// Greedily select the nodes largest on screen within the point budget.
+	while (candidates.length > 0) {
+		const candidate = heap_pop(candidates);
+		const node = candidate.node;
+		if (candidate.pixel_size <= lod_min_node_pixel_size || !frustum.intersectsBox(node.box)
+		    || num_points + node.num_points > lod_point_budget) {
+			continue;
+		}
+		node.selected = true;
+		num_points += node.num_points;
+		for (const child of node.children) {
+			const pixel_size = get_node_pixel_size(child);
+			if (pixel_size > lod_min_node_pixel_size) {
+				heap_push(candidates, {node: child, pixel_size: pixel_size});
+			}
+		}
+	}
+
+	for (const cloud of lod_clouds) {
+		for (const node of cloud.nodes.values()) {
+			if (node.selected && node.object === null && !node.loading) {
+				load_lod_node(cloud, node);
+			} else if (!node.selected && node.object !== null) {
+				cloud.group.remove(node.object);
+				node.object.geometry.dispose();
+				node.object = null;
+			}
+		}
+	}
 }
 
 function get_labels(properties){
@@ -190,462 +463,155 @@ function get_circles_2d(properties){
 	return labels
 }
 
-function get_mesh(properties){
-	var container = new THREE.Object3D();
-	function loadModel(geometry) {
-		let object;
-		let r = properties['color'][0]
-		let g = properties['color'][1]
-		let b = properties['color'][2]
-		let colorString = "rgb("+r+","+g+", "+b+")"
-		if (geometry.isObject3D) {  // obj
-			object = geometry;
-			object.traverse(
-				function(child) {
-					if (child.isMesh) {
-						child.material.color.set(new THREE.Color(colorString));
-					}
-				});
-		} else {  // ply
-			const materialShader = (geometry.hasAttribute('normal')) ? THREE.MeshPhongMaterial : THREE.MeshBasicMaterial
-			const material = new materialShader({vertexColors: geometry.hasAttribute('color')})
-			if (!geometry.hasAttribute('color')){
-				material.color.set(new THREE.Color(colorString));
-			}
-			object = new THREE.Mesh(geometry, material);
-		}
-
-		object.scale.set(properties['scale'][0], properties['scale'][1], properties['scale'][2])
-		object.setRotationFromQuaternion(new THREE.Quaternion(properties['rotation'][0], properties['rotation'][1], properties['rotation'][2], properties['rotation'][3]))
-		object.position.set(properties['translation'][0], properties['translation'][1], properties['translation'][2])
-		container.add(object)
-		step_progress_bar();
-		render();
-	}
-	const filename_extension = properties['filename'].split('.').pop()
-	console.log(filename_extension)
-
-	let loader;
-	if (filename_extension === 'ply'){
-		loader = new PLYLoader();
-	} else if (filename_extension === 'obj'){
-		loader = new OBJLoader();
-	} else {
-		console.log( 'Unknown mesh extension: ' + filename_extension);
-	}
-	loader.load(properties['filename'], loadModel,
-				function (xhr){ // called when loading is in progresses
-					console.log( ( xhr.loaded / xhr.total * 100 ) + '% loaded' );
-				},
-				function (error){ // called when loading has errors
-					console.log( 'An error happened: ' + error );
-				});
-	return container
-}
-
-function get_superquadric(properties){
-	// Generate superquadric mesh procedurally from parameters
-	let geometry = new THREE.BufferGeometry();
-	let scalings = properties['scalings'];
-	let exponents = properties['exponents'];
-	let resolution = properties['resolution'];
-	let tapering = properties['tapering'];
-	let bending = properties['bending'];
-
-	// Helper functions for superquadric surface
-	function f(o, m) {
-		let sin_o = Math.sin(o);
-		return Math.sign(sin_o) * Math.pow(Math.abs(sin_o), m);
-	}
-
-	function g(o, m) {
-		let cos_o = Math.cos(o);
-		return Math.sign(cos_o) * Math.pow(Math.abs(cos_o), m);
-	}
-
-	// Helper function for bending transformation
-	function apply_bending_axis(x, y, z, val_kb, val_alpha, axis) {
-		if (Math.abs(val_kb) < 1e-3) return {x: x, y: y, z: z};
-		
-		let u, v_coord, w;
-		if (axis === 'z') {
-			u = x; v_coord = y; w = z;
-		} else if (axis === 'x') {
-			u = y; v_coord = z; w = x;
-		} else if (axis === 'y') {
-			u = z; v_coord = x; w = y;
-		}
-		
-		let sin_alpha = Math.sin(val_alpha);
-		let cos_alpha = Math.cos(val_alpha);
-		
-		let beta = Math.atan2(v_coord, u);
-		let r = Math.sqrt(u*u + v_coord*v_coord) * Math.cos(val_alpha - beta);
-		
-		// Clamp kb (simplified version - proper clamping would need array operations)
-		let inv_kb = 1.0 / val_kb;
-		let gamma = w * val_kb;
-		let rho = inv_kb - r;
-		let R = inv_kb - rho * Math.cos(gamma);
-		
-		let expr = (R - r);
-		u = u + expr * cos_alpha;
-		v_coord = v_coord + expr * sin_alpha;
-		w = rho * Math.sin(gamma);
-		
-		if (axis === 'z') {
-			return {x: u, y: v_coord, z: w};
-		} else if (axis === 'x') {
-			return {x: w, y: u, z: v_coord};
-		} else if (axis === 'y') {
-			return {x: v_coord, y: w, z: u};
-		}
+function get_binary_mesh(properties){
+	// The mesh is converted during save(), the viewer only uploads its indexed buffers
+	const geometry = new THREE.BufferGeometry();
+	const num_vertices = properties['num_vertices'];
+	const num_faces = properties['num_faces'];
+	const material = new THREE.MeshPhongMaterial({vertexColors: properties['has_colors']});
+	if (!properties['has_colors']){
+		material.color.set(new THREE.Color("rgb("+properties['color'][0]+","+properties['color'][1]+", "+properties['color'][2]+")"));
 	}
+	const mesh = new THREE.Mesh(geometry, material);
+	mesh.scale.set(properties['scale'][0], properties['scale'][1], properties['scale'][2]);
+	mesh.setRotationFromQuaternion(new THREE.Quaternion(properties['rotation'][0], properties['rotation'][1], properties['rotation'][2], properties['rotation'][3]));
+	mesh.position.set(properties['translation'][0], properties['translation'][1], properties['translation'][2]);
 
-	// Generate vertices using simple uniform sampling
-	let positions = [];
-	let indices = [];
-	let A = scalings[0], B = scalings[1], C = scalings[2];
-	let r = exponents[0], s = exponents[1], t = exponents[2];
-	let N = Math.max(10, Math.min(Math.round((resolution || 30) * 0.8), 50));
-
-	function deform_vertex(x, y, z) {
-		// Apply tapering
-		if (tapering && (Math.abs(tapering[0]) > 1e-6 || Math.abs(tapering[1]) > 1e-6)) {
-			let z_norm = z / C;
-			let fx = tapering[0] * z_norm + 1.0;
-			let fy = tapering[1] * z_norm + 1.0;
-			x = x * fx;
-			y = y * fy;
-		}
-
-		// Apply bending (y-axis, then x-axis, then z-axis)
-		if (bending) {
-			let result = apply_bending_axis(x, y, z, bending[4], bending[5], 'y');
-			x = result.x; y = result.y; z = result.z;
-			result = apply_bending_axis(x, y, z, bending[2], bending[3], 'x');
-			x = result.x; y = result.y; z = result.z;
-			result = apply_bending_axis(x, y, z, bending[0], bending[1], 'z');
-			x = result.x; y = result.y; z = result.z;
+	fetch_binary(properties)
+	.then(([buffer, offset]) => {
+		geometry.setAttribute('position', new THREE.BufferAttribute(new Float32Array(buffer, offset, 3 * num_vertices), 3));
+		geometry.setAttribute('normal', new THREE.BufferAttribute(new Float32Array(buffer, offset + 12 * num_vertices, 3 * num_vertices), 3));
+		geometry.setIndex(new THREE.BufferAttribute(new Uint32Array(buffer, offset + 24 * num_vertices, 3 * num_faces), 1));
+		if (properties['has_colors']){
+			const colors_offset = offset + 24 * num_vertices + 12 * num_faces;
+			geometry.setAttribute('color', new THREE.BufferAttribute(new Uint8Array(buffer, colors_offset, 3 * num_vertices), 3, true));
 		}
+		geometry.computeBoundingSphere();
+	}).then(step_progress_bar).then(render);
+	return mesh;
+}
 
-		// Apply rotation matrix if provided
-		if (properties['rotation_matrix']) {
-			let R = properties['rotation_matrix'];
-			let x_rot = R[0][0] * x + R[0][1] * y + R[0][2] * z;
-			let y_rot = R[1][0] * x + R[1][1] * y + R[1][2] * z;
-			let z_rot = R[2][0] * x + R[2][1] * y + R[2][2] * z;
-			x = x_rot;
-			y = y_rot;
-			z = z_rot;
+function load_mesh_file(filename){
+	// Each mesh file is fetched and parsed once, however many elements use it
+	if (!mesh_file_loads.has(filename)){
+		const filename_extension = filename.split('.').pop();
+		let loader;
+		if (filename_extension === 'ply'){
+			loader = new PLYLoader();
+		} else if (filename_extension === 'obj'){
+			loader = new OBJLoader();
+		} else {
+			return Promise.reject('Unknown mesh extension: ' + filename_extension);
 		}
-
-		return {x: x, y: y, z: z};
+		mesh_file_loads.set(filename, loader.loadAsync(filename));
 	}
+	return mesh_file_loads.get(filename);
+}
 
-	// Arc-length parameterization: find parameter values that produce
-	// equally-spaced points on the actual 3D surface curve.
-	function arc_length_sample(param_start, param_end, n_out, eval_fn) {
-		// 1. Densely sample the curve to approximate arc length
-		let n_dense = 500;
-		let dense_params = new Array(n_dense);
-		let dense_pts = new Array(n_dense);
-		for (let i = 0; i < n_dense; i++) {
-			let t = param_start + (param_end - param_start) * i / (n_dense - 1);
-			dense_params[i] = t;
-			dense_pts[i] = eval_fn(t);
-		}
-
-		// 2. Compute cumulative chord lengths
-		let cum_len = new Array(n_dense);
-		cum_len[0] = 0;
-		for (let i = 1; i < n_dense; i++) {
-			let dx = dense_pts[i][0] - dense_pts[i - 1][0];
-			let dy = dense_pts[i][1] - dense_pts[i - 1][1];
-			let dz = dense_pts[i][2] - dense_pts[i - 1][2];
-			cum_len[i] = cum_len[i - 1] + Math.sqrt(dx * dx + dy * dy + dz * dz);
-		}
-
-		let total_len = cum_len[n_dense - 1];
-		if (total_len < 1e-12) {
-			// Degenerate curve, fall back to uniform
-			let result = new Array(n_out);
-			for (let i = 0; i < n_out; i++) {
-				result[i] = param_start + (param_end - param_start) * i / (n_out - 1);
-			}
-			return result;
-		}
-
-		// 3. Invert: for each desired equal arc-length, find corresponding parameter
-		let result = new Array(n_out);
-		result[0] = param_start;
-		result[n_out - 1] = param_end;
-		let j = 0;
-		for (let i = 1; i < n_out - 1; i++) {
-			let target_len = total_len * i / (n_out - 1);
-			// Advance j until we bracket the target
-			while (j < n_dense - 2 && cum_len[j + 1] < target_len) j++;
-			// Linear interpolation between dense_params[j] and dense_params[j+1]
-			let seg_len = cum_len[j + 1] - cum_len[j];
-			let frac = seg_len > 1e-15 ? (target_len - cum_len[j]) / seg_len : 0;
-			result[i] = dense_params[j] + frac * (dense_params[j + 1] - dense_params[j]);
-		}
-		return result;
+function get_mesh(properties){
+	if ('binary_filename' in properties){
+		return get_binary_mesh(properties);
 	}
-
-	// Sample u at the equator (v=0) for arc-length parameterization
-	let u_samples = arc_length_sample(-Math.PI, Math.PI, N, function(u) {
-		let x = A * g(0, r) * g(u, s);
-		let y = B * g(0, r) * f(u, s);
-		let z = C * f(0, t);
-		return [x, y, z];
-	});
-
-	// Sample v at the prime meridian (u=0) for arc-length parameterization
-	let v_samples = arc_length_sample(-Math.PI * 0.5, Math.PI * 0.5, N, function(v) {
-		let x = A * g(v, r) * g(0, s);
-		let y = B * g(v, r) * f(0, s);
-		let z = C * f(v, t);
-		return [x, y, z];
-	});
-
-	function build_mesh(u_samp, v_samp) {
-		let pos = [];
-		let idx = [];
-		let pMap = new Map();
-		let cnt = 0;
-		let nu = u_samp.length;
-		let nv = v_samp.length;
-		
-		for (let j = 0; j < nv; j++) {
-			for (let i = 0; i < nu; i++) {
-				let u = u_samp[i % nu];
-				let v = v_samp[j % nv];
-				let x = A * g(v, r) * g(u, s);
-				let y = B * g(v, r) * f(u, s);
-				let z = C * f(v, t);
-				let p = deform_vertex(x, y, z);
-				pos.push(p.x, p.y, p.z);
-				pMap.set(i + ',' + j, cnt++);
-			}
-		}
-		
-		for (let j = 0; j < nv - 1; j++) {
-			for (let i = 0; i < nu - 1; i++) {
-				let i00 = pMap.get(i + ',' + j);
-				let i10 = pMap.get((i + 1) + ',' + j);
-				let i11 = pMap.get((i + 1) + ',' + (j + 1));
-				let i01 = pMap.get(i + ',' + (j + 1));
-				idx.push(i00, i10, i11, i00, i11, i01);
-			}
-			// Connect seam
-			let iLast = nu - 1;
-			let i00 = pMap.get(iLast + ',' + j);
-			let i10 = pMap.get(0 + ',' + j);
-			let i11 = pMap.get(0 + ',' + (j + 1));
-			let i01 = pMap.get(iLast + ',' + (j + 1));
-			idx.push(i00, i10, i11, i00, i11, i01);
-		}
-		return {pos: pos, idx: idx};
+	// Meshes sharing a file and a color are drawn by one InstancedMesh per group, see create_mesh_instances().
+	// The returned object only carries the pose and visibility of this instance.
+	const placeholder = new THREE.Object3D();
+	placeholder.scale.set(properties['scale'][0], properties['scale'][1], properties['scale'][2]);
+	placeholder.setRotationFromQuaternion(new THREE.Quaternion(properties['rotation'][0], properties['rotation'][1], properties['rotation'][2], properties['rotation'][3]));
+	placeholder.position.set(properties['translation'][0], properties['translation'][1], properties['translation'][2]);
+
+	const key = properties['filename'] + '|' + properties['color'].join(',');
+	if (!mesh_instance_groups.has(key)){
+		mesh_instance_groups.set(key, {properties: properties, placeholders: [], meshes: []});
 	}
+	mesh_instance_groups.get(key).placeholders.push(placeholder);
+	placeholder.userData.mesh_instance_group = mesh_instance_groups.get(key);
+	return placeholder;
+}
 
-	// Resample the grid so all edges are equal length on the actual 3D surface.
-	// For each v-row, compute arc lengths along u, then redistribute u params equally.
-	// Then for each u-column, compute arc lengths along v, redistribute v params equally.
-	function resample_grid(u_samp, v_samp) {
-		let nu = u_samp.length;
-		let nv = v_samp.length;
-
-		// Evaluate a surface point (before deformation, since we parameterize pre-deform)
-		function eval_pt(u, v) {
-			let x = A * g(v, r) * g(u, s);
-			let y = B * g(v, r) * f(u, s);
-			let z = C * f(v, t);
-			let p = deform_vertex(x, y, z);
-			return [p.x, p.y, p.z];
-		}
-
-		function dist3(a, b) {
-			let dx = a[0]-b[0], dy = a[1]-b[1], dz = a[2]-b[2];
-			return Math.sqrt(dx*dx + dy*dy + dz*dz);
-		}
-
-		// Step 1: For each v value, resample u by arc length
-		// Average the arc-length distributions across all v-rows
-		let u_cum = new Float64Array(nu); // averaged cumulative arc lengths
-		for (let j = 0; j < nv; j++) {
-			let v = v_samp[j];
-			let prev = eval_pt(u_samp[0], v);
-			let row_cum = 0;
-			for (let i = 1; i < nu; i++) {
-				let cur = eval_pt(u_samp[i], v);
-				row_cum += dist3(prev, cur);
-				u_cum[i] += row_cum;
-				prev = cur;
-			}
-		}
-		for (let i = 0; i < nu; i++) u_cum[i] /= nv;
-
-		let u_total = u_cum[nu - 1];
-		let new_u = new Array(nu);
-		new_u[0] = u_samp[0];
-		new_u[nu - 1] = u_samp[nu - 1];
-		if (u_total > 1e-12) {
-			let k = 0;
-			for (let i = 1; i < nu - 1; i++) {
-				let target = u_total * i / (nu - 1);
-				while (k < nu - 2 && u_cum[k + 1] < target) k++;
-				let seg = u_cum[k + 1] - u_cum[k];
-				let frac = seg > 1e-15 ? (target - u_cum[k]) / seg : 0;
-				new_u[i] = u_samp[k] + frac * (u_samp[k + 1] - u_samp[k]);
-			}
-		} else {
-			new_u = u_samp.slice();
-		}
-
-		// Step 2: For each u value, resample v by arc length
-		let v_cum = new Float64Array(nv);
-		for (let i = 0; i < nu; i++) {
-			let u = new_u[i];
-			let prev = eval_pt(u, v_samp[0]);
-			let col_cum = 0;
-			for (let j = 1; j < nv; j++) {
-				let cur = eval_pt(u, v_samp[j]);
-				col_cum += dist3(prev, cur);
-				v_cum[j] += col_cum;
-				prev = cur;
+function create_mesh_instances(){
+	for (const group of mesh_instance_groups.values()){
+		const properties = group.properties;
+		const color = new THREE.Color("rgb("+properties['color'][0]+","+properties['color'][1]+", "+properties['color'][2]+")");
+		load_mesh_file(properties['filename'])
+		.then(loaded => {
+			let parts = [];  // [geometry, material, matrix within the loaded file]
+			if (loaded.isObject3D) {  // obj
+				loaded.updateMatrixWorld(true);
+				loaded.traverse(function(child) {
+					if (child.isMesh) {
+						const material = child.material.clone();  // the file may be shared with other colors
+						material.color.set(color);
+						parts.push([child.geometry, material, child.matrixWorld.clone()]);
+					}
+				});
+			} else {  // ply
+				const materialShader = (loaded.hasAttribute('normal')) ? THREE.MeshPhongMaterial : THREE.MeshBasicMaterial
+				const material = new materialShader({vertexColors: loaded.hasAttribute('color')})
+				if (!loaded.hasAttribute('color')){
+					material.color.set(color);
+				}
+				parts.push([loaded, material, new THREE.Matrix4()]);
 			}
-		}
-		for (let j = 0; j < nv; j++) v_cum[j] /= nu;
-
-		let v_total = v_cum[nv - 1];
-		let new_v = new Array(nv);
-		new_v[0] = v_samp[0];
-		new_v[nv - 1] = v_samp[nv - 1];
-		if (v_total > 1e-12) {
-			let k = 0;
-			for (let j = 1; j < nv - 1; j++) {
-				let target = v_total * j / (nv - 1);
-				while (k < nv - 2 && v_cum[k + 1] < target) k++;
-				let seg = v_cum[k + 1] - v_cum[k];
-				let frac = seg > 1e-15 ? (target - v_cum[k]) / seg : 0;
-				new_v[j] = v_samp[k] + frac * (v_samp[k + 1] - v_samp[k]);
+			for (const [geometry, material, matrix] of parts){
+				const mesh = new THREE.InstancedMesh(geometry, material, group.placeholders.length);
+				mesh.userData.part_matrix = matrix;
+				mesh.frustumCulled = false;
+				group.meshes.push(mesh);
+				scene.add(mesh);
 			}
-		} else {
-			new_v = v_samp.slice();
-		}
-
-		return {u: new_u, v: new_v};
+			update_mesh_instances(group);
+			group.placeholders.forEach(step_progress_bar);
+			render();
+		})
+		.catch(error => console.log('An error happened: ' + error));
 	}
+}
 
-	// Subdivide in high-curvature areas by inserting midpoints where
-	// normals change direction rapidly between adjacent grid cells
-	function subdivide_high_curvature(u_samp, v_samp) {
-		let nu = u_samp.length;
-		let nv = v_samp.length;
-
-		function eval_pt(u, v) {
-			let x = A * g(v, r) * g(u, s);
-			let y = B * g(v, r) * f(u, s);
-			let z = C * f(v, t);
-			let p = deform_vertex(x, y, z);
-			return [p.x, p.y, p.z];
-		}
-
-		// Compute normals at each grid point via central differences
-		let normals = new Array(nu * nv);
-		let eps = 1e-4;
-		for (let j = 0; j < nv; j++) {
-			for (let i = 0; i < nu; i++) {
-				let u = u_samp[i], v = v_samp[j];
-				let du_p = eval_pt(u + eps, v), du_m = eval_pt(u - eps, v);
-				let dv_p = eval_pt(u, v + eps), dv_m = eval_pt(u, v - eps);
-				let tu = [(du_p[0]-du_m[0]), (du_p[1]-du_m[1]), (du_p[2]-du_m[2])];
-				let tv = [(dv_p[0]-dv_m[0]), (dv_p[1]-dv_m[1]), (dv_p[2]-dv_m[2])];
-				// Cross product tu x tv
-				let nx = tu[1]*tv[2] - tu[2]*tv[1];
-				let ny = tu[2]*tv[0] - tu[0]*tv[2];
-				let nz = tu[0]*tv[1] - tu[1]*tv[0];
-				let len = Math.sqrt(nx*nx + ny*ny + nz*nz);
-				if (len > 1e-12) { nx /= len; ny /= len; nz /= len; }
-				normals[j * nu + i] = [nx, ny, nz];
-			}
-		}
-
-		// For each grid edge, compute dot product of adjacent normals.
-		// Small dot product = high curvature = insert midpoint.
-		let u_set = new Set(u_samp);
-		let v_set = new Set(v_samp);
-
-		// Check u-edges (along rows)
-		for (let j = 0; j < nv; j++) {
-			for (let i = 0; i < nu - 1; i++) {
-				let n1 = normals[j * nu + i];
-				let n2 = normals[j * nu + i + 1];
-				let dot = n1[0]*n2[0] + n1[1]*n2[1] + n1[2]*n2[2];
-				if (dot < 0.95) { // normal changes by > ~18 degrees
-					u_set.add((u_samp[i] + u_samp[i + 1]) * 0.5);
-				}
-			}
-		}
-
-		// Check v-edges (along columns)
-		for (let i = 0; i < nu; i++) {
-			for (let j = 0; j < nv - 1; j++) {
-				let n1 = normals[j * nu + i];
-				let n2 = normals[(j + 1) * nu + i];
-				let dot = n1[0]*n2[0] + n1[1]*n2[1] + n1[2]*n2[2];
-				if (dot < 0.95) {
-					v_set.add((v_samp[j] + v_samp[j + 1]) * 0.5);
-				}
+function update_mesh_instances(group){
+	// Copies pose and visibility of the placeholders to the instances, after loading and when the menu toggles them
+	const hidden = new THREE.Matrix4().makeScale(0, 0, 0);
+	const matrix = new THREE.Matrix4();
+	group.placeholders.forEach((placeholder, i) => {
+		placeholder.updateMatrix();
+		for (const mesh of group.meshes){
+			if (placeholder.visible){
+				mesh.setMatrixAt(i, matrix.multiplyMatrices(placeholder.matrix, mesh.userData.part_matrix));
+			} else {
+				mesh.setMatrixAt(i, hidden);
 			}
 		}
-
-		return {
-			u: Array.from(u_set).sort((a, b) => a - b),
-			v: Array.from(v_set).sort((a, b) => a - b)
-		};
-	}
-
-	// Iteratively resample to converge on equal-edge-length grid
-	let cur_u = u_samples;
-	let cur_v = v_samples;
-	for (let iter = 0; iter < 5; iter++) {
-		let resampled = resample_grid(cur_u, cur_v);
-		cur_u = resampled.u;
-		cur_v = resampled.v;
-	}
-
-	// Subdivide high-curvature regions, then re-equalize
-	let subdiv = subdivide_high_curvature(cur_u, cur_v);
-	cur_u = subdiv.u;
-	cur_v = subdiv.v;
-	for (let iter = 0; iter < 3; iter++) {
-		let resampled = resample_grid(cur_u, cur_v);
-		cur_u = resampled.u;
-		cur_v = resampled.v;
+	});
+	for (const mesh of group.meshes){
+		mesh.instanceMatrix.needsUpdate = true;
 	}
+}
 
-	let final_mesh = build_mesh(cur_u, cur_v);
-	positions = final_mesh.pos;
-	indices = final_mesh.idx;
-
-	geometry.setAttribute('position', new THREE.Float32BufferAttribute(positions, 3));
-	geometry.setIndex(indices);
-	geometry.computeVertexNormals();
-
-	// Set vertex colors
-	let r_color = Math.fround(properties['color'][0] / 255.0);
-	let g_color = Math.fround(properties['color'][1] / 255.0);
-	let b_color = Math.fround(properties['color'][2] / 255.0);
-	let num_vertices = positions.length / 3;
-	let colors = new Float32Array(num_vertices * 3);
-	for (let i = 0; i < num_vertices; i++){
-		colors[3 * i + 0] = r_color;
-		colors[3 * i + 1] = g_color;
-		colors[3 * i + 2] = b_color;
-	}
-	geometry.setAttribute('color', new THREE.BufferAttribute(colors, 3));
+function get_superquadric(properties){
+	// The mesh is generated during save(), the viewer only uploads its buffers
+	let geometry = new THREE.BufferGeometry();
+	const num_vertices = properties['num_vertices'];
+	const num_faces = properties['num_faces'];
+
+	let mesh;
+	fetch_binary(properties)
+	.then(([buffer, offset]) => {
+		geometry.setAttribute('position', new THREE.BufferAttribute(new Float32Array(buffer, offset, 3 * num_vertices), 3));
+		geometry.setAttribute('normal', new THREE.BufferAttribute(new Float32Array(buffer, offset + 12 * num_vertices, 3 * num_vertices), 3));
+		geometry.setIndex(new THREE.BufferAttribute(new Uint32Array(buffer, offset + 24 * num_vertices, 3 * num_faces), 1));
+		set_geometry_vertex_color(geometry, properties['color']);
+		// Add wireframe if requested
+		if (properties['wireframe']) {
+			let wireframeGeometry = new THREE.WireframeGeometry(geometry);
+			let wireframeMaterial = new THREE.LineBasicMaterial({
+				color: 0x000000,
+				linewidth: 1,
+				opacity: 0.5,
+				transparent: true
+			});
+			let wireframe = new THREE.LineSegments(wireframeGeometry, wireframeMaterial);
+			mesh.add(wireframe);
+		}
+	}).then(step_progress_bar).then(render);
 
 	let uniforms = {
 		alpha: {value: properties['alpha']},
@@ -659,7 +625,7 @@ function get_superquadric(properties){
 		side: THREE.DoubleSide,
 	});
 
-	let mesh = new THREE.Mesh(geometry, material);
+	mesh = new THREE.Mesh(geometry, material);
 	mesh.setRotationFromQuaternion(new THREE.Quaternion(
 		properties['rotation'][0],
 		properties['rotation'][1],
@@ -668,26 +634,64 @@ function get_superquadric(properties){
 	));
 	mesh.position.set(properties['translation'][0], properties['translation'][1], properties['translation'][2]);
 
-	// Add wireframe if requested
-	if (properties['wireframe']) {
-		let wireframeGeometry = new THREE.WireframeGeometry(geometry);
-		let wireframeMaterial = new THREE.LineBasicMaterial({ 
-			color: 0x000000,
-			linewidth: 1,
-			opacity: 0.5,
-			transparent: true
-		});
-		let wireframe = new THREE.LineSegments(wireframeGeometry, wireframeMaterial);
-		mesh.add(wireframe);
+	// The mesh is in the local frame, the optional rotation matrix acts on it before the quaternion
+	if (properties['rotation_matrix']) {
+		const R = properties['rotation_matrix'];
+		mesh.updateMatrix();
+		mesh.matrix.multiply(new THREE.Matrix4().set(
+			R[0][0], R[0][1], R[0][2], 0,
+			R[1][0], R[1][1], R[1][2], 0,
+			R[2][0], R[2][1], R[2][2], 0,
+			0, 0, 0, 1));
+		mesh.matrixAutoUpdate = false;
 	}
 
-	step_progress_bar();
-	render();
-
 	return mesh;
 }
 
 
+function get_superquadrics(properties){
+	const superquadrics = new THREE.Group();
+	const material = get_instances_material(properties['alpha']);
+	material.side = THREE.DoubleSide;  // As for a single superquadric
+
+	fetch_binary(properties)
+	.then(([buffer, offset]) => {
+		const num_superquadrics = properties['num_superquadrics'];
+		const instances_offset = offset + properties['instances_offset'];
+		const translations = new Float32Array(buffer, instances_offset, 3 * num_superquadrics);
+		const rotations = new Float32Array(buffer, instances_offset + 12 * num_superquadrics, 4 * num_superquadrics);
+		const scales = new Float32Array(buffer, instances_offset + 28 * num_superquadrics, 3 * num_superquadrics);
+		const colors = new Uint8Array(buffer, instances_offset + 40 * num_superquadrics, 3 * num_superquadrics);
+		const matrix = new THREE.Matrix4();
+		const position = new THREE.Vector3();
+		const quaternion = new THREE.Quaternion();
+		const scale = new THREE.Vector3();
+		const color = new THREE.Color();
+		// One instanced draw per template, the instances are sorted by template
+		for (const [num_vertices, num_faces, byte_offset, first_instance, num_instances] of properties['templates']) {
+			const template_offset = offset + byte_offset;
+			const geometry = new THREE.BufferGeometry();
+			geometry.setAttribute('position', new THREE.BufferAttribute(new Float32Array(buffer, template_offset, 3 * num_vertices), 3));
+			geometry.setAttribute('normal', new THREE.BufferAttribute(new Float32Array(buffer, template_offset + 12 * num_vertices, 3 * num_vertices), 3));
+			geometry.setIndex(new THREE.BufferAttribute(new Uint32Array(buffer, template_offset + 24 * num_vertices, 3 * num_faces), 1));
+			const mesh = new THREE.InstancedMesh(geometry, material, num_instances);
+			for (let i = 0; i < num_instances; i++) {
+				const k = first_instance + i;
+				position.fromArray(translations, 3 * k);
+				quaternion.fromArray(rotations, 4 * k);
+				scale.fromArray(scales, 3 * k);
+				mesh.setMatrixAt(i, matrix.compose(position, quaternion, scale));
+				color.setRGB(colors[3 * k] / 255.0, colors[3 * k + 1] / 255.0, colors[3 * k + 2] / 255.0);
+				mesh.setColorAt(i, color);
+			}
+			mesh.frustumCulled = false;
+			superquadrics.add(mesh);
+		}
+	}).then(step_progress_bar).then(render);
+	return superquadrics;
+}
+
 function get_material(alpha){
 	let uniforms = {
 		alpha: {value: alpha},
@@ -702,6 +706,13 @@ function get_material(alpha){
     return material;
 }
 
+function get_instances_material(alpha){
+	// The material of get_material() for an InstancedMesh with per-instance matrices and colors
+	const material = get_material(alpha);
+	material.defines = {MESH_INSTANCES: ''};
+	return material;
+}
+
 function set_geometry_vertex_color(geometry, color){
 	const r = Math.fround(color[0] / 255.0);
 	const g = Math.fround(color[1] / 255.0);
@@ -828,6 +839,83 @@ function get_cuboid(properties){
 	return cuboid
 }
 
+// Unit edge offsets of a box: the 4 edges along x, y and z, and its 8 corners.
+const cuboid_edges = [
+	[0, -1, -1], [0, 1, -1], [0, -1, 1], [0, 1, 1],
+	[-1, 0, -1], [1, 0, -1], [-1, 0, 1], [1, 0, 1],
+	[-1, -1, 0], [1, -1, 0], [-1, 1, 0], [1, 1, 0]];
+const cuboid_corners = [
+	[-1, -1, -1], [1, -1, -1], [-1, 1, -1], [1, 1, -1],
+	[-1, -1, 1], [1, -1, 1], [-1, 1, 1], [1, 1, 1]];
+
+function get_cuboids(properties){
+	const num_cuboids = properties['num_cuboids'];
+	const material = get_instances_material(properties['alpha']);
+	// Cylinders have unit height along y and are scaled to the edge length per instance.
+	const edges = new THREE.InstancedMesh(
+		new THREE.CylinderGeometry(properties['edge_width'], properties['edge_width'], 1, 12),
+		material, 12 * num_cuboids);
+	const corners = new THREE.InstancedMesh(
+		new THREE.SphereGeometry(properties['edge_width'], 12, 8),
+		material, 8 * num_cuboids);
+	for (const mesh of [edges, corners]) {
+		mesh.instanceColor = new THREE.InstancedBufferAttribute(new Float32Array(3 * mesh.count), 3);
+		mesh.frustumCulled = false;
+		mesh.count = 0;  // Nothing to draw until the binary is loaded
+	}
+
+	fetch_binary(properties)
+	.then(([buffer, offset]) => {
+		const positions = new Float32Array(buffer, offset, 3 * num_cuboids);
+		const sizes = new Float32Array(buffer, offset + 12 * num_cuboids, 3 * num_cuboids);
+		const rotations = new Float32Array(buffer, offset + 24 * num_cuboids, 4 * num_cuboids);
+		const colors = new Uint8Array(buffer, offset + 40 * num_cuboids, 3 * num_cuboids);
+		// Rotations of the y-aligned cylinder onto the x, y and z axes
+		const axis_rotations = [
+			new THREE.Matrix4().makeRotationZ(Math.PI / 2.0),
+			new THREE.Matrix4(),
+			new THREE.Matrix4().makeRotationX(Math.PI / 2.0)];
+		const box = new THREE.Matrix4();
+		const local = new THREE.Matrix4();
+		const position = new THREE.Vector3();
+		const quaternion = new THREE.Quaternion();
+		const unit_scale = new THREE.Vector3(1, 1, 1);
+		const color = new THREE.Color();
+		for (let i = 0; i < num_cuboids; i++) {
+			position.fromArray(positions, 3 * i);
+			quaternion.fromArray(rotations, 4 * i);
+			box.compose(position, quaternion, unit_scale);
+			const size = [sizes[3 * i], sizes[3 * i + 1], sizes[3 * i + 2]];
+			color.setRGB(colors[3 * i] / 255.0, colors[3 * i + 1] / 255.0, colors[3 * i + 2] / 255.0);
+			for (let j = 0; j < 12; j++) {
+				const axis = Math.floor(j / 4);
+				const edge = cuboid_edges[j];
+				local.makeScale(1.0, size[axis], 1.0).premultiply(axis_rotations[axis]);
+				local.setPosition(edge[0] * size[0] / 2.0, edge[1] * size[1] / 2.0, edge[2] * size[2] / 2.0);
+				edges.setMatrixAt(12 * i + j, local.premultiply(box));
+				edges.setColorAt(12 * i + j, color);
+			}
+			for (let j = 0; j < 8; j++) {
+				const corner = cuboid_corners[j];
+				local.makeTranslation(corner[0] * size[0] / 2.0, corner[1] * size[1] / 2.0, corner[2] * size[2] / 2.0);
+				corners.setMatrixAt(8 * i + j, local.premultiply(box));
+				corners.setColorAt(8 * i + j, color);
+			}
+		}
+		edges.count = 12 * num_cuboids;
+		corners.count = 8 * num_cuboids;
+		for (const mesh of [edges, corners]) {
+			mesh.instanceMatrix.needsUpdate = true;
+			mesh.instanceColor.needsUpdate = true;
+		}
+	}).then(step_progress_bar).then(render);
+
+	const cuboids = new THREE.Group();
+	cuboids.add(edges);
+	cuboids.add(corners);
+	return cuboids;
+}
+
 function get_polyline(properties){
 	const radius_top = properties['edge_width']
 	const radius_bottom = properties['edge_width']
@@ -905,6 +993,52 @@ function get_arrow(properties){
 	return arrow;
 }
 
+function get_arrows(properties){
+	const num_arrows = properties['num_arrows'];
+	const arrows = new THREE.Group();
+	// Shaft and head templates with radius 1 spanning y in [0, 1], placed per arrow in the vertex shader
+	const templates = {
+		'shaft': new THREE.CylinderGeometry(1, 1, 1, 15).translate(0, 0.5, 0),
+		'head': new THREE.CylinderGeometry(0, 1, 1, 15).translate(0, 0.5, 0)};
+	const geometries = [];
+	for (const [part, template] of Object.entries(templates)) {
+		const geometry = new THREE.InstancedBufferGeometry().copy(template);
+		geometry.instanceCount = 0;  // Nothing to draw until the binary is loaded
+		const defines = {ARROW_INSTANCES: ''};
+		if (part === 'head') {
+			defines['ARROW_HEAD'] = '';
+		}
+		const material = new THREE.ShaderMaterial({
+			uniforms: {
+				alpha: {value: properties['alpha']},
+				shading_type: {value: 1},
+				stroke_width: {value: properties['stroke_width']},
+				head_width: {value: properties['head_width']}},
+			defines: defines,
+			vertexShader: document.getElementById('vertexshader').textContent,
+			fragmentShader: document.getElementById('fragmentshader').textContent,
+			transparent: true});
+		const mesh = new THREE.Mesh(geometry, material);
+		mesh.frustumCulled = false;
+		arrows.add(mesh);
+		geometries.push(geometry);
+	}
+
+	fetch_binary(properties)
+	.then(([buffer, offset]) => {
+		const starts = new THREE.InstancedBufferAttribute(new Float32Array(buffer, offset, 3 * num_arrows), 3);
+		const ends = new THREE.InstancedBufferAttribute(new Float32Array(buffer, offset + 12 * num_arrows, 3 * num_arrows), 3);
+		const colors = new THREE.InstancedBufferAttribute(new Uint8Array(buffer, offset + 24 * num_arrows, 3 * num_arrows), 3, true);
+		for (const geometry of geometries) {
+			geometry.setAttribute('arrow_start', starts);
+			geometry.setAttribute('arrow_end', ends);
+			geometry.setAttribute('arrow_color', colors);
+			geometry.instanceCount = num_arrows;
+		}
+	}).then(step_progress_bar).then(render);
+	return arrows;
+}
+
 function get_three_color(color) {
 	if (color[0] > 1. || color[1] > 1. || color[2] > 1. ) {
 		color[0] = color[0] / 255.
@@ -1020,6 +1154,15 @@ function get_ground(){
 
 
 
+function on_visibility_change(object){
+	return function(){
+		if ('mesh_instance_group' in object.userData){
+			update_mesh_instances(object.userData.mesh_instance_group);
+		}
+		render();
+	};
+}
+
 function init_gui(objects){
 	let menuMap = new Map();
 	for (const [name, value] of Object.entries(objects)){
@@ -1030,17 +1173,18 @@ function init_gui(objects){
 				menuMap.set(folder_name, gui.addFolder(folder_name));
 			}
 			let fol = menuMap.get(folder_name);
-			fol.add(value, 'visible').name(splits[1]).onChange(render);
+			fol.add(value, 'visible').name(splits[1]).onChange(on_visibility_change(value));
 			fol.open();
 		} else {
 			if (value.name.localeCompare('labels') != 0) {
-				gui.add(value, 'visible').name(name).onChange(render);
+				gui.add(value, 'visible').name(name).onChange(on_visibility_change(value));
 			}
 		}
 	}
 }
 
 function render() {
+	update_lod();
     renderer.render(scene, camera);
 	labelRenderer.render(scene, camera);
 }
@@ -1134,6 +1278,10 @@ function create_threejs_objects(properties){
 			step_progress_bar();
 			render();
 		}
+		if (String(object_properties['type']).localeCompare('cuboids') == 0){
+			threejs_objects[object_name] = get_cuboids(object_properties);
+			render();
+		}
 		if (String(object_properties['type']).localeCompare('polyline') == 0){
 			threejs_objects[object_name] = get_polyline(object_properties);
 			step_progress_bar();
@@ -1144,11 +1292,19 @@ function create_threejs_objects(properties){
 			step_progress_bar();
 			render();
 		}
+		if (String(object_properties['type']).localeCompare('arrows') == 0){
+			threejs_objects[object_name] = get_arrows(object_properties);
+			render();
+		}
 		if (String(object_properties['type']).localeCompare('motion') == 0){
 			threejs_objects[object_name] = get_motion(object_properties);
 			step_progress_bar();
 			render();
 		}
+		if (String(object_properties['type']).localeCompare('superquadrics') == 0){
+			threejs_objects[object_name] = get_superquadrics(object_properties);
+			render();
+		}
 		if (String(object_properties['type']).localeCompare('superquadric') == 0){
 			threejs_objects[object_name] = get_superquadric(object_properties);
 			render();
@@ -1157,6 +1313,8 @@ function create_threejs_objects(properties){
 		threejs_objects[object_name].frustumCulled = false;
 	}
 	
+	create_mesh_instances();
+
 	// Add axis helper
 	threejs_objects['Axis'] = new THREE.AxesHelper(1);
 
@@ -1210,6 +1368,9 @@ const gui = new GUI({autoPlace: true, width: 120});
 
 // dict containing all objects of the scene
 let threejs_objects = {};
+// Meshes loaded from files, grouped by file and color into one InstancedMesh each
+const mesh_instance_groups = new Map();
+const mesh_file_loads = new Map();
 
 init();
 
@@ -0,0 +1,69 @@
+"""Chunked ingestion of point clouds that do not fit into memory."""
+
+import tempfile
+
+import numpy as np
+
+
+def _map_spool(spool, dtype, num_points):
+    """Memory-map the Nx3 array written to a spool file, which is closed afterwards."""
+    spool.flush()
+    if num_points == 0:
+        array = np.zeros((0, 3), dtype=dtype)
+    else:
+        array = np.memmap(spool, dtype=dtype, mode='r', shape=(num_points, 3))
+    spool.close()  # The mapping stays valid, the file is removed once it is unmapped.
+    return array
+
+
+def spool_points(chunks, directory=None):
+    """Write chunks of points to temporary files and memory-map them.
+
+    Only one chunk is held in memory at a time. Chunks without colors are
+    stored in gray. The normals must be given for every chunk or for none.
+
+    Args:
+        chunks: Iterable of (positions, colors, normals) tuples of Mx3 arrays,
+            where colors and normals may be None.
+        directory: Directory of the temporary files, defaults to the system one.
+
+    Returns:
+        Tuple (positions, colors, normals, bounds) with Nx3 float32 positions,
+        Nx3 uint8 colors, Nx3 float32 normals or None, and the
+        (lower, upper) corners of the bounding box.
+    """
+    spools = {}
+    has_normals = None
+    num_points = 0
+    lower = np.full(3, np.inf)
+    upper = np.full(3, -np.inf)
+    for positions, colors, normals in chunks:
+        positions = np.ascontiguousarray(positions, dtype=np.float32)
+        assert positions.ndim == 2 and positions.shape[1] == 3
+        if has_normals is None:
+            has_normals = normals is not None
+            spools = {key: tempfile.TemporaryFile(dir=directory) for key, used in
+                      (('positions', True), ('colors', True), ('normals', has_normals)) if used}
+        assert (normals is not None) == has_normals, 'normals must be given for all chunks or for none'
+        if positions.shape[0] == 0:
+            continue
+        spools['positions'].write(positions)
+        if colors is None:
+            colors = np.full(positions.shape, 50, dtype=np.uint8)  # gray
+        assert colors.shape == positions.shape
+        spools['colors'].write(np.ascontiguousarray(colors, dtype=np.uint8))
+        if has_normals:
+            assert normals.shape == positions.shape
+            spools['normals'].write(np.ascontiguousarray(normals, dtype=np.float32))
+        lower = np.minimum(lower, positions.min(axis=0))
+        upper = np.maximum(upper, positions.max(axis=0))
+        num_points += positions.shape[0]
+
+    if not spools:
+        spools = {key: tempfile.TemporaryFile(dir=directory) for key in ('positions', 'colors')}
+    positions = _map_spool(spools['positions'], np.float32, num_points)
+    colors = _map_spool(spools['colors'], np.uint8, num_points)
+    normals = _map_spool(spools['normals'], np.float32, num_points) if has_normals else None
+    if num_points == 0:
+        lower, upper = np.zeros(3), np.zeros(3)
+    return positions, colors, normals, (lower, upper)
@@ -0,0 +1,132 @@
+"""Superquadrics class i.e. many superquadrics rendered by shared templates."""
+import numpy as np
+from . import encoding
+from . import ply
+from . import primitives
+from .superquadric import cached_superquadric_mesh
+
+
+class Superquadrics:
+    """Set of superquadrics that share mesh templates between equal shapes.
+
+    Tapering commutes with scaling, so shapes without bending use a template
+    of unit size, scaled per instance. Primitives that only differ in scale,
+    pose and color therefore share one template.
+    """
+
+    def __init__(self, scalings, exponents, translations, rotations, colors, resolution, alpha, tapering, bending, visible):
+        """Initialize the superquadrics.
+
+        Args:
+            scalings: Nx3 scale factors.
+            exponents: Nx3 shape exponents.
+            translations: Nx3 float32 translations.
+            rotations: Nx4 float32 unit quaternions [x, y, z, w].
+            colors: Nx3 uint8 RGB colors.
+            resolution: Mesh sampling resolution.
+            alpha: Transparency value in [0, 1].
+            tapering: Nx2 tapering parameters [kx, ky].
+            bending: Nx6 bending parameters [kb_z, alpha_z, kb_x, alpha_x, kb_y, alpha_y].
+            visible: Whether the superquadrics are visible.
+        """
+        self.scalings = scalings
+        self.exponents = exponents
+        self.translations = translations
+        self.rotations = rotations
+        self.colors = colors
+        self.resolution = resolution
+        self.alpha = alpha
+        self.tapering = tapering
+        self.bending = bending
+        self.visible = visible
+        self._templates = None
+
+    def get_templates(self):
+        """Group the superquadrics by mesh template.
+
+        Returns:
+            Tuple (templates, order, scales). templates is a list of
+            (mesh, num_instances) in the order of the instances sorted by
+            template, order is that sorting, and scales are the Nx3 float32
+            per-instance scales to apply to the templates.
+        """
+        if self._templates is None:
+            bent = np.abs(self.bending[:, [0, 2, 4]]).max(axis=1) >= 1e-3
+            template_scalings = np.where(bent[:, np.newaxis], self.scalings, 1.0)
+            scales = np.where(bent[:, np.newaxis], 1.0, self.scalings).astype(np.float32)
+            keys = {}
+            template_ids = np.empty(len(self.scalings), dtype=np.int64)
+            for i in range(len(self.scalings)):
+                key = (tuple(template_scalings[i]), tuple(self.exponents[i]), tuple(self.tapering[i]), tuple(self.bending[i]))
+                template_ids[i] = keys.setdefault(key, len(keys))
+            order = np.argsort(template_ids, kind='stable')
+            counts = np.bincount(template_ids, minlength=len(keys))
+            templates = [(cached_superquadric_mesh(np.array(key[0]), np.array(key[1]), self.resolution,
+                                                   np.array(key[2]), np.array(key[3])), int(count))
+                         for key, count in zip(keys, counts)]
+            self._templates = templates, order, scales
+        return self._templates
+
+    def get_properties(self, binary_filename):
+        """Return JSON-serializable properties for the superquadrics.
+
+        Args:
+            binary_filename: Name of the binary data file containing templates and instances.
+
+        Returns:
+            A dict of properties for the web viewer.
+        """
+        templates, _, _ = self.get_templates()
+        # One row [num_vertices, num_faces, byte_offset, first_instance, num_instances] per template
+        rows = []
+        byte_offset = 0
+        first_instance = 0
+        for (vertices, _, faces), count in templates:
+            rows.append([int(vertices.shape[0]), int(faces.shape[0]), byte_offset, first_instance, count])
+            byte_offset += 24 * vertices.shape[0] + 12 * faces.shape[0]
+            first_instance += count
+        json_dict = {
+            'type': 'superquadrics',
+            'num_superquadrics': self.translations.shape[0],
+            'alpha': float(self.alpha),
+            'visible': self.visible,
+            'templates': rows,
+            'instances_offset': byte_offset,
+            'binary_filename': binary_filename}
+        return json_dict
+
+    def write_binary(self, path):
+        """Write the templates followed by the instance translations, rotations, scales and colors.
+
+        The instances are sorted by template.
+        """
+        templates, order, scales = self.get_templates()
+        with open(path, "wb") as f:
+            for mesh, _ in templates:
+                for array in mesh:
+                    encoding.write_array(f, array)
+            for array in (self.translations, self.rotations, scales, self.colors):
+                encoding.write_array(f, array[order])
+
+    def write_blender(self, path):
+        """Write a Blender-friendly mesh of all superquadrics as binary PLY."""
+        templates, order, scales = self.get_templates()
+        rotations = primitives.quaternions_to_matrices(self.rotations[order])
+        all_vertices, all_triangles, all_colors = [], [], []
+        num_vertices = 0
+        first = 0
+        for (vertices, _, faces), count in templates:
+            instances = slice(first, first + count)
+            placed, triangles = primitives.instance_mesh(
+                vertices, faces.astype(np.int64), rotations[instances], scales[order][instances],
+                self.translations[order][instances])
+            all_vertices.append(placed)
+            all_triangles.append(triangles + num_vertices)
+            all_colors.append(np.repeat(self.colors[order][instances], len(vertices), axis=0))
+            num_vertices += len(placed)
+            first += count
+
+        vertices = np.concatenate(all_vertices)
+        triangles = np.concatenate(all_triangles)
+        ply.write_mesh(path, vertices, triangles, primitives.vertex_normals(vertices, triangles),
+                       np.concatenate(all_colors))
@@ -0,0 +1,77 @@
+"""TriangleMesh class i.e. an indexed triangle mesh given as arrays."""
+import numpy as np
+from . import encoding
+from . import ply
+from . import primitives
+
+
+class TriangleMesh:
+    """Indexed triangle mesh with optional per-vertex colors.
+
+    The viewer draws it like a mesh loaded from a file, but the vertices,
+    normals, faces and colors are stored directly in the binary file.
+    """
+
+    def __init__(self, vertices, faces, vertex_colors=None, vertex_normals=None, translation=None, rotation=None,
+                 scale=None, color=None, visible=True):
+        """Initialize the triangle mesh.
+
+        Args:
+            vertices: Vx3 vertex positions.
+            faces: Fx3 vertex indices of the triangles.
+            vertex_colors: Optional Vx3 RGB colors in 0-255.
+            vertex_normals: Optional Vx3 normals, computed from the faces if None.
+            translation: 3D translation vector.
+            rotation: Quaternion rotation (4,).
+            scale: Scale vector (3,).
+            color: RGB color array-like in 0-255, used without vertex_colors.
+            visible: Whether the mesh is visible.
+        """
+        if faces.ndim != 2 or faces.shape[1] != 3:
+            raise ValueError("Faces must be an Fx3 array of triangles, got shape %r" % (faces.shape,))
+        if faces.size and (faces.min() < 0 or faces.max() >= vertices.shape[0]):
+            raise ValueError("Face indices must be in [0, %d)" % vertices.shape[0])
+        self.vertices = np.ascontiguousarray(vertices, dtype=np.float32)
+        self.faces = np.ascontiguousarray(faces, dtype=np.uint32)
+        if vertex_normals is None:
+            vertex_normals = primitives.vertex_normals(self.vertices, self.faces)
+        self.vertex_normals = np.ascontiguousarray(vertex_normals, dtype=np.float32)
+        self.vertex_colors = None if vertex_colors is None else np.ascontiguousarray(vertex_colors, dtype=np.uint8)
+        self.translation = [0.0, 0.0, 0.0] if translation is None else np.asarray(translation).tolist()
+        self.rotation = [0.0, 0.0, 0.0, 1.0] if rotation is None else np.asarray(rotation).tolist()
+        self.scale = [1.0, 1.0, 1.0] if scale is None else np.asarray(scale).tolist()
+        self.color = [200, 200, 200] if color is None else np.asarray(color).tolist()
+        self.visible = visible
+
+    def get_properties(self, binary_filename):
+        """Return JSON-serializable properties for the mesh.
+
+        Args:
+            binary_filename: Name of the binary data file containing the mesh.
+
+        Returns:
+            A dict of properties for the web viewer.
+        """
+        json_dict = {
+            'type': 'mesh',
+            'translation': self.translation,
+            'rotation': self.rotation,
+            'scale': self.scale,
+            'visible': self.visible,
+            'color': self.color,
+            'num_vertices': self.vertices.shape[0],
+            'num_faces': self.faces.shape[0],
+            'has_colors': self.vertex_colors is not None,
+            'binary_filename': binary_filename}
+        return json_dict
+
+    def write_binary(self, path):
+        """Write float32 vertices and normals, uint32 faces and uint8 colors to a binary file."""
+        with open(path, "wb") as f:
+            for array in (self.vertices, self.vertex_normals, self.faces, self.vertex_colors):
+                if array is not None:
+                    encoding.write_array(f, array)
+
+    def write_blender(self, path):
+        """Write a Blender-friendly mesh as binary PLY."""
+        ply.write_mesh(path, self.vertices, self.faces, self.vertex_normals, self.vertex_colors)
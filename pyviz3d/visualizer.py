@@ -4,19 +4,32 @@ from .points import Points
 from .labels import Labels
 from .lines import Lines
 from .mesh import Mesh
+from .triangle_mesh import TriangleMesh
 from .camera import Camera
 from .cuboid import Cuboid
+from .cuboids import Cuboids
 from .polyline import Polyline
 from .arrow import Arrow
+from .arrows import Arrows
 from .circles_2d import Circles2D
 from .motion import Motion
 from .blender_config import BlenderConfig
+from .blender_render import render_async
+from .render_cache import RenderCache
 from .superquadric import Superquadric
+from .superquadrics import Superquadrics
+from .streaming import spool_points
+from . import manifest
+from . import packing
+from . import encoding
+from . import primitives
+from .compression import check_compression, compress_file, compression_properties, COMPRESSION_SUFFIXES
 
 import os
 import sys
 import shutil
 import json
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_EXCEPTION
 import numpy as np
 
 def euler_to_quaternion(x: float, y: float, z: float):
@@ -86,7 +99,14 @@ class Visualizer:
              path: str,
              port: int = 6008,
              blender_config: BlenderConfig = None,
-             verbose: bool = True) -> None:
+             verbose: bool = True,
+             incremental: bool = False,
+             workers: int = 1,
+             packed: bool = False,
+             pack_size: int = 256 * 2**20,
+             compression: str = None,
+             render_pool=None,
+             block: bool = True):
         """Creates the visualization and displays the link to it.
 
         Args:
@@ -94,31 +114,155 @@ class Visualizer:
             port: Port used in the printed local server command.
             blender_config: Optional Blender render configuration.
             verbose: Whether to print the web-server message.
+            incremental: If True, reuse the output of a previous save to the same
+                path and only rewrite elements whose content hash changed.
+            workers: Number of threads used to write the element files. The
+                first failing element aborts the save with its exception.
+            packed: If True, concatenate the element binaries into a few
+                container files instead of one file per element.
+            pack_size: Maximum size in bytes of a container when packed=True.
+            compression: Optional 'zlib', 'gzip' or 'brotli'. Writes a compressed
+                sidecar next to every binary file. The viewer decodes zlib and
+                gzip sidecars itself. It never reads brotli sidecars, which only
+                help if the web server serves them precompressed (e.g. nginx
+                brotli_static). brotli needs the brotli package.
+            render_pool: Optional BlenderRenderPool that renders the scene in an
+                already running Blender instead of starting a new one.
+            block: If False, render in the background and return right after
+                exporting, so the next scene can be built while this one renders.
+
+        Returns:
+            The RenderFuture of the Blender render if block is False and a render
+            was started, otherwise None.
         """
 
-        # Delete destination directory if it exists already
+        check_compression(compression)
+        if packed and incremental:
+            raise ValueError("Packed and incremental saves cannot be combined.")
+
         directory_destination = os.path.abspath(path)
-        if os.path.isdir(directory_destination):
+        directory_source = os.path.realpath(os.path.join(os.path.dirname(__file__), "src"))
+
+        # Without a manifest from a previous save nothing in the destination can be reused
+        previous_manifest = manifest.load_manifest(directory_destination) if incremental else None
+        if previous_manifest is None and os.path.isdir(directory_destination):
             shutil.rmtree(directory_destination)
 
         # Copy website directory
-        directory_source = os.path.realpath(os.path.join(os.path.dirname(__file__), "src"))
-        shutil.copytree(directory_source, directory_destination)
+        assets_hash = manifest.hash_directory(directory_source) if incremental else None
+        if previous_manifest is None or previous_manifest.get('assets') != assets_hash:
+            shutil.copytree(directory_source, directory_destination, dirs_exist_ok=True,
+                            ignore=manifest.ignore_bytecode)
+        previous_elements = previous_manifest['elements'] if previous_manifest else {}
 
         # Assemble binary data files
         nodes_dict = {}
+        manifest_elements = {}
+        element_hashes = {}
+        pending = []
+        num_skipped = 0
+        bytes_skipped = 0
         for name, e in self.elements.items():
-            binary_file_path = os.path.join(directory_destination, name + ".bin")
             nodes_dict[name] = e.get_properties(name + ".bin")
+            if incremental:
+                element_hashes[name] = manifest.hash_element(e, nodes_dict[name])
+                previous = previous_elements.get(name)
+                if (previous is not None and previous['hash'] == element_hashes[name]
+                        and (previous['blender'] or not blender_config)
+                        and previous.get('compression') == compression
+                        and all(os.path.exists(os.path.join(directory_destination, f)) for f in previous['files'])):
+                    manifest_elements[name] = previous
+                    if compression and name + ".bin" + COMPRESSION_SUFFIXES[compression] in previous['files']:
+                        nodes_dict[name].update(compression_properties(
+                            name + ".bin" + COMPRESSION_SUFFIXES[compression], compression))
+                    num_skipped += 1
+                    bytes_skipped += sum(os.path.getsize(os.path.join(directory_destination, f)) for f in previous['files'])
+                    continue
+            pending.append(name)
+
+        # A render of the same scene and config in the cache replaces write_blender() and Blender
+        render_cache = None
+        render_cached = False
+        if blender_config and blender_config.cache_dir:
+            render_cache = RenderCache(blender_config.cache_dir, blender_config.cache_max_bytes)
+            render_key = render_cache.key(
+                blender_config,
+                {name: element_hashes.get(name) or manifest.hash_element(e, nodes_dict[name])
+                 for name, e in self.elements.items()},
+                os.path.join(directory_source, "blender_tools.py"))
+            render_cached = render_cache.restore(render_key, directory_destination)
+        write_blender = blender_config and not render_cached
+
+        compression_stats = {}
+
+        def write_element(name):
+            e = self.elements[name]
+            binary_file_path = os.path.join(directory_destination, name + ".bin")
             e.write_binary(binary_file_path)
-            if blender_config:
-                blender_file_path = os.path.join(directory_destination, name + ".ply")
-                e.write_blender(blender_file_path)
+            if write_blender:
+                e.write_blender(os.path.join(directory_destination, name + ".ply"))
+            if compression and not packed and os.path.exists(binary_file_path):
+                compression_stats[name] = compress_file(binary_file_path, compression)
+
+        if workers > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(write_element, name) for name in pending]
+                done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+                for future in not_done:
+                    future.cancel()
+                for future in futures:
+                    if future in done and future.exception() is not None:
+                        raise future.exception()
+        else:
+            for name in pending:
+                write_element(name)
+
+        if incremental:
+            for name in pending:
+                files = [name + ".bin"] if os.path.exists(os.path.join(directory_destination, name + ".bin")) else []
+                if 'filename' in nodes_dict[name]:  # Mesh file copy, may be shared by several elements
+                    files.append(nodes_dict[name]['filename'])
+                if write_blender and os.path.exists(os.path.join(directory_destination, name + ".ply")):
+                    files.append(name + ".ply")
+                if name in compression_stats:
+                    files.append(os.path.basename(compression_stats[name][0]))
+                manifest_elements[name] = {'hash': element_hashes[name], 'blender': bool(write_blender),
+                                           'compression': compression, 'files': files}
+
+        # Delete files of elements that were removed or no longer produce them, unless another element uses them
+        current_files = {f for properties in manifest_elements.values() for f in properties['files']}
+        for previous in previous_elements.values():
+            for f in previous['files']:
+                file_path = os.path.join(directory_destination, f)
+                if f not in current_files and os.path.exists(file_path):
+                    os.remove(file_path)
+
+        if packed:
+            containers = packing.pack_binaries(directory_destination, list(self.elements), nodes_dict, pack_size)
+            for container in containers if compression else []:
+                compression_stats[container] = compress_file(os.path.join(directory_destination, container), compression)
+
+        for name, (sidecar_path, _, _, _) in compression_stats.items():
+            sidecar_properties = compression_properties(os.path.basename(sidecar_path), compression)
+            if packed:  # name is a container shared by several elements
+                for properties in nodes_dict.values():
+                    if properties.get('binary_filename') == name:
+                        properties.update(sidecar_properties)
+            else:
+                nodes_dict[name].update(sidecar_properties)
+        if verbose:
+            for name, (_, raw_size, compressed_size, seconds) in compression_stats.items():
+                print("Compressed %s: %d -> %d bytes (ratio %.2f, %.1f MB/s)" % (
+                    name, raw_size, compressed_size, raw_size / max(compressed_size, 1),
+                    raw_size / 1e6 / max(seconds, 1e-9)))
 
         # Write json file containing all scene elements
-        json_file = os.path.join(directory_destination, "nodes.json")
-        with open(json_file, "w") as outfile:
-            json.dump(nodes_dict, outfile)
+        manifest.write_json_atomic(os.path.join(directory_destination, "nodes.json"), nodes_dict)
+        if incremental:
+            manifest.write_json_atomic(os.path.join(directory_destination, manifest.MANIFEST_FILENAME),
+                                       {'assets': assets_hash, 'elements': manifest_elements})
+            if verbose:
+                print("Skipped %d unchanged elements (%d bytes)." % (num_skipped, bytes_skipped))
 
         # Display link
         if verbose:
@@ -133,28 +277,80 @@ class Visualizer:
             print("    http://localhost:" + str(port))
             print("=" * 72)
 
+        if render_cache and verbose:
+            stats = render_cache.stats()
+            print("Render cache %s (%d hits, %d misses)." % (
+                "hit" if render_cached else "miss", stats['hits'], stats['misses']))
+
         # Render in blender if arguments are not None
-        if blender_config:
-            self.show_in_blender(path, blender_config, verbose)
+        if write_blender and block:
+            self.show_in_blender(path, blender_config, verbose, render_pool)
+            if render_cache:
+                render_cache.store(render_key, directory_destination,
+                                   render_cache.output_files(directory_destination, blender_config))
+        elif write_blender:
+            future = self.show_in_blender_async(path, blender_config, verbose, render_pool=render_pool)
+            if render_cache:
+                def store_render(future):
+                    if not future.cancelled() and future.exception() is None:
+                        render_cache.store(render_key, directory_destination,
+                                           render_cache.output_files(directory_destination, blender_config))
+                future.add_done_callback(store_render)
+            return future
 
     def show_in_blender(self,
                         path: str,
                         blender_config: BlenderConfig,
-                        verbose: bool=True):
+                        verbose: bool=True,
+                        render_pool=None):
         """Generate Blender scripts and optionally render a scene.
 
         Args:
             path: Destination directory with scene files.
             blender_config: Blender render configuration.
             verbose: Whether to print Blender instructions.
+            render_pool: Optional BlenderRenderPool to render with instead of a new Blender process.
         """
+        result = self.show_in_blender_async(path, blender_config, verbose, render_pool=render_pool).result()
 
+        if verbose and render_pool is not None:
+            print("Rendered by Blender worker %d in %.1f s." % (result['worker'], result['seconds']))
+        elif verbose:
+            print("")
+            print("=" * 72)
+            print("Blender rendering:")
+            for cmd in result:
+                print("cd " + os.path.abspath(path) + "; " + " ".join(cmd))
+            print("=" * 72)
+
+    def show_in_blender_async(self,
+                              path: str,
+                              blender_config: BlenderConfig,
+                              verbose: bool=False,
+                              progress=None,
+                              timeout: float=None,
+                              render_pool=None):
+        """Generate Blender scripts and render the scene in the background.
+
+        Args:
+            path: Destination directory with scene files.
+            blender_config: Blender render configuration.
+            verbose: Whether to print rendering progress.
+            progress: Optional callback progress(frame, num_started, num_frames), called
+                whenever Blender starts rendering a new frame.
+            timeout: Optional maximum number of seconds for rendering.
+            render_pool: Optional BlenderRenderPool to render with instead of a new Blender process.
+
+        Returns:
+            A RenderFuture. Its result() raises RuntimeError if Blender fails, TimeoutError
+            on timeout and CancelledError after cancel(), which also stops the render.
+        """
         directory_destination = os.path.abspath(path)
         blender_script_path = os.path.join(directory_destination, "blender_script.py")
         blender_config_path = os.path.join(directory_destination, "blender_config.json")
         with open(blender_config_path, 'w') as json_file:
             json.dump(blender_config.to_dict(), json_file, indent=2)
-        
+
         with open(blender_script_path, "w") as outfile:
             outfile.write(
 "import bpy\nimport os\n\
@@ -163,18 +359,8 @@ sys.path.append(os.getcwd())\n\
 import blender_tools\n\
 blender_tools.main()")
 
-        cmd = "cd " + directory_destination + "; " + blender_config.blender_path + " --background --python blender_script.py"
-        if blender_config.render:
-            cmd = cmd + " -- " + blender_config.output_prefix
-        os.system(cmd)
+        return render_async(directory_destination, blender_config, verbose, progress, timeout, render_pool)
 
-        if verbose:
-            print("")
-            print("=" * 72)
-            print("Blender rendering:")
-            print(cmd)
-            print("=" * 72)
-        
     def add_points(
         self,
         name: str,
@@ -185,39 +371,98 @@ blender_tools.main()")
         resolution: int=3,
         visible: bool=True,
         alpha: float=1.0,
+        position_encoding: str='float32',
+        normal_encoding: str='float32',
+        lod: bool=False,
+        lod_node_size: int=100000,
     ):
         """Add points to the visualizer.
 
         Args:
             name: Element name. Use ';' to create sub-layers.
-            positions: Nx3 point positions.
+            positions: Nx3 point positions. float32 positions, uint8 colors and
+                float32 normals are used without copying, which lets np.memmap
+                inputs stay on disk until save() streams them to the output.
             colors: Optional Nx3 RGB colors.
             normals: Optional Nx3 normals.
             point_size: Point size in viewer units.
             resolution: Blender sphere resolution.
             visible: Whether points are visible.
             alpha: Transparency in [0, 1].
+            position_encoding: 'float32', or 'int16' to store positions quantized
+                relative to the bounding box of the points.
+            normal_encoding: 'float32', or 'oct16'/'oct8' to store normals as
+                two integers using an octahedral mapping.
+            lod: Whether to split the points into an octree whose nodes the
+                viewer loads depending on their size on screen. Use this for
+                clouds with tens of millions of points.
+            lod_node_size: Maximum number of points per octree node.
         """
 
         assert positions.shape[1] == 3
+        encoding.check_position_encoding(position_encoding)
+        encoding.check_normal_encoding(normal_encoding)
         assert colors is None or positions.shape == colors.shape
         assert normals is None or positions.shape == normals.shape
 
         shading_type = 1  # Phong shading
         if colors is None:
-            colors = np.ones(positions.shape, dtype=np.uint8) * 50  # gray
+            colors = np.full(positions.shape, 50, dtype=np.uint8)  # gray
         if normals is None:
-            normals = np.ones(positions.shape, dtype=np.float32)
             shading_type = 0  # Uniform shading when no normals are available
+        else:
+            normals = normals.astype(np.float32, copy=False)
 
-        positions = positions.astype(np.float32)
-        colors = colors.astype(np.uint8)
-        normals = normals.astype(np.float32)
+        # Keep the arrays (and memmaps) of the caller if their dtypes already match
+        positions = positions.astype(np.float32, copy=False)
+        colors = colors.astype(np.uint8, copy=False)
 
         alpha = min(max(alpha, 0.0), 1.0)  # cap alpha to [0..1]
 
         self.elements[self.__parse_name(name)] = Points(
-            positions, colors, normals, point_size, resolution, visible, alpha, shading_type
+            positions, colors, normals, point_size, resolution, visible, alpha, shading_type, position_encoding, normal_encoding,
+            lod, lod_node_size
+        )
+
+    def add_points_stream(
+        self,
+        name: str,
+        chunks,
+        point_size: int=25,
+        resolution: int=3,
+        visible: bool=True,
+        alpha: float=1.0,
+        position_encoding: str='float32',
+        normal_encoding: str='float32',
+        spool_dir: str=None,
+    ):
+        """Add points that are read chunk by chunk, e.g. tiles of a large survey.
+
+        The chunks are spooled to temporary files which are memory-mapped, so
+        peak memory is bounded by the chunk size rather than the cloud size,
+        both here and in save().
+
+        Args:
+            name: Element name. Use ';' to create sub-layers.
+            chunks: Iterable of (positions, colors, normals) tuples of Mx3
+                arrays, where colors and normals may be None. Normals must be
+                given for every chunk or for none.
+            point_size: Point size in viewer units.
+            resolution: Blender sphere resolution.
+            visible: Whether points are visible.
+            alpha: Transparency in [0, 1].
+            position_encoding: 'float32' or 'int16', see add_points().
+            normal_encoding: 'float32', 'oct16' or 'oct8', see add_points().
+            spool_dir: Directory of the temporary files, defaults to the system one.
+        """
+        encoding.check_position_encoding(position_encoding)
+        encoding.check_normal_encoding(normal_encoding)
+        positions, colors, normals, bounds = spool_points(chunks, spool_dir)
+        shading_type = 0 if normals is None else 1
+        alpha = min(max(alpha, 0.0), 1.0)  # cap alpha to [0..1]
+        self.elements[self.__parse_name(name)] = Points(
+            positions, colors, normals, point_size, resolution, visible, alpha, shading_type, position_encoding, normal_encoding,
+            bounds=bounds
         )
 
     def add_labels(self,
@@ -261,7 +506,8 @@ blender_tools.main()")
                   lines_start: np.array,
                   lines_end: np.array,
                   colors: np.array = None,
-                  visible: bool = True):
+                  visible: bool = True,
+                  position_encoding: str = 'float32'):
         """Add lines to the visualizer.
 
         Args:
@@ -270,9 +516,12 @@ blender_tools.main()")
             lines_end: Nx3 end points.
             colors: Optional Nx3 RGB colors.
             visible: Whether lines are visible.
+            position_encoding: 'float32', or 'int16' to store positions quantized
+                relative to the bounding box of the lines.
         """
 
         assert lines_start.shape[1] == 3
+        encoding.check_position_encoding(position_encoding)
         assert lines_start.shape == lines_end.shape
         assert colors is None or lines_start.shape == colors.shape
 
@@ -282,7 +531,7 @@ blender_tools.main()")
         colors = colors.astype(np.uint8)
         lines_start = lines_start.astype(np.float32)
         lines_end = lines_end.astype(np.float32)
-        self.elements[self.__parse_name(name)] = Lines(lines_start, lines_end, colors, colors, visible)
+        self.elements[self.__parse_name(name)] = Lines(lines_start, lines_end, colors, colors, visible, position_encoding)
 
     def add_bounding_box(self,
                          name: str,
@@ -308,6 +557,45 @@ blender_tools.main()")
         rotation /= np.linalg.norm(rotation)  # normalize the orientation
         self.elements[self.__parse_name(name)] = Cuboid(position, size, rotation, color, alpha, edge_width, visible)
 
+    def add_bounding_boxes(self,
+                           name: str,
+                           positions: np.array,
+                           sizes: np.array,
+                           rotations: np.array = None,
+                           colors: np.array = None,
+                           alpha: float = 1.0,
+                           edge_width: float = 0.01,
+                           visible: bool = True):
+        """Add many oriented 3D bounding boxes as a single element.
+
+        The boxes are stored in one binary file and drawn with instancing,
+        which scales to thousands of boxes unlike repeated add_bounding_box().
+
+        Args:
+            name: Element name.
+            positions: Nx3 box center positions.
+            sizes: Nx3 box dimensions.
+            rotations: Optional Nx4 quaternion rotations [x, y, z, w].
+            colors: Optional Nx3 RGB colors in 0-255, or one color (3,) for all boxes.
+            alpha: Transparency in [0, 1].
+            edge_width: Width of box edges.
+            visible: Whether the boxes are visible.
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+        sizes = np.asarray(sizes, dtype=np.float32).reshape(-1, 3)
+        assert positions.shape == sizes.shape
+        num_boxes = positions.shape[0]
+        if rotations is None:
+            rotations = np.tile(np.array([0.0, 0.0, 0.0, 1.0], dtype=np.float32), (num_boxes, 1))
+        rotations = np.asarray(rotations, dtype=np.float32).reshape(-1, 4)
+        assert rotations.shape[0] == num_boxes
+        rotations = rotations / np.linalg.norm(rotations, axis=1, keepdims=True)  # normalize the orientations
+        if colors is None:
+            colors = np.array([255, 0, 0])
+        colors = np.ascontiguousarray(np.broadcast_to(np.asarray(colors, dtype=np.uint8), (num_boxes, 3)))
+        alpha = min(max(alpha, 0.0), 1.0)  # cap alpha to [0..1]
+        self.elements[self.__parse_name(name)] = Cuboids(positions, sizes, rotations, colors, alpha, edge_width, visible)
+
     def add_mesh(self,
                  name: str,
                  path: str,
@@ -315,7 +603,8 @@ blender_tools.main()")
                  rotation: np.array = np.array([0.0, 0.0, 0.0, 1.0]),
                  scale: np.array = np.array([1, 1, 1]),
                  color: np.array = np.array([200, 200, 200]),
-                 visible: bool = True):
+                 visible: bool = True,
+                 convert: bool = False):
         """Add a polygon mesh to the scene.
 
         Args:
@@ -326,9 +615,41 @@ blender_tools.main()")
             scale: Scale vector (3,).
             color: RGB color array-like in 0-255.
             visible: Whether the mesh is visible.
+            convert: If True, load the mesh with trimesh during save() and store it
+                as binary buffers, so the browser does not have to parse the file.
         """
         rotation /= np.linalg.norm(rotation)  # normalize the orientation
-        self.elements[self.__parse_name(name)] = Mesh(path, translation=translation, rotation=rotation, scale=scale, color=color, visible=visible)
+        self.elements[self.__parse_name(name)] = Mesh(path, translation=translation, rotation=rotation, scale=scale, color=color, visible=visible, convert=convert)
+
+    def add_triangle_mesh(self,
+                          name: str,
+                          vertices: np.array,
+                          faces: np.array,
+                          vertex_colors: np.array = None,
+                          vertex_normals: np.array = None,
+                          translation: np.array = np.array([0.0, 0.0, 0.0]),
+                          rotation: np.array = np.array([0.0, 0.0, 0.0, 1.0]),
+                          scale: np.array = np.array([1, 1, 1]),
+                          color: np.array = np.array([200, 200, 200]),
+                          visible: bool = True):
+        """Add a triangle mesh given as arrays, e.g. the output of marching cubes.
+
+        Args:
+            name: Element name.
+            vertices: Vx3 vertex positions.
+            faces: Fx3 vertex indices of the triangles.
+            vertex_colors: Optional Vx3 RGB colors in 0-255.
+            vertex_normals: Optional Vx3 normals, computed from the faces if None.
+            translation: Translation vector (3,).
+            rotation: Quaternion rotation [x, y, z, w] (4,).
+            scale: Scale vector (3,).
+            color: RGB color array-like in 0-255, used without vertex_colors.
+            visible: Whether the mesh is visible.
+        """
+        rotation = rotation / np.linalg.norm(rotation)  # normalize the orientation
+        self.elements[self.__parse_name(name)] = TriangleMesh(
+            vertices, faces, vertex_colors=vertex_colors, vertex_normals=vertex_normals, translation=translation,
+            rotation=rotation, scale=scale, color=color, visible=visible)
 
     def add_polyline(self,
                      name: str,
@@ -399,6 +720,59 @@ blender_tools.main()")
             wireframe=wireframe,
         )
 
+    def add_superquadrics(
+        self,
+        name: str,
+        scalings: np.array,
+        exponents: np.array,
+        translations: np.array,
+        rotations: np.array = None,
+        colors: np.array = None,
+        resolution: int = 30,
+        alpha: float = 1.0,
+        tapering: np.array = None,
+        bending: np.array = None,
+        visible: bool = True,
+    ):
+        """Add many superquadrics as a single element, e.g. a shape decomposition.
+
+        Superquadrics of equal shape share one mesh template, which the viewer
+        draws with instancing. Shapes without bending share templates across
+        different scalings.
+
+        Args:
+            name: Element name.
+            scalings: Nx3 scale factors along x, y, z.
+            exponents: Nx3 superquadric shape exponents.
+            translations: Nx3 translation vectors.
+            rotations: Optional Nx4 quaternions [x, y, z, w] or Nx3x3 rotation matrices.
+            colors: Optional Nx3 RGB colors in 0-255, or one color (3,) for all superquadrics.
+            resolution: Mesh sampling resolution.
+            alpha: Transparency in [0, 1].
+            tapering: Optional Nx2 tapering parameters [kx, ky].
+            bending: Optional Nx6 bending parameters [kb_z, alpha_z, kb_x, alpha_x, kb_y, alpha_y].
+            visible: Whether the superquadrics are visible.
+        """
+        scalings = np.asarray(scalings, dtype=np.float64).reshape(-1, 3)
+        num_superquadrics = scalings.shape[0]
+        exponents = np.asarray(exponents, dtype=np.float64).reshape(num_superquadrics, 3)
+        translations = np.asarray(translations, dtype=np.float32).reshape(num_superquadrics, 3)
+        if rotations is None:
+            rotations = np.tile(np.array([0.0, 0.0, 0.0, 1.0]), (num_superquadrics, 1))
+        rotations = np.asarray(rotations, dtype=np.float64)
+        if rotations.shape[1:] == (3, 3):
+            rotations = primitives.matrices_to_quaternions(rotations)
+        rotations = rotations.reshape(num_superquadrics, 4)
+        rotations = (rotations / np.linalg.norm(rotations, axis=1, keepdims=True)).astype(np.float32)  # normalize
+        if colors is None:
+            colors = np.array([255, 255, 255])
+        colors = np.ascontiguousarray(np.broadcast_to(np.asarray(colors, dtype=np.uint8), (num_superquadrics, 3)))
+        tapering = np.zeros((num_superquadrics, 2)) if tapering is None else np.asarray(tapering, dtype=np.float64).reshape(-1, 2)
+        bending = np.zeros((num_superquadrics, 6)) if bending is None else np.asarray(bending, dtype=np.float64).reshape(-1, 6)
+        alpha = min(max(alpha, 0.0), 1.0)  # cap alpha to [0..1]
+        self.elements[self.__parse_name(name)] = Superquadrics(
+            scalings, exponents, translations, rotations, colors, resolution, alpha, tapering, bending, visible)
+
     def add_arrow(self,
                   name: str,
                   start: np.array,
@@ -423,6 +797,39 @@ blender_tools.main()")
 
         self.elements[self.__parse_name(name)] = Arrow(start, end, color, alpha, stroke_width, head_width, visible)
 
+    def add_arrows(self,
+                   name: str,
+                   starts: np.array,
+                   ends: np.array,
+                   colors: np.array = None,
+                   alpha: float = 1.0,
+                   stroke_width: float = 0.01,
+                   head_width: float = 0.03,
+                   visible: bool = True):
+        """Add many arrows as a single element, e.g. a flow or motion field.
+
+        The arrows are stored in one binary file and drawn with instancing,
+        which scales to thousands of arrows unlike repeated add_arrow().
+
+        Args:
+            name: Element name.
+            starts: Nx3 arrow start positions.
+            ends: Nx3 arrow end positions.
+            colors: Optional Nx3 RGB colors in 0-255, or one color (3,) for all arrows.
+            alpha: Transparency in [0, 1].
+            stroke_width: Width of arrow shafts.
+            head_width: Width of arrow heads.
+            visible: Whether the arrows are visible.
+        """
+        starts = np.asarray(starts, dtype=np.float32).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=np.float32).reshape(-1, 3)
+        assert starts.shape == ends.shape
+        if colors is None:
+            colors = np.array([255, 0, 0])
+        colors = np.ascontiguousarray(np.broadcast_to(np.asarray(colors, dtype=np.uint8), starts.shape))
+        alpha = min(max(alpha, 0.0), 1.0)  # cap alpha to [0..1]
+        self.elements[self.__parse_name(name)] = Arrows(starts, ends, colors, alpha, stroke_width, head_width, visible)
+
     def add_motion(self,
                    name: str,
                    motion_type: str,
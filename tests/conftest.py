@@ -0,0 +1,32 @@
+"""Fixtures running pyviz3d/src/blender_tools.py with the fake bpy of tests/fake_blender."""
+import importlib.util
+import os
+import stat
+import sys
+
+import pytest
+
+FAKE_BLENDER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_blender')
+BLENDER_TOOLS_PATH = os.path.join(os.path.dirname(FAKE_BLENDER_DIR), '..', 'pyviz3d', 'src', 'blender_tools.py')
+
+
+@pytest.fixture
+def blender_tools(monkeypatch):
+    """blender_tools imported in this process on a fresh default scene, see fake_blender/bpy.py."""
+    monkeypatch.syspath_prepend(FAKE_BLENDER_DIR)
+    monkeypatch.setattr(sys, 'argv', ['blender', '--background'])
+    import bpy
+    bpy.reset()
+    spec = importlib.util.spec_from_file_location('blender_tools', BLENDER_TOOLS_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def fake_blender_path(tmp_path):
+    """Executable that behaves like Blender for blender_tools, see fake_blender/blender.py."""
+    path = tmp_path / 'blender'
+    path.write_text('#!/bin/sh\nexec "%s" "%s" "$@"\n' % (sys.executable, os.path.join(FAKE_BLENDER_DIR, 'blender.py')))
+    path.chmod(path.stat().st_mode | stat.S_IXUSR)
+    return str(path)
@@ -0,0 +1,19 @@
+"""Fake Blender executable: runs the --python script with the fake bpy module.
+
+Usage: python blender.py [--background] --python script.py [-- args]
+"""
+import os
+import runpy
+import sys
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    script = sys.argv[sys.argv.index('--python') + 1]
+    if os.environ.get('FAKE_BLENDER_EXIT_CODE'):
+        sys.exit(int(os.environ['FAKE_BLENDER_EXIT_CODE']))
+    runpy.run_path(script, run_name='__main__')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""Minimal stand-in for Blender's bpy module, enough to run blender_tools outside of Blender.
+
+Objects, materials and Geometry Nodes trees are recorded so tests can inspect
+the scene that blender_tools built. Every operator call is appended to
+ops.calls. render.render() prints Blender's "Fra:N" progress lines and writes
+empty image files, so the rendering pipeline can be tested end to end.
+FAKE_BLENDER_FRAME_SECONDS in the environment slows every frame down.
+"""
+import os
+import time
+from unittest import mock
+
+DEFAULT_NODE_NAMES = {
+    'ShaderNodeBsdfPrincipled': 'Principled BSDF',
+    'ShaderNodeVertexColor': 'Color Attribute',
+    'ShaderNodeAttribute': 'Attribute',
+}
+CONSTRAINT_NAMES = {'FOLLOW_PATH': 'Follow Path', 'TRACK_TO': 'Track To'}
+
+
+class Socket:
+    def __init__(self, node, name, is_output):
+        self.node = node
+        self.name = name
+        self.is_output = is_output
+        self.default_value = None
+
+
+class Sockets(dict):
+    def __init__(self, node, is_output):
+        super().__init__()
+        self.node = node
+        self.is_output = is_output
+
+    def __missing__(self, name):
+        self[name] = Socket(self.node, name, self.is_output)
+        return self[name]
+
+
+class Node:
+    def __init__(self, node_type):
+        self.type = node_type
+        self.name = DEFAULT_NODE_NAMES.get(node_type, node_type)
+        self.inputs = Sockets(self, False)
+        self.outputs = Sockets(self, True)
+
+
+class Nodes(list):
+    def new(self, type):
+        self.append(Node(type))
+        return self[-1]
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return next(node for node in self if node.name == key)
+        return super().__getitem__(key)
+
+    def of_type(self, node_type):
+        return [node for node in self if node.type == node_type]
+
+
+class Links(list):
+    def new(self, from_socket, to_socket):
+        if to_socket.is_output:  # Blender accepts the sockets in either order
+            from_socket, to_socket = to_socket, from_socket
+        self.append((from_socket, to_socket))
+
+    def between(self, from_node, to_node):
+        return [(a.name, b.name) for a, b in self if a.node is from_node and b.node is to_node]
+
+
+class NodeTree:
+    def __init__(self, name='', type='ShaderNodeTree'):
+        self.name = name
+        self.type = type
+        self.nodes = Nodes()
+        self.links = Links()
+        self.interface = mock.MagicMock()
+
+
+class Material:
+    def __init__(self, name):
+        self.name = name
+        self.node_tree = NodeTree()
+        self.node_tree.nodes.new('ShaderNodeBsdfPrincipled')
+
+
+class Modifier:
+    def __init__(self, name, type):
+        self.name = name
+        self.type = type
+        self.node_group = None
+
+
+class Modifiers(list):
+    def new(self, name, type):
+        self.append(Modifier(name, type))
+        return self[-1]
+
+
+class Constraints(list):
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return next(constraint for constraint in self if constraint.name == key)
+        return super().__getitem__(key)
+
+
+class Mesh:
+    def __init__(self, attributes=(), num_vertices=0, num_faces=0):
+        self.materials = []
+        self.attributes = {name: None for name in attributes}
+        self.num_vertices = num_vertices
+        self.num_faces = num_faces
+
+
+class Object:
+    def __init__(self, name, data=None, type='MESH'):
+        self.name = name
+        self.data = data
+        self.type = type
+        self.modifiers = Modifiers()
+        self.constraints = Constraints()
+        self.selected = False
+        self.hidden = False
+        self.hide_render = False
+        self.smooth = False
+        self.location = [0.0, 0.0, 0.0]
+        self.scale = [1.0, 1.0, 1.0]
+        self.rotation_mode = 'XYZ'
+        self.rotation_quaternion = [1.0, 0.0, 0.0, 0.0]
+        self.matrix_world = None
+
+    def select_set(self, state):
+        self.selected = state
+
+    def hide_set(self, state):
+        self.hidden = state
+
+
+class Objects(dict):
+    """Objects by name, in the order they were added."""
+
+    def new(self, name, data):
+        return Object(name, data, 'EMPTY' if data is None else 'CURVE')
+
+    def unique_name(self, name):
+        if name not in self:
+            return name
+        return next('%s.%03d' % (name, i) for i in range(1, 1000) if '%s.%03d' % (name, i) not in self)
+
+    def link(self, obj):
+        obj.name = self.unique_name(obj.name)
+        self[obj.name] = obj
+
+    def __iter__(self):
+        return iter(list(self.values()))
+
+
+class Scene:
+    def __init__(self):
+        self.objects = Objects()
+        self.collection = mock.MagicMock()
+        self.collection.objects = self.objects
+        self.render = mock.MagicMock()
+        self.render.filepath = ''
+        self.view_settings = mock.MagicMock()
+        self.cycles = mock.MagicMock()
+        self.frame_start = 1
+        self.frame_end = 250
+
+
+class ViewLayerObjects:
+    active = None
+
+
+class Context:
+    def __init__(self):
+        self.scene = Scene()
+        self.collection = self.scene.collection
+        self.view_layer = mock.MagicMock()
+        self.view_layer.objects = ViewLayerObjects()
+
+    @property
+    def object(self):
+        return self.view_layer.objects.active
+
+
+class Data:
+    def __init__(self):
+        self.objects = context.scene.objects
+        self.curves = mock.MagicMock()
+        self.worlds = mock.MagicMock()
+        self.scenes = mock.MagicMock()
+        self.materials = mock.MagicMock()
+        self.materials.new = self.new_material
+        self.node_groups = mock.MagicMock()
+        self.node_groups.new = self.new_node_group
+        self.created_materials = []
+        self.created_node_groups = []
+        self.num_purges = 0
+
+    def new_material(self, name):
+        self.created_materials.append(Material(name))
+        return self.created_materials[-1]
+
+    def new_node_group(self, name, type):
+        self.created_node_groups.append(NodeTree(name, type))
+        return self.created_node_groups[-1]
+
+    def orphans_purge(self, do_recursive=False):
+        self.num_purges += 1
+
+
+def read_ply_header(path):
+    """Names of the vertex properties and the vertex and face counts of a PLY file."""
+    attributes, counts, element = [], {}, None
+    with open(path, 'rb') as f:
+        for line in f:
+            words = line.decode('ascii').split()
+            if words[0] == 'end_header':
+                break
+            if words[0] == 'element':
+                element = words[1]
+                counts[element] = int(words[2])
+            elif words[0] == 'property' and element == 'vertex':
+                attributes.append(words[-1])
+    return attributes, counts.get('vertex', 0), counts.get('face', 0)
+
+
+class Operators:
+    """The bpy.ops.<module>.<operator>(...) calls used by blender_tools."""
+
+    def __init__(self):
+        self.calls = []
+        for module in ('object', 'constraint', 'wm', 'render'):
+            setattr(self, module, OperatorModule(self, module))
+
+
+class OperatorModule:
+    def __init__(self, ops, module):
+        self.ops = ops
+        self.module = module
+
+    def __getattr__(self, operator):
+        def call(*args, **kwargs):
+            self.ops.calls.append(('%s.%s' % (self.module, operator), kwargs))
+            handler = getattr(self, '_' + operator, None)
+            if handler is not None:
+                return handler(**kwargs)
+            return {'FINISHED'}
+        return call
+
+    def _import(self, filepath):
+        if not os.path.exists(filepath):
+            raise RuntimeError("Cannot read file '%s'" % filepath)
+        attributes, num_vertices, num_faces = read_ply_header(filepath) if filepath.endswith('.ply') else ([], 0, 0)
+        obj = Object(os.path.splitext(os.path.basename(filepath))[0], Mesh(attributes, num_vertices, num_faces))
+        context.collection.objects.link(obj)
+        context.view_layer.objects.active = obj
+        return {'FINISHED'}
+
+    def _ply_import(self, filepath, **kwargs):
+        return self._import(filepath)
+
+    def _obj_import(self, filepath, **kwargs):
+        return self._import(filepath)
+
+    def _delete(self, **kwargs):
+        for obj in context.scene.objects:
+            if obj.selected:
+                del context.scene.objects[obj.name]
+
+    def _shade_smooth(self, **kwargs):
+        context.object.smooth = True
+
+    def _constraint_add(self, type):
+        constraint = mock.MagicMock()
+        constraint.name = CONSTRAINT_NAMES.get(type, type)
+        context.object.constraints.append(constraint)
+
+    def _save_as_mainfile(self, filepath):
+        open(filepath, 'w').close()
+
+    def _render(self, animation=False, **kwargs):
+        scene = context.scene
+        if not animation:
+            open(scene.render.filepath + '.png', 'w').close()
+            return
+        for frame in range(scene.frame_start, scene.frame_end + 1):
+            print('Fra:%d Mem:1.00M | Rendering' % frame, flush=True)
+            time.sleep(float(os.environ.get('FAKE_BLENDER_FRAME_SECONDS', 0)))
+            open('%s%04d.png' % (scene.render.filepath, frame), 'w').close()
+
+
+def reset():
+    """Start over from the default scene with a camera, a light and a cube."""
+    global context, data, ops
+    context = Context()
+    data = Data()
+    ops = Operators()
+    camera = Object('Camera', mock.MagicMock(), 'CAMERA')
+    for obj in (camera, Object('Light', mock.MagicMock(), 'LIGHT'), Object('Cube', Mesh())):
+        context.scene.objects.link(obj)
+
+
+reset()
@@ -0,0 +1,34 @@
+"""Minimal stand-in for Blender's mathutils module."""
+import numpy as np
+
+
+class Vector:
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        self.values = np.array(values, dtype=np.float64)
+
+    x = property(lambda self: self.values[0])
+    y = property(lambda self: self.values[1])
+    z = property(lambda self: self.values[2])
+
+    def __add__(self, other):
+        return Vector(self.values + other.values)
+
+    def __sub__(self, other):
+        return Vector(self.values - other.values)
+
+    def __iter__(self):
+        return iter(self.values.tolist())
+
+    def cross(self, other):
+        return Vector(np.cross(self.values, other.values))
+
+    def normalized(self):
+        return Vector(self.values / np.linalg.norm(self.values))
+
+
+class Matrix:
+    def __init__(self, rows=None):
+        self.values = np.eye(4) if rows is None else np.array(rows, dtype=np.float64)
+
+    def __matmul__(self, other):
+        return Vector((self.values @ np.append(other.values, 1.0))[:3])
@@ -0,0 +1,28 @@
+"""Arrows exported to Blender look the same from add_arrow() and add_arrows()."""
+import numpy as np
+from pyviz3d import ply
+from pyviz3d.arrow import Arrow
+from pyviz3d.arrows import Arrows
+
+
+def test_arrow_and_arrows_write_the_same_blender_mesh(tmp_path):
+    start = np.array([0.5, -1.0, 2.0], dtype=np.float32)
+    end = np.array([1.5, 0.0, 0.5], dtype=np.float32)
+    color = np.array([10, 200, 30], dtype=np.uint8)
+    Arrow(start, end, color, 1.0, 0.02, 0.06, True).write_blender(str(tmp_path / 'arrow.ply'))
+    Arrows(np.stack([start, start]), np.stack([end, start]), np.stack([color, color]),
+           1.0, 0.02, 0.06, True).write_blender(str(tmp_path / 'arrows.ply'))
+
+    arrow = ply.read_ply(str(tmp_path / 'arrow.ply'))
+    arrows = ply.read_ply(str(tmp_path / 'arrows.ply'))  # The zero-length second arrow is skipped
+    for field in ('x', 'y', 'z', 'red', 'green', 'blue'):
+        np.testing.assert_allclose(arrows['vertex'][field], arrow['vertex'][field], atol=1e-6)
+    np.testing.assert_array_equal(arrows['face']['vertex_indices'], arrow['face']['vertex_indices'])
+
+    # The widths are radii, as in the viewer
+    positions = np.stack([arrow['vertex'][axis] for axis in 'xyz'], axis=1)
+    direction = (end - start) / np.linalg.norm(end - start)
+    offsets = positions - start
+    radial = np.linalg.norm(offsets - np.outer(offsets @ direction, direction), axis=1)
+    assert np.isclose(radial.max(), 0.06, atol=1e-6)
+    assert np.isclose((offsets @ direction).max(), np.linalg.norm(end - start), atol=1e-6)
@@ -0,0 +1,40 @@
+"""Meshes reach Blender from their copied file or, without a filename, from the PLY written during save()."""
+import os
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'data')
+
+
+def build_in_fake_blender(v, blender_tools, monkeypatch, directory, blender_path):
+    v.save(str(directory), blender_config=viz.BlenderConfig(blender_path=blender_path, render=False), verbose=False)
+    monkeypatch.chdir(directory)
+    blender_tools.main([])
+    return [(call, kwargs['filepath']) for call, kwargs in blender_tools.bpy.ops.calls if call.endswith('_import')]
+
+
+def test_triangle_mesh(tmp_path, blender_tools, monkeypatch, fake_blender_path):
+    v = viz.Visualizer()
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float32)
+    faces = np.array([[0, 1, 2], [0, 1, 3], [0, 2, 3], [1, 2, 3]])
+    v.add_triangle_mesh('Tetrahedron', vertices, faces, translation=[1.0, 2.0, 3.0])
+    imports = build_in_fake_blender(v, blender_tools, monkeypatch, tmp_path / 'scene', fake_blender_path)
+
+    assert imports == [('wm.ply_import', 'Tetrahedron.ply')]
+    obj = blender_tools.bpy.context.scene.objects['Tetrahedron']
+    assert obj.data.num_faces == 4
+    assert list(obj.location) == [1.0, 2.0, 3.0]
+
+
+def test_mesh_files(tmp_path, blender_tools, monkeypatch, fake_blender_path):
+    pytest.importorskip('trimesh')
+    v = viz.Visualizer()
+    v.add_mesh('Converted', os.path.join(DATA_DIR, 'plane.obj'), convert=True)
+    v.add_mesh('Obj', os.path.join(DATA_DIR, 'plane.obj'))
+    v.add_mesh('Ply', os.path.join(DATA_DIR, 'office_chairs.ply'))
+    imports = build_in_fake_blender(v, blender_tools, monkeypatch, tmp_path / 'scene', fake_blender_path)
+
+    obj_copy, ply_copy = v.elements['Obj'].filename_destination, v.elements['Ply'].filename_destination
+    assert imports == [('wm.ply_import', 'Converted.ply'), ('wm.obj_import', obj_copy), ('wm.ply_import', ply_copy)]
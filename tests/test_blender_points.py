@@ -0,0 +1,70 @@
+"""Point clouds are exported as vertex-only PLYs and instanced with Geometry Nodes in Blender."""
+import numpy as np
+import pyviz3d as viz
+from pyviz3d import ply
+
+NUM_POINTS = 1000
+
+
+def export_points(directory, blender_path):
+    v = viz.Visualizer()
+    rng = np.random.default_rng(0)
+    positions = rng.random((NUM_POINTS, 3))
+    colors = rng.integers(0, 256, (NUM_POINTS, 3)).astype(np.uint8)
+    v.add_points('Scan', positions, colors, point_size=30, resolution=4)
+    v.save(str(directory), blender_config=viz.BlenderConfig(blender_path=blender_path, render=False), verbose=False)
+    return positions, colors
+
+
+def test_points_ply_has_only_vertices(tmp_path, fake_blender_path):
+    positions, colors = export_points(tmp_path / 'scene', fake_blender_path)
+    data = ply.read_ply(str(tmp_path / 'scene' / 'Scan.ply'))
+    assert list(data) == ['vertex']
+    vertices = data['vertex']
+    assert vertices.dtype.names == ('x', 'y', 'z', 'red', 'green', 'blue', 'radius')
+    np.testing.assert_allclose(np.stack([vertices[axis] for axis in 'xyz'], axis=1), positions, rtol=1e-6)
+    np.testing.assert_array_equal(np.stack([vertices[c] for c in ('red', 'green', 'blue')], axis=1), colors)
+    np.testing.assert_allclose(vertices['radius'], 0.03)
+    assert (tmp_path / 'scene' / 'blender_scene.blend').exists()  # The fake Blender ran the exported script
+
+
+def test_points_are_instanced_on_one_sphere(tmp_path, fake_blender_path, blender_tools, monkeypatch):
+    export_points(tmp_path / 'scene', fake_blender_path)
+    monkeypatch.chdir(tmp_path / 'scene')
+    blender_tools.main([])
+    bpy = blender_tools.bpy
+
+    assert [call for call, _ in bpy.ops.calls].count('wm.ply_import') == 1
+    obj = bpy.context.scene.objects['Scan']
+    assert obj.data.num_vertices == NUM_POINTS and obj.data.num_faces == 0
+    assert 'Cube' not in bpy.context.scene.objects  # Removed by clear_scene()
+
+    [modifier] = obj.modifiers
+    assert modifier.type == 'NODES'
+    tree = modifier.node_group
+    nodes = tree.nodes
+    [sphere] = nodes.of_type('GeometryNodeMeshUVSphere')
+    [shade_smooth] = nodes.of_type('GeometryNodeSetShadeSmooth')
+    [set_material] = nodes.of_type('GeometryNodeSetMaterial')
+    [instance] = nodes.of_type('GeometryNodeInstanceOnPoints')
+    [radius] = nodes.of_type('GeometryNodeInputNamedAttribute')
+    [group_input] = nodes.of_type('NodeGroupInput')
+    [group_output] = nodes.of_type('NodeGroupOutput')
+    assert sphere.inputs['Segments'].default_value == 8
+    assert sphere.inputs['Rings'].default_value == 4
+    assert sphere.inputs['Radius'].default_value == 1.0  # Scaled by the radius attribute
+    assert radius.inputs['Name'].default_value == 'radius'
+    assert tree.links.between(sphere, shade_smooth) == [('Mesh', 'Geometry')]
+    assert tree.links.between(shade_smooth, set_material) == [('Geometry', 'Geometry')]
+    assert tree.links.between(group_input, instance) == [('Geometry', 'Points')]
+    assert tree.links.between(set_material, instance) == [('Geometry', 'Instance')]
+    assert tree.links.between(radius, instance) == [('Attribute', 'Scale')]
+    assert tree.links.between(instance, group_output) == [('Instances', 'Geometry')]
+
+    # The spheres take their color from the point they are instanced on
+    material = set_material.inputs['Material'].default_value
+    assert obj.data.materials == [material]
+    [attribute] = material.node_tree.nodes.of_type('ShaderNodeAttribute')
+    assert attribute.attribute_type == 'INSTANCER' and attribute.attribute_name == 'Col'
+    bsdf = material.node_tree.nodes['Principled BSDF']
+    assert material.node_tree.links.between(attribute, bsdf) == [('Color', 'Base Color')]
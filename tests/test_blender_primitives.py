@@ -0,0 +1,54 @@
+"""Polylines, boxes and arrows reach Blender as one prebuilt mesh per element."""
+import time
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+
+MAX_MAIN_SECONDS = 2.0  # blender_tools.main() with the fake bpy, far from the per-primitive bpy.ops cost
+
+
+def build_scene(num_primitives):
+    v = viz.Visualizer()
+    rng = np.random.default_rng(0)
+    positions = rng.random((num_primitives, 3))
+    v.add_polyline('Polyline', positions, alpha=0.4)
+    v.add_bounding_boxes('Boxes', positions, rng.random((num_primitives, 3)) * 0.1 + 0.01, alpha=0.7)
+    v.add_arrows('Arrows', positions, positions + 0.1, alpha=0.5)
+    for i in range(3):
+        v.add_bounding_box('Box;%d' % i, positions[i], np.ones(3) * 0.1)
+        v.add_arrow('Arrow;%d' % i, positions[i], positions[i] + 1.0)
+    return v
+
+
+def render_in_fake_blender(blender_tools, monkeypatch, directory, blender_path, num_primitives):
+    build_scene(num_primitives).save(
+        str(directory), blender_config=viz.BlenderConfig(blender_path=blender_path, render=False), verbose=False)
+    monkeypatch.chdir(directory)
+    start = time.perf_counter()
+    blender_tools.main([])
+    return time.perf_counter() - start
+
+
+@pytest.mark.parametrize('num_primitives', [10, 2000])
+def test_operator_calls_do_not_grow_with_primitives(tmp_path, blender_tools, monkeypatch, fake_blender_path,
+                                                    num_primitives):
+    seconds = render_in_fake_blender(blender_tools, monkeypatch, tmp_path / 'scene', fake_blender_path, num_primitives)
+    bpy = blender_tools.bpy
+    assert seconds < MAX_MAIN_SECONDS
+
+    imports = [kwargs['filepath'] for call, kwargs in bpy.ops.calls if call == 'wm.ply_import']
+    assert sorted(imports) == sorted(['Polyline.ply', 'Boxes.ply', 'Arrows.ply'] +
+                                     ['Box;%d.ply' % i for i in range(3)] + ['Arrow;%d.ply' % i for i in range(3)])
+    assert not any(call.startswith('mesh.') for call, _ in bpy.ops.calls)  # No primitive_*_add per primitive
+    assert bpy.context.scene.objects['Polyline'].data.num_faces > num_primitives
+
+
+def test_alpha_reaches_the_materials(tmp_path, blender_tools, monkeypatch, fake_blender_path):
+    render_in_fake_blender(blender_tools, monkeypatch, tmp_path / 'scene', fake_blender_path, 10)
+    objects = blender_tools.bpy.context.scene.objects
+    for name, alpha in (('Polyline', 0.4), ('Boxes', 0.7), ('Arrows', 0.5), ('Arrow;0', 1.0)):
+        [material] = objects[name].data.materials
+        bsdf = material.node_tree.nodes['Principled BSDF']
+        assert bsdf.inputs['Alpha'].default_value == pytest.approx(alpha)
+        assert bsdf.inputs['Base Color'].default_value is None  # Colored by the vertex colors
@@ -0,0 +1,134 @@
+"""Animations render in parallel frame ranges, one fake Blender process per range."""
+import os
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+import pyviz3d.blender_render as blender_render
+
+
+def animation_config(blender_path, animation_length, workers):
+    return viz.BlenderConfig(blender_path=blender_path, animation=True, animation_length=animation_length,
+                             workers=workers, animation_camera_path=[[3.0, 0.0, 1.0], [0.0, 3.0, 1.0]])
+
+
+def save_scene(directory, blender_config, **kwargs):
+    v = viz.Visualizer()
+    v.add_points('Points', np.random.default_rng(0).random((100, 3)))
+    return v.save(str(directory), blender_config=blender_config, verbose=False, **kwargs)
+
+
+@pytest.fixture
+def stitched(monkeypatch):
+    """Output prefixes passed to stitch_animation(), which would need ffmpeg."""
+    prefixes = []
+    monkeypatch.setattr(blender_render, 'stitch_animation', prefixes.append)
+    return prefixes
+
+
+def test_split_frames():
+    assert blender_render.split_frames(7, 3) == [(1, 3), (4, 5), (6, 7)]
+    assert blender_render.split_frames(2, 4) == [(1, 1), (2, 2)]
+    assert blender_render.split_frames(5, 1, first_frame=3) == [(3, 7)]
+
+
+def test_blender_executable():
+    assert blender_render.blender_executable('/opt/blender/blender') == ['/opt/blender/blender']
+    assert blender_render.blender_executable('"/opt/Blender 4.2/blender" --factory-startup') == \
+        ['/opt/Blender 4.2/blender', '--factory-startup']
+    assert blender_render.blender_executable('~/blender')[0] == os.path.expanduser('~/blender')
+
+
+def test_blender_path_with_home_and_options(tmp_path, fake_blender_path, monkeypatch):
+    monkeypatch.setenv('HOME', os.path.dirname(fake_blender_path))
+    blender_config = viz.BlenderConfig(blender_path='~/blender --factory-startup', render=False)
+    assert blender_render.blender_command(blender_config)[:3] == [fake_blender_path, '--factory-startup', '--background']
+    directory = tmp_path / 'scene'
+    save_scene(directory, blender_config)  # Raises if the fake Blender did not start
+    with open(directory / 'blender_0.log') as f:
+        assert 'Saved blender file to:' in f.read()
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_frame_ranges_render_in_parallel(tmp_path, fake_blender_path, stitched, workers):
+    directory = tmp_path / 'scene'
+    save_scene(directory, animation_config(fake_blender_path, 7, workers))
+
+    frames = sorted(f for f in os.listdir(directory) if f.startswith('out') and f.endswith('.png'))
+    assert frames == ['out%04d.png' % frame for frame in range(1, 8)]
+    assert sorted(f for f in os.listdir(directory) if f.endswith('.log')) == \
+        ['blender_%d.log' % i for i in range(workers)]
+    for i, (frame_start, frame_end) in enumerate(blender_render.split_frames(7, workers)):
+        with open(directory / ('blender_%d.log' % i)) as f:
+            log = f.read()
+        assert ['Fra:%d ' % frame in log for frame in range(1, 8)] == \
+            [frame_start <= frame <= frame_end for frame in range(1, 8)]
+    assert stitched == [str(directory / 'out')]
+
+
+def test_only_the_first_range_saves_the_blend_file(tmp_path, fake_blender_path, stitched):
+    directory = tmp_path / 'scene'
+    save_scene(directory, animation_config(fake_blender_path, 4, 2))
+    assert os.path.exists(directory / 'blender_scene.blend')
+    with open(directory / 'blender_0.log') as f:
+        assert 'Saved blender file to:' in f.read()
+    with open(directory / 'blender_1.log') as f:
+        assert 'Saved blender file to:' not in f.read()
+
+
+def test_progress_reports_every_frame_once(tmp_path, fake_blender_path, stitched):
+    directory = tmp_path / 'scene'
+    save_scene(directory, viz.BlenderConfig(blender_path=fake_blender_path, render=False))
+    progress = []
+    future = viz.Visualizer().show_in_blender_async(
+        str(directory), animation_config(fake_blender_path, 6, 2), verbose=False,
+        progress=lambda frame, num_started, num_frames: progress.append((frame, num_started, num_frames)))
+    commands = future.result(timeout=60)
+
+    assert len(commands) == 2
+    assert sorted(frame for frame, _, _ in progress) == list(range(1, 7))
+    assert sorted(num_started for _, num_started, _ in progress) == list(range(1, 7))
+    assert {num_frames for _, _, num_frames in progress} == {6}
+
+
+def test_failing_process_raises(tmp_path, fake_blender_path, stitched, monkeypatch):
+    monkeypatch.setenv('FAKE_BLENDER_EXIT_CODE', '3')
+    directory = tmp_path / 'scene'
+    with pytest.raises(RuntimeError, match='code 3'):
+        save_scene(directory, animation_config(fake_blender_path, 4, 2))
+    assert stitched == []
+
+
+def test_cancel_stops_a_running_render(tmp_path, fake_blender_path, stitched, monkeypatch):
+    monkeypatch.setenv('FAKE_BLENDER_FRAME_SECONDS', '0.2')
+    directory = tmp_path / 'scene'
+    save_scene(directory, viz.BlenderConfig(blender_path=fake_blender_path, render=False))
+    started = threading.Event()
+    future = viz.Visualizer().show_in_blender_async(
+        str(directory), animation_config(fake_blender_path, 100, 2), verbose=False,
+        progress=lambda frame, num_started, num_frames: started.set())
+    assert started.wait(30)
+
+    assert future.cancel()
+    assert future.cancelled() and future.done() and not future.running()
+    with pytest.raises(CancelledError):
+        future.result()
+    time.sleep(1.0)  # The Blender processes are killed instead of rendering all frames
+    num_rendered = len([f for f in os.listdir(directory) if f.startswith('out') and f.endswith('.png')])
+    time.sleep(0.5)
+    assert num_rendered < 100
+    assert len([f for f in os.listdir(directory) if f.startswith('out') and f.endswith('.png')]) == num_rendered
+    assert stitched == []
+
+
+def test_cancel_after_the_render_finished(tmp_path, fake_blender_path, stitched):
+    directory = tmp_path / 'scene'
+    save_scene(directory, viz.BlenderConfig(blender_path=fake_blender_path, render=False))
+    future = viz.Visualizer().show_in_blender_async(
+        str(directory), animation_config(fake_blender_path, 2, 1), verbose=False)
+    assert len(future.result(timeout=60)) == 1
+    assert not future.cancel()
+    assert not future.cancelled()
@@ -0,0 +1,70 @@
+"""Every compressed sidecar decodes back to the binary file it was written for."""
+import gzip
+import importlib.util
+import os
+import zlib
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+from pyviz3d import compression
+from pyviz3d.compression import COMPRESSION_SUFFIXES, SHUFFLE_STRIDE
+
+DECOMPRESS = {
+    'zlib': zlib.decompress,
+    'gzip': gzip.decompress,
+    'brotli': lambda data: importlib.import_module('brotli').decompress(data),
+}
+
+
+def unshuffle(data, raw_size):
+    return np.frombuffer(data, dtype=np.uint8).reshape(SHUFFLE_STRIDE, -1).T.tobytes()[:raw_size]
+
+
+def build_scene():
+    rng = np.random.default_rng(0)
+    v = viz.Visualizer()
+    v.add_points('Points', rng.random((1001, 3)), colors=rng.integers(0, 256, (1001, 3)),
+                 normals=rng.normal(size=(1001, 3)), normal_encoding='oct8')
+    v.add_lines('Lines', rng.random((7, 3)), rng.random((7, 3)), position_encoding='int16')
+    return v
+
+
+@pytest.mark.parametrize('method', list(COMPRESSION_SUFFIXES))
+def test_sidecars_decode_to_the_binary_files(tmp_path, method):
+    if method == 'brotli':
+        pytest.importorskip('brotli')
+    v = build_scene()
+    v.save(str(tmp_path), verbose=False, compression=method)
+    for name in v.elements:
+        with open(tmp_path / (name + '.bin'), 'rb') as f:
+            raw = f.read()
+        with open(tmp_path / (name + '.bin' + COMPRESSION_SUFFIXES[method]), 'rb') as f:
+            decoded = DECOMPRESS[method](f.read())
+        if method == 'brotli':
+            assert decoded == raw  # Served as is by the web server
+        else:
+            assert unshuffle(decoded, len(raw)) == raw
+
+
+@pytest.mark.parametrize('method', ['zlib', 'gzip'])
+def test_shuffle_pads_the_last_word(tmp_path, method):
+    path = tmp_path / 'odd.bin'
+    path.write_bytes(bytes(range(7)))
+    sidecar_path, raw_size, compressed_size, _ = compression.compress_file(str(path), method)
+    with open(sidecar_path, 'rb') as f:
+        assert unshuffle(DECOMPRESS[method](f.read()), raw_size) == bytes(range(7))
+    assert compressed_size == os.path.getsize(sidecar_path)
+
+
+def test_missing_brotli_fails_before_writing(tmp_path, monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None if name == 'brotli' else find_spec(name))
+    with pytest.raises(ImportError, match='pip install'):
+        build_scene().save(str(tmp_path / 'scene'), verbose=False, compression='brotli')
+    assert not os.path.exists(tmp_path / 'scene')
+
+
+def test_unknown_compression():
+    with pytest.raises(ValueError, match='lzma'):
+        compression.check_compression('lzma')
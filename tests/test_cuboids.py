@@ -0,0 +1,51 @@
+"""Bounding boxes added with add_bounding_boxes() are stored as one instance table, see get_cuboids() in scene.js."""
+import json
+
+import numpy as np
+import pyviz3d as viz
+
+
+def read_instances(directory, name):
+    """Decode the .bin at the offsets scene.js uses: positions, sizes, rotations, then colors."""
+    with open(directory / 'nodes.json') as f:
+        properties = json.load(f)[name]
+    with open(directory / properties['binary_filename'], 'rb') as f:
+        data = f.read()
+    offset = properties.get('binary_offset', 0)
+    n = properties['num_cuboids']
+    positions = np.frombuffer(data, np.float32, 3 * n, offset).reshape(-1, 3)
+    sizes = np.frombuffer(data, np.float32, 3 * n, offset + 12 * n).reshape(-1, 3)
+    rotations = np.frombuffer(data, np.float32, 4 * n, offset + 24 * n).reshape(-1, 4)
+    colors = np.frombuffer(data, np.uint8, 3 * n, offset + 40 * n).reshape(-1, 3)
+    return properties, positions, sizes, rotations, colors, len(data) - offset
+
+
+def test_instance_table(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 101
+    positions, sizes = rng.random((n, 3)), rng.random((n, 3)) + 0.1
+    rotations = rng.normal(size=(n, 4))
+    colors = rng.integers(0, 256, (n, 3))
+    v = viz.Visualizer()
+    v.add_bounding_boxes('Boxes', positions, sizes, rotations, colors, alpha=0.5, edge_width=0.02)
+    v.save(str(tmp_path), verbose=False)
+    properties, saved_positions, saved_sizes, saved_rotations, saved_colors, num_bytes = read_instances(
+        tmp_path, 'Boxes')
+
+    assert num_bytes == 43 * n  # Stride of 12 + 12 + 16 + 3 bytes per box
+    assert properties['num_cuboids'] == n
+    assert properties['alpha'] == 0.5 and properties['edge_width'] == 0.02
+    np.testing.assert_allclose(saved_positions, positions, rtol=1e-6)
+    np.testing.assert_allclose(saved_sizes, sizes, rtol=1e-6)
+    np.testing.assert_allclose(saved_rotations, rotations / np.linalg.norm(rotations, axis=1, keepdims=True),
+                               rtol=1e-5, atol=1e-7)
+    np.testing.assert_array_equal(saved_colors, colors)
+
+
+def test_defaults_and_single_color(tmp_path):
+    v = viz.Visualizer()
+    v.add_bounding_boxes('Boxes', np.zeros((3, 3)), np.ones((3, 3)), colors=[10, 20, 30])
+    v.save(str(tmp_path), verbose=False, packed=True)  # Also read at the offset in a container
+    _, _, _, rotations, colors, _ = read_instances(tmp_path, 'Boxes')
+    np.testing.assert_array_equal(rotations, np.tile([0.0, 0.0, 0.0, 1.0], (3, 1)))
+    np.testing.assert_array_equal(colors, np.tile([10, 20, 30], (3, 1)))
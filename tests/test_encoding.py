@@ -0,0 +1,55 @@
+"""Reconstruction error of the quantized position and normal encodings."""
+import numpy as np
+import pytest
+from pyviz3d import encoding
+
+
+def decode_normals(encoded):
+    xy = encoded.astype(np.float64) / np.iinfo(encoded.dtype).max
+    z = 1.0 - np.abs(xy).sum(axis=1)
+    lower = z < 0
+    signs = np.where(xy[lower] >= 0, 1.0, -1.0)
+    xy[lower] = (1.0 - np.abs(xy[lower][:, ::-1])) * signs
+    normals = np.concatenate([xy, z[:, None]], axis=1)
+    return normals / np.linalg.norm(normals, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize('position_encoding', list(encoding.POSITION_ENCODINGS))
+def test_position_error_is_at_most_half_a_step(position_encoding):
+    rng = np.random.default_rng(0)
+    positions = rng.random((100000, 3)) * [10.0, 4.0, 3.0] - [5.0, 0.0, 100.0]
+    scale, offset = encoding.position_quantization(positions, position_encoding)
+    quantized = encoding.encode_positions(positions, position_encoding, scale, offset)
+    assert quantized.dtype == encoding.POSITION_ENCODINGS[position_encoding]
+    decoded = quantized * scale + offset
+    if position_encoding == 'float32':
+        max_error = np.spacing(np.abs(positions).astype(np.float32))
+    else:
+        max_error = scale / 2 + np.spacing(np.abs(positions))
+    assert np.all(np.abs(decoded - positions) <= max_error)
+
+
+def test_int32_positions_are_rejected():
+    # The viewer would upload them as integer attributes, which the float position input cannot read
+    with pytest.raises(ValueError, match='int32'):
+        encoding.position_quantization(np.zeros((1, 3)), 'int32')
+
+
+def test_position_error_with_flat_bounding_box():
+    positions = np.array([[0.0, 1.0, 2.0], [1.0, 1.0, 2.0]])
+    scale, offset = encoding.position_quantization(positions, 'int16')
+    decoded = encoding.encode_positions(positions, 'int16', scale, offset) * scale + offset
+    np.testing.assert_allclose(decoded, positions, atol=0.5 / 32767)
+
+
+@pytest.mark.parametrize('normal_encoding, max_degrees', [('oct16', 0.01), ('oct8', 1.0)])
+def test_normal_angular_error_is_bounded(normal_encoding, max_degrees):
+    rng = np.random.default_rng(0)
+    normals = rng.normal(size=(100000, 3))
+    normals = np.concatenate([normals, np.eye(3), -np.eye(3)])
+    encoded = encoding.encode_normals(normals, normal_encoding)
+    assert encoded.shape == (normals.shape[0], 2)
+    decoded = decode_normals(encoded)
+    unit_normals = normals / np.linalg.norm(normals, axis=1, keepdims=True)
+    cosines = np.clip((decoded * unit_normals).sum(axis=1), -1.0, 1.0)
+    assert np.degrees(np.arccos(cosines)).max() < max_degrees
@@ -0,0 +1,115 @@
+"""Incremental saves rewrite only the elements and viewer assets that changed."""
+import json
+import os
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+from pyviz3d import manifest
+
+OLD_MTIME_NS = 10**18  # Sep 2001, older than any file a save writes
+
+
+def build_scene(num_points=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    v = viz.Visualizer()
+    v.add_points('Points', rng.random((num_points, 3)), colors=rng.integers(0, 256, (num_points, 3)))
+    v.add_lines('Lines', rng.random((10, 3)), rng.random((10, 3)))
+    return v
+
+
+def age(*paths):
+    for path in paths:
+        os.utime(path, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+def mtime(path):
+    return os.stat(path).st_mtime_ns
+
+
+def test_unchanged_element_is_not_rewritten(tmp_path):
+    v = build_scene()
+    v.save(str(tmp_path), verbose=False, incremental=True)
+    age(tmp_path / 'Points.bin', tmp_path / 'Lines.bin')
+
+    v.elements['Lines'] = build_scene(seed=1).elements['Lines']
+    v.save(str(tmp_path), verbose=False, incremental=True)
+    assert mtime(tmp_path / 'Points.bin') == OLD_MTIME_NS
+    assert mtime(tmp_path / 'Lines.bin') != OLD_MTIME_NS
+
+
+def test_changed_element_is_rewritten(tmp_path):
+    v = build_scene()
+    v.save(str(tmp_path), verbose=False, incremental=True)
+    age(tmp_path / 'Points.bin')
+
+    v.elements['Points'].colors[500] += 1  # An edit in the middle of a large array
+    v.save(str(tmp_path), verbose=False, incremental=True)
+    assert mtime(tmp_path / 'Points.bin') != OLD_MTIME_NS
+    saved_colors = np.fromfile(tmp_path / 'Points.bin', dtype=np.uint8)[-3000:].reshape(-1, 3)
+    np.testing.assert_array_equal(saved_colors, v.elements['Points'].colors)
+
+
+def test_removed_element_files_are_deleted(tmp_path):
+    v = build_scene()
+    v.save(str(tmp_path), verbose=False, incremental=True)
+    del v.elements['Lines']
+    v.save(str(tmp_path), verbose=False, incremental=True)
+
+    assert not os.path.exists(tmp_path / 'Lines.bin')
+    with open(tmp_path / 'nodes.json') as f:
+        assert 'Lines' not in json.load(f)
+    with open(tmp_path / manifest.MANIFEST_FILENAME) as f:
+        assert 'Lines' not in json.load(f)['elements']
+
+
+def test_changed_viewer_assets_are_copied_again(tmp_path):
+    v = build_scene()
+    v.save(str(tmp_path), verbose=False, incremental=True)
+    index_path = tmp_path / 'index.html'
+    age(index_path)
+    v.save(str(tmp_path), verbose=False, incremental=True)
+    assert mtime(index_path) == OLD_MTIME_NS
+    assert not os.path.exists(tmp_path / '__pycache__')  # Bytecode of blender_tools.py is not copied
+
+    # As after an update of pyviz3d
+    manifest_path = tmp_path / manifest.MANIFEST_FILENAME
+    with open(manifest_path) as f:
+        saved_manifest = json.load(f)
+    saved_manifest['assets'] = 'outdated'
+    with open(manifest_path, 'w') as f:
+        json.dump(saved_manifest, f)
+    index_path.write_text('outdated')
+    v.save(str(tmp_path), verbose=False, incremental=True)
+    with open(os.path.join(os.path.dirname(viz.__file__), 'src', 'index.html')) as f:
+        assert index_path.read_text() == f.read()
+
+
+def test_bytecode_caches_are_ignored(tmp_path):
+    (tmp_path / 'js').mkdir()
+    (tmp_path / 'js' / 'scene.js').write_text('// viewer')
+    assets_hash = manifest.hash_directory(str(tmp_path))
+    (tmp_path / '__pycache__').mkdir()
+    (tmp_path / '__pycache__' / 'blender_tools.cpython-311.pyc').write_bytes(b'\0')
+    (tmp_path / 'stale.pyc').write_bytes(b'\0')
+    assert manifest.hash_directory(str(tmp_path)) == assets_hash
+    assert sorted(manifest.ignore_bytecode(str(tmp_path), os.listdir(tmp_path))) == ['__pycache__', 'stale.pyc']
+
+
+def test_nested_arrays_are_hashed_by_content():
+    positions = [np.zeros(10000), np.zeros(10000)]
+    changed = [np.zeros(10000), np.zeros(10000)]
+    changed[1][5000] = 1.0
+    properties = {'type': 'labels'}
+    v = viz.Visualizer()
+    v.add_labels('A', ['a', 'b'], np.zeros((2, 3)), np.zeros((2, 3)))
+    element = v.elements['A']
+    element.positions = positions
+    before = manifest.hash_element(element, properties)
+    element.positions = changed
+    assert manifest.hash_element(element, properties) != before
+
+
+def test_packed_and_incremental_are_exclusive(tmp_path):
+    with pytest.raises(ValueError, match='incremental'):
+        build_scene().save(str(tmp_path), verbose=False, incremental=True, packed=True)
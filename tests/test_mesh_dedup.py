@@ -0,0 +1,48 @@
+"""Mesh files are copied once per content hash and incremental saves track the copies."""
+import os
+import shutil
+
+import numpy as np
+import pyviz3d as viz
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'examples', 'data')
+
+
+def mesh_copies(directory):
+    return sorted(f for f in os.listdir(directory) if f.startswith('mesh_'))
+
+
+def test_instances_share_one_copy(tmp_path):
+    # A renamed copy of the same file still dedupes by content
+    shutil.copyfile(os.path.join(DATA_DIR, 'plane.obj'), tmp_path / 'other_name.obj')
+    v = viz.Visualizer()
+    for i in range(3):
+        v.add_mesh('Plane;%d' % i, os.path.join(DATA_DIR, 'plane.obj'), translation=np.array([i, 0.0, 0.0]))
+    v.add_mesh('Renamed', str(tmp_path / 'other_name.obj'))
+    v.save(str(tmp_path / 'scene'), verbose=False)
+    assert mesh_copies(tmp_path / 'scene') == [v.elements['Renamed'].filename_destination]
+
+
+def test_incremental_save_deletes_stale_copies(tmp_path):
+    directory = tmp_path / 'scene'
+    v = viz.Visualizer()
+    v.add_mesh('Plane;0', os.path.join(DATA_DIR, 'plane.obj'))
+    v.add_mesh('Plane;1', os.path.join(DATA_DIR, 'plane.obj'))
+    v.add_mesh('Chairs', os.path.join(DATA_DIR, 'office_chairs.ply'))
+    v.save(str(directory), verbose=False, incremental=True)
+    plane_copy, chairs_copy = v.elements['Plane;0'].filename_destination, v.elements['Chairs'].filename_destination
+    assert mesh_copies(directory) == sorted([plane_copy, chairs_copy])
+
+    # The copy stays while another element still uses it
+    del v.elements['Plane;0']
+    v.save(str(directory), verbose=False, incremental=True)
+    assert mesh_copies(directory) == sorted([plane_copy, chairs_copy])
+
+    del v.elements['Plane;1']
+    v.save(str(directory), verbose=False, incremental=True)
+    assert mesh_copies(directory) == [chairs_copy]
+
+    # A deleted copy is written again instead of skipping the unchanged element
+    os.remove(directory / chairs_copy)
+    v.save(str(directory), verbose=False, incremental=True)
+    assert mesh_copies(directory) == [chairs_copy]
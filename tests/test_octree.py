@@ -0,0 +1,96 @@
+"""Level-of-detail point clouds: the .bin holds one padded block per octree node at the offsets in lod_nodes."""
+import json
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+from pyviz3d import encoding, octree
+
+NUM_POINTS = 5001
+NODE_SIZE = 64
+MAX_DEPTH = 12  # Default of build_octree(), the finest level holds all remaining points
+
+
+def read_block(data, num_points, properties):
+    """Decode one node block the way scene.js does, returns positions, normals and colors."""
+    offset = 0
+
+    def take(dtype, count):
+        nonlocal offset
+        array = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+        num_bytes = array.nbytes
+        assert not any(data[offset + num_bytes:offset + num_bytes + (-num_bytes % 4)])  # Zero padding
+        offset += num_bytes + (-num_bytes % 4)
+        return array
+
+    position_dtype = encoding.POSITION_ENCODINGS[properties['position_encoding']]
+    positions = take(position_dtype, 3 * num_points).reshape(-1, 3).astype(np.float64)
+    if properties['position_encoding'] != 'float32':
+        positions = positions * properties['position_scale'] + properties['position_offset']
+    normals = None
+    if properties['normal_encoding'] is not None:
+        normal_dtype = encoding.NORMAL_ENCODINGS[properties['normal_encoding']]
+        normals = take(normal_dtype, (3 if properties['normal_encoding'] == 'float32' else 2) * num_points)
+    colors = take(np.uint8, 3 * num_points).reshape(-1, 3)
+    assert offset == len(data)
+    return positions, normals, colors
+
+
+@pytest.mark.parametrize('position_encoding, normal_encoding', [
+    ('float32', None), ('float32', 'float32'), ('int16', 'oct8')])
+def test_node_blocks(tmp_path, position_encoding, normal_encoding):
+    rng = np.random.default_rng(0)
+    positions = rng.normal(size=(NUM_POINTS, 3)).astype(np.float32)
+    # Colors encode the point index, so every point can be identified in the blocks
+    indices = np.arange(NUM_POINTS)
+    colors = np.stack([indices & 255, indices >> 8 & 255, indices >> 16], axis=1).astype(np.uint8)
+    normals = rng.normal(size=(NUM_POINTS, 3)).astype(np.float32) if normal_encoding else None
+    v = viz.Visualizer()
+    v.add_points('Cloud', positions, colors, normals, lod=True, lod_node_size=NODE_SIZE,
+                 position_encoding=position_encoding, normal_encoding=normal_encoding or 'float32')
+    v.save(str(tmp_path), verbose=False)
+    with open(tmp_path / 'nodes.json') as f:
+        properties = json.load(f)['Cloud']
+    with open(tmp_path / 'Cloud.bin', 'rb') as f:
+        data = f.read()
+
+    lod_nodes = np.array(properties['lod_nodes'])
+    byte_offsets, byte_lengths = lod_nodes[:, 5], lod_nodes[:, 6]
+    assert byte_offsets[0] == 0
+    np.testing.assert_array_equal(byte_offsets[1:], byte_offsets[:-1] + byte_lengths[:-1])
+    assert byte_offsets[-1] + byte_lengths[-1] == len(data)
+    assert np.all(byte_lengths % 4 == 0)
+
+    min_x, min_y, min_z, size = properties['lod_cube']
+    seen = []
+    for level, x, y, z, num_points, byte_offset, byte_length in lod_nodes:
+        assert 0 < num_points <= NODE_SIZE or level == MAX_DEPTH
+        block = data[byte_offset:byte_offset + byte_length]
+        block_positions, block_normals, block_colors = read_block(block, num_points, properties)
+        block_indices = block_colors[:, 0] + (block_colors[:, 1].astype(np.int64) << 8) + \
+            (block_colors[:, 2].astype(np.int64) << 16)
+        seen.append(block_indices)
+
+        tolerance = 1e-5 if position_encoding == 'float32' else np.max(properties['position_scale'])
+        np.testing.assert_allclose(block_positions, positions[block_indices], atol=tolerance)
+        if normal_encoding == 'float32':
+            np.testing.assert_array_equal(block_normals.reshape(-1, 3), normals[block_indices])
+        # Points lie in the cell of their node
+        cell_size = size / 2 ** level
+        lower = np.array([min_x, min_y, min_z]) + np.array([x, y, z]) * cell_size
+        assert np.all(positions[block_indices] >= lower - 1e-5)
+        assert np.all(positions[block_indices] <= lower + cell_size + 1e-5)
+
+    # Every point is in exactly one node
+    np.testing.assert_array_equal(np.sort(np.concatenate(seen)), indices)
+    assert sum(lod_nodes[:, 4]) == NUM_POINTS == properties['num_points']
+
+
+def test_nodes_thin_out_evenly():
+    positions = np.random.default_rng(0).random((20000, 3))
+    order, cube, nodes = octree.build_octree(positions, NODE_SIZE)
+    assert sorted(order.tolist()) == list(range(20000))
+    # Coarse levels are full, so the first points of a node and its ancestors are a uniform subsample
+    levels, counts = nodes[:, 0], nodes[:, 5]
+    assert np.all(counts[levels < 2] == NODE_SIZE)
+    np.testing.assert_array_equal(nodes[1:, 4], nodes[:-1, 4] + nodes[:-1, 5])
@@ -0,0 +1,83 @@
+"""Packed containers must hold exactly the bytes of the per-file layout."""
+import gzip
+import json
+import os
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+from pyviz3d.compression import SHUFFLE_STRIDE
+
+
+def build_scene():
+    v = viz.Visualizer()
+    rng = np.random.default_rng(0)
+    for i in range(5):
+        num_points = 100 * i + 7  # Odd sizes so that the elements need padding
+        positions = rng.random((num_points, 3))
+        colors = (rng.random((num_points, 3)) * 255).astype(np.uint8)
+        v.add_points('Points;%d' % i, positions, colors, normals=rng.random((num_points, 3)))
+        v.add_lines('Lines;%d' % i, positions, positions + 0.1, colors, position_encoding='int16')
+    v.add_bounding_boxes('Boxes', rng.random((3, 3)), rng.random((3, 3)) + 0.1)
+    return v
+
+
+def unshuffle(data, raw_size):
+    return np.frombuffer(data, dtype=np.uint8).reshape(SHUFFLE_STRIDE, -1).T.tobytes()[:raw_size]
+
+
+def read_nodes(directory):
+    with open(os.path.join(directory, 'nodes.json')) as f:
+        return json.load(f)
+
+
+def binary_nodes(nodes):
+    return [(name, properties) for name, properties in nodes.items() if 'binary_filename' in properties]
+
+
+def read_file(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('size_limit', [256 * 2**20, 4096])
+def test_packed_slices_match_element_files(tmp_path, size_limit):
+    v = build_scene()
+    v.save(str(tmp_path / 'files'), verbose=False)
+    v.save(str(tmp_path / 'packed'), verbose=False, packed=True, pack_size=size_limit)
+    nodes = read_nodes(tmp_path / 'files')
+    packed_nodes = read_nodes(tmp_path / 'packed')
+
+    containers = set()
+    for name, properties in binary_nodes(nodes):
+        packed_properties = packed_nodes[name]
+        containers.add(packed_properties['binary_filename'])
+        offset = packed_properties['binary_offset']
+        assert offset % 8 == 0
+        container = read_file(tmp_path / 'packed' / packed_properties['binary_filename'])
+        data = container[offset:offset + packed_properties['binary_length']]
+        assert data == read_file(tmp_path / 'files' / properties['binary_filename'])
+        assert not os.path.exists(tmp_path / 'packed' / (name + '.bin'))
+    assert (len(containers) == 1) == (size_limit > 2**20)
+
+
+def test_packed_gzip_sidecars_match_element_files(tmp_path):
+    v = build_scene()
+    v.save(str(tmp_path / 'files'), verbose=False, compression='gzip')
+    v.save(str(tmp_path / 'packed'), verbose=False, packed=True, pack_size=4096, compression='gzip')
+    nodes = read_nodes(tmp_path / 'files')
+    packed_nodes = read_nodes(tmp_path / 'packed')
+
+    for name, properties in binary_nodes(nodes):
+        element_file = read_file(tmp_path / 'files' / properties['binary_filename'])
+        sidecar = read_file(tmp_path / 'files' / properties['binary_compressed_filename'])
+        assert unshuffle(gzip.decompress(sidecar), len(element_file)) == element_file
+
+        packed_properties = packed_nodes[name]
+        assert packed_properties['binary_compression'] == 'gzip'
+        container_path = tmp_path / 'packed' / packed_properties['binary_filename']
+        sidecar_path = tmp_path / 'packed' / packed_properties['binary_compressed_filename']
+        container = unshuffle(gzip.decompress(read_file(sidecar_path)), os.path.getsize(container_path))
+        assert container == read_file(container_path)
+        offset = packed_properties['binary_offset']
+        assert container[offset:offset + packed_properties['binary_length']] == element_file
@@ -0,0 +1,62 @@
+"""Round trips through the NumPy PLY writer and reader."""
+import numpy as np
+import pytest
+from pyviz3d import ply
+
+
+def random_mesh(num_vertices=500, num_faces=900):
+    rng = np.random.default_rng(0)
+    vertices = rng.normal(size=(num_vertices, 3)).astype(np.float32)
+    normals = rng.normal(size=(num_vertices, 3)).astype(np.float32)
+    colors = rng.integers(0, 256, (num_vertices, 3), dtype=np.uint8)
+    triangles = rng.integers(0, num_vertices, (num_faces, 3))
+    return vertices, triangles, normals, colors
+
+
+def columns(array, fields):
+    return np.stack([array[field] for field in fields], axis=1)
+
+
+def test_mesh_round_trip(tmp_path):
+    vertices, triangles, normals, colors = random_mesh()
+    path = str(tmp_path / 'mesh.ply')
+    ply.write_mesh(path, vertices, triangles, normals, colors)
+    data = ply.read_ply(path)
+
+    assert list(data) == ['vertex', 'face']
+    np.testing.assert_array_equal(columns(data['vertex'], ('x', 'y', 'z')), vertices)
+    np.testing.assert_array_equal(columns(data['vertex'], ('nx', 'ny', 'nz')), normals)
+    np.testing.assert_array_equal(columns(data['vertex'], ('red', 'green', 'blue')), colors)
+    assert data['vertex'].dtype['red'] == np.uint8
+    np.testing.assert_array_equal(data['face']['vertex_indices'], triangles)
+
+
+def test_vertex_only_round_trip(tmp_path):
+    vertices, _, _, colors = random_mesh()
+    radii = np.linspace(0.0, 1.0, len(vertices), dtype=np.float32)
+    path = str(tmp_path / 'points.ply')
+    written = ply.vertex_array(vertices, colors=colors, radii=radii)
+    ply.write_ply(path, written)
+    data = ply.read_ply(path)
+
+    assert list(data) == ['vertex']
+    assert data['vertex'].dtype.names == written.dtype.names
+    assert data['vertex'].tobytes() == written.tobytes()
+
+
+def test_empty_mesh_round_trip(tmp_path):
+    path = str(tmp_path / 'empty.ply')
+    ply.write_mesh(path, np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64))
+    data = ply.read_ply(path)
+    assert len(data['vertex']) == 0 and len(data['face']) == 0
+
+
+def test_read_rejects_varying_list_lengths(tmp_path):
+    path = tmp_path / 'quads.ply'
+    header = ('ply\nformat binary_little_endian 1.0\nelement vertex 0\nproperty float x\n'
+              'element face 2\nproperty list uchar int vertex_indices\nend_header\n')
+    triangle = np.uint8(3).tobytes() + np.array([0, 1, 2], '<i4').tobytes()
+    quad = np.uint8(4).tobytes() + np.array([0, 1, 2, 3], '<i4').tobytes()
+    path.write_bytes(header.encode() + triangle + quad)
+    with pytest.raises(ValueError, match='varying lengths'):
+        ply.read_ply(str(path))
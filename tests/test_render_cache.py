@@ -0,0 +1,99 @@
+"""Saves with BlenderConfig.cache_dir reuse the renders of identical scenes instead of running Blender."""
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyviz3d as viz
+from pyviz3d import render_cache
+from pyviz3d.render_cache import RenderCache
+
+BLENDER_TOOLS_PATH = os.path.join(os.path.dirname(viz.__file__), 'src', 'blender_tools.py')
+
+
+def save_scene(directory, blender_config, seed=0):
+    v = viz.Visualizer()
+    v.add_points('Points', np.random.default_rng(seed).random((100, 3)))
+    v.save(str(directory), blender_config=blender_config, verbose=False)
+
+
+def ran_blender(directory):
+    return os.path.exists(directory / 'blender_0.log')
+
+
+def cache_config(blender_path, cache_dir, **kwargs):
+    return viz.BlenderConfig(blender_path=blender_path, cache_dir=str(cache_dir), **kwargs)
+
+
+def test_identical_save_is_a_hit(tmp_path, fake_blender_path):
+    blender_config = cache_config(fake_blender_path, tmp_path / 'cache')
+    save_scene(tmp_path / 'first', blender_config)
+    assert ran_blender(tmp_path / 'first')
+
+    save_scene(tmp_path / 'second', blender_config)
+    assert not ran_blender(tmp_path / 'second')
+    for filename in ('out.png', render_cache.BLEND_FILENAME):
+        with open(tmp_path / 'first' / filename, 'rb') as f, open(tmp_path / 'second' / filename, 'rb') as g:
+            assert f.read() == g.read()
+    assert RenderCache(tmp_path / 'cache', blender_config.cache_max_bytes).stats() == {'hits': 1, 'misses': 1}
+
+
+def test_changed_element_or_config_is_a_miss(tmp_path, fake_blender_path):
+    blender_config = cache_config(fake_blender_path, tmp_path / 'cache')
+    save_scene(tmp_path / 'first', blender_config)
+
+    save_scene(tmp_path / 'points', blender_config, seed=1)
+    assert ran_blender(tmp_path / 'points')
+    save_scene(tmp_path / 'resolution', cache_config(fake_blender_path, tmp_path / 'cache', render_resolution=[64, 48]))
+    assert ran_blender(tmp_path / 'resolution')
+    # Settings that do not change the render still hit
+    save_scene(tmp_path / 'workers', cache_config(fake_blender_path, tmp_path / 'cache', workers=4))
+    assert not ran_blender(tmp_path / 'workers')
+    assert RenderCache(tmp_path / 'cache', blender_config.cache_max_bytes).stats() == {'hits': 1, 'misses': 3}
+
+
+def test_changed_blender_tools_is_a_miss(tmp_path):
+    cache = RenderCache(tmp_path / 'cache', 2**20)
+    blender_config = viz.BlenderConfig(blender_path='blender')
+    blender_tools_path = str(tmp_path / 'blender_tools.py')
+    shutil.copyfile(BLENDER_TOOLS_PATH, blender_tools_path)
+    key = cache.key(blender_config, {'Points': 'abc'}, blender_tools_path)
+    assert cache.key(blender_config, {'Points': 'abc'}, BLENDER_TOOLS_PATH) == key
+    with open(blender_tools_path, 'a') as f:
+        f.write('\n# Changed\n')
+    assert cache.key(blender_config, {'Points': 'abc'}, blender_tools_path) != key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    directory = tmp_path / 'render'
+    directory.mkdir()
+    (directory / 'out.png').write_bytes(b'\0' * 1000)
+    cache = RenderCache(tmp_path / 'cache', 3500)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.store(key, str(directory), ['out.png'])
+        os.utime(os.path.join(cache.cache_dir, key), (i, i))
+    assert [key for key, _, _ in cache.entries()] == ['a', 'b', 'c']
+
+    assert cache.restore('a', str(tmp_path / 'restored'))  # 'a' becomes the most recently used
+    cache.store('d', str(directory), ['out.png'])
+    assert [key for key, _, _ in cache.entries()] == ['c', 'a', 'd']
+    assert not cache.restore('b', str(tmp_path / 'restored'))
+
+    cache.max_bytes = 1500
+    cache.evict(keep='c')
+    assert [key for key, _, _ in cache.entries()] == ['c']
+    assert cache.stats() == {'hits': 1, 'misses': 1}
+
+
+def count_misses(cache_dir, num_counts):
+    cache = RenderCache(cache_dir, 2**20)
+    for _ in range(num_counts):
+        cache._count('misses')
+
+
+def test_counts_add_up_across_processes(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    with ProcessPoolExecutor(4) as executor:
+        list(executor.map(count_misses, [cache_dir] * 4, [50] * 4))
+    assert RenderCache(cache_dir, 2**20).stats() == {'hits': 0, 'misses': 200}
+    assert not os.path.exists(os.path.join(cache_dir, render_cache.STATS_LOCK_FILENAME))
@@ -0,0 +1,143 @@
+"""BlenderRenderPool jobs move through the pending/running/done directories of its queue."""
+import json
+import os
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+from pyviz3d.blender_render import BlenderRenderPool
+
+
+def save_scene(directory, blender_path, render=False, **kwargs):
+    v = viz.Visualizer()
+    v.add_points('Points', np.random.default_rng(0).random((100, 3)))
+    return v.save(str(directory), blender_config=viz.BlenderConfig(blender_path=blender_path, render=render),
+                  verbose=False, **kwargs)
+
+
+def queued(queue_dir, subdirectory):
+    return sorted(os.listdir(os.path.join(queue_dir, subdirectory)))
+
+
+@pytest.fixture
+def pool(tmp_path, fake_blender_path):
+    pool = BlenderRenderPool(fake_blender_path, num_workers=2, queue_dir=str(tmp_path / 'queue'), poll_interval=0.01)
+    yield pool
+    pool.close(timeout=30)
+
+
+def test_jobs_render_in_the_workers(tmp_path, fake_blender_path, pool):
+    directories = [str(tmp_path / ('scene_%d' % i)) for i in range(4)]
+    futures = [save_scene(directory, fake_blender_path, render=True, render_pool=pool, block=False)
+               for directory in directories]
+    results = [future.result(timeout=60) for future in futures]
+
+    worker_pids = {worker.pid for worker in pool.workers}
+    assert all(result['status'] == 'ok' and result['worker'] in worker_pids for result in results)
+    for directory in directories:
+        assert os.path.exists(os.path.join(directory, 'out.png'))
+    for subdirectory in ('pending', 'running', 'done'):
+        assert queued(pool.queue_dir, subdirectory) == []
+
+
+def test_failed_job_raises(tmp_path, fake_blender_path, pool):
+    directory = tmp_path / 'empty'
+    directory.mkdir()  # No nodes.json
+    job_id = pool.submit(str(directory), viz.BlenderConfig(blender_path=fake_blender_path))
+    with pytest.raises(RuntimeError, match='nodes.json'):
+        pool.result(job_id, timeout=60)
+    # The worker survives the failed job
+    directory = str(tmp_path / 'scene')
+    save_scene(directory, fake_blender_path)
+    assert pool.render(directory, viz.BlenderConfig(blender_path=fake_blender_path), timeout=60)['status'] == 'ok'
+
+
+def test_pending_job_can_be_cancelled(tmp_path, fake_blender_path):
+    # Without workers, the job stays pending
+    pool = BlenderRenderPool(fake_blender_path, num_workers=0, queue_dir=str(tmp_path / 'queue'))
+    job_id = pool.submit(str(tmp_path), viz.BlenderConfig(blender_path=fake_blender_path))
+    with open(os.path.join(pool.queue_dir, 'pending', job_id + '.json')) as f:
+        assert json.load(f) == {'directory': str(tmp_path), 'args': ['out']}
+    assert pool.cancel(job_id)
+    assert not pool.cancel(job_id)
+    assert queued(pool.queue_dir, 'pending') == []
+
+
+def test_worker_claims_job_by_moving_it_to_running(tmp_path, blender_tools, monkeypatch, fake_blender_path):
+    queue_dir = tmp_path / 'queue'
+    for subdirectory in ('pending', 'running', 'done'):
+        (queue_dir / subdirectory).mkdir(parents=True)
+    directory = str(tmp_path / 'scene')
+    save_scene(directory, fake_blender_path)
+    (queue_dir / 'pending' / 'job.json').write_text(json.dumps({'directory': directory, 'args': []}))
+
+    claimed = []
+    main = blender_tools.main
+
+    def record_claim(args):
+        claimed.append((queued(queue_dir, 'pending'), queued(queue_dir, 'running'), os.getcwd()))
+        main(args)
+    monkeypatch.setattr(blender_tools, 'main', record_claim)
+    (queue_dir / 'stop').touch()  # Returns once the queue is empty
+    blender_tools.worker_loop(str(queue_dir), poll_interval=0.01)
+
+    assert claimed == [([], ['%d_job.json' % os.getpid()], directory)]
+    assert queued(queue_dir, 'running') == []
+    with open(queue_dir / 'done' / 'job.json') as f:
+        result = json.load(f)
+    assert result['status'] == 'ok' and result['worker'] == os.getpid()
+
+
+def test_close_stops_the_workers(tmp_path, fake_blender_path):
+    pool = BlenderRenderPool(fake_blender_path, num_workers=2, queue_dir=str(tmp_path / 'queue'), poll_interval=0.01)
+    pool.close(timeout=30)
+    assert os.path.exists(os.path.join(pool.queue_dir, 'stop'))
+    assert [worker.returncode for worker in pool.workers] == [0, 0]
+
+
+def test_blender_path_is_split_like_a_command_line(tmp_path, fake_blender_path, monkeypatch):
+    monkeypatch.setenv('HOME', os.path.dirname(fake_blender_path))
+    pool = BlenderRenderPool('~/blender --factory-startup', num_workers=1, queue_dir=str(tmp_path / 'queue'),
+                             poll_interval=0.01)
+    pool.close(timeout=30)
+    assert [worker.args[:2] for worker in pool.workers] == [[fake_blender_path, '--factory-startup']]
+    assert [worker.returncode for worker in pool.workers] == [0]
+
+
+def save_slow_scene(directory, blender_path):
+    """Scene whose render takes about a second with FAKE_BLENDER_FRAME_SECONDS=0.05."""
+    save_scene(directory, blender_path)
+    with open(os.path.join(directory, 'blender_config.json')) as f:
+        blender_config = json.load(f)
+    blender_config.update(render=True, animation=True, animation_length=20,
+                          animation_camera_path=[[3.0, 0.0, 1.0], [0.0, 3.0, 1.0]])
+    with open(os.path.join(directory, 'blender_config.json'), 'w') as f:
+        json.dump(blender_config, f)
+
+
+def test_timeouts_report_whether_the_job_was_cancelled(tmp_path, fake_blender_path, monkeypatch):
+    monkeypatch.setenv('FAKE_BLENDER_FRAME_SECONDS', '0.05')
+    quick_directory, slow_directory = str(tmp_path / 'quick'), str(tmp_path / 'slow')
+    save_scene(quick_directory, fake_blender_path)
+    save_slow_scene(slow_directory, fake_blender_path)
+    blender_config = viz.BlenderConfig(blender_path=fake_blender_path)
+    pool = BlenderRenderPool(fake_blender_path, num_workers=1, queue_dir=str(tmp_path / 'queue'), poll_interval=0.01)
+    assert pool.render(quick_directory, blender_config, timeout=60)['status'] == 'ok'  # The worker is up and idle
+
+    # The worker claims the slow job before the timeout, so it cannot be cancelled
+    with pytest.raises(TimeoutError, match='still rendering'):
+        pool.render(slow_directory, blender_config, timeout=0.5)
+    # Queued behind the slow job
+    with pytest.raises(TimeoutError, match='removed from the queue'):
+        pool.render(quick_directory, blender_config, timeout=0.1)
+    assert queued(pool.queue_dir, 'pending') == []
+
+    # result() deletes the abandoned result, which is written before the next job finishes
+    assert pool.render(quick_directory, blender_config, timeout=60)['status'] == 'ok'
+    assert queued(pool.queue_dir, 'done') == []
+
+    # So does close()
+    with pytest.raises(TimeoutError, match='still rendering'):
+        pool.render(slow_directory, blender_config, timeout=0.5)
+    pool.close(timeout=60)
+    assert queued(pool.queue_dir, 'done') == []
@@ -0,0 +1,37 @@
+"""Peak memory of streamed point clouds is bounded by the chunk size."""
+import os
+import tracemalloc
+
+import numpy as np
+import pyviz3d as viz
+
+NUM_CHUNKS = 40
+CHUNK_SIZE = 50000  # 40 x 50000 points take 54 MB as float32 positions and normals plus colors
+MAX_PEAK_BYTES = 8 * 2**20
+
+
+def chunks():
+    rng = np.random.default_rng(0)
+    for _ in range(NUM_CHUNKS):
+        positions = rng.random((CHUNK_SIZE, 3), dtype=np.float32)
+        colors = rng.integers(0, 255, (CHUNK_SIZE, 3), dtype=np.uint8)
+        normals = rng.random((CHUNK_SIZE, 3), dtype=np.float32)
+        yield positions, colors, normals
+
+
+def test_stream_peak_memory_is_bounded(tmp_path):
+    v = viz.Visualizer()
+    tracemalloc.start()
+    try:
+        v.add_points_stream('Survey', chunks(), spool_dir=str(tmp_path))
+        v.save(str(tmp_path / 'scene'), verbose=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < MAX_PEAK_BYTES
+
+    num_points = NUM_CHUNKS * CHUNK_SIZE
+    assert os.path.getsize(tmp_path / 'scene' / 'Survey.bin') == num_points * (12 + 12 + 3)
+    first_chunk = next(chunks())
+    data = np.fromfile(tmp_path / 'scene' / 'Survey.bin', dtype=np.float32, count=CHUNK_SIZE * 3)
+    np.testing.assert_array_equal(data.reshape(-1, 3), first_chunk[0])
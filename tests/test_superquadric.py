@@ -0,0 +1,36 @@
+"""The vectorized superquadric meshing reproduces the loop-based meshing of PyViz3D 0.5.2."""
+import importlib.util
+import os
+
+import numpy as np
+import pytest
+from pyviz3d.superquadric import superquadric_mesh
+
+REFERENCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'benchmarks',
+                              'reference_superquadric.py')
+SHAPES = {
+    'plain': (np.array([1.0, 0.6, 0.4]), np.array([1.0, 1.0, 1.0]), None, None),
+    'box-like': (np.array([0.5, 0.5, 0.3]), np.array([0.1, 0.1, 0.1]), None, None),
+    'tapered': (np.array([0.3, 0.4, 1.0]), np.array([0.5, 0.8, 0.5]), np.array([0.3, -0.2]), None),
+    'bent': (np.array([0.3, 0.4, 1.0]), np.array([0.5, 0.8, 0.5]), None,
+             np.array([0.5, 0.3, 0.2, 1.0, 0.2, 1.0])),
+    'tapered, bent': (np.array([0.3, 0.4, 1.0]), np.array([0.5, 0.8, 0.5]), np.array([0.3, -0.2]),
+                      np.array([0.5, 0.3, 0.0, 0.0, 0.2, 1.0])),
+}
+
+
+@pytest.fixture(scope='module')
+def reference():
+    spec = importlib.util.spec_from_file_location('reference_superquadric', REFERENCE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize('shape', list(SHAPES))
+def test_matches_the_loop_reference(reference, shape):
+    scalings, exponents, tapering, bending = SHAPES[shape]
+    loop_vertices, loop_faces = reference.loop_superquadric_mesh(scalings, exponents, 20, tapering, bending)
+    vertices, faces = superquadric_mesh(scalings, exponents, 20, tapering, bending)
+    np.testing.assert_array_equal(faces, loop_faces)
+    np.testing.assert_allclose(vertices, loop_vertices, atol=1e-5)
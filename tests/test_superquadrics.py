@@ -0,0 +1,100 @@
+"""Superquadrics added with add_superquadrics() share mesh templates, see get_superquadrics() in scene.js."""
+import json
+
+import numpy as np
+import pyviz3d as viz
+from pyviz3d.superquadric import superquadric_mesh
+
+RESOLUTION = 20
+
+
+def quaternion_matrices(q):
+    x, y, z, w = q.T
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=-1),
+        np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=-1),
+        np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=-1)], axis=1)
+
+
+def read_superquadrics(directory, name):
+    """Decode the .bin at the offsets scene.js uses, returns the placed vertices, faces and color per instance."""
+    with open(directory / 'nodes.json') as f:
+        properties = json.load(f)[name]
+    with open(directory / properties['binary_filename'], 'rb') as f:
+        data = f.read()
+    n = properties['num_superquadrics']
+    base = properties.get('binary_offset', 0)  # In a packed container
+    offset = base + properties['instances_offset']
+    translations = np.frombuffer(data, np.float32, 3 * n, offset).reshape(-1, 3)
+    rotations = np.frombuffer(data, np.float32, 4 * n, offset + 12 * n).reshape(-1, 4)
+    scales = np.frombuffer(data, np.float32, 3 * n, offset + 28 * n).reshape(-1, 3)
+    colors = np.frombuffer(data, np.uint8, 3 * n, offset + 40 * n).reshape(-1, 3)
+    if 'binary_offset' not in properties:
+        assert len(data) == offset + 43 * n
+
+    instances = []
+    for num_vertices, num_faces, byte_offset, first_instance, num_instances in properties['templates']:
+        template_offset = base + byte_offset
+        vertices = np.frombuffer(data, np.float32, 3 * num_vertices, template_offset).reshape(-1, 3)
+        normals = np.frombuffer(data, np.float32, 3 * num_vertices, template_offset + 12 * num_vertices).reshape(-1, 3)
+        faces = np.frombuffer(data, np.uint32, 3 * num_faces, template_offset + 24 * num_vertices).reshape(-1, 3)
+        lengths = np.linalg.norm(normals, axis=1)
+        assert np.all((np.abs(lengths - 1.0) < 1e-5) | (lengths == 0.0))  # Zero at poles with only degenerate faces
+        for k in range(first_instance, first_instance + num_instances):
+            placed = (vertices * scales[k]) @ quaternion_matrices(rotations[k:k + 1])[0].T + translations[k]
+            instances.append((placed, faces, colors[k]))
+    return properties, instances
+
+
+def random_superquadrics(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rotations = rng.normal(size=(n, 4))
+    return dict(scalings=rng.random((n, 3)) + 0.2, exponents=np.tile([0.5, 0.8, 0.5], (n, 1)),
+                translations=rng.random((n, 3)) * 10, rotations=rotations,
+                colors=np.stack([np.arange(n), np.zeros(n), np.zeros(n)], axis=1))  # Red encodes the index
+
+
+def test_unbent_superquadrics_share_a_unit_template(tmp_path):
+    n = 20
+    parameters = random_superquadrics(n)
+    v = viz.Visualizer()
+    v.add_superquadrics('Superquadrics', resolution=RESOLUTION, **parameters)
+    v.save(str(tmp_path), verbose=False)
+    properties, instances = read_superquadrics(tmp_path, 'Superquadrics')
+
+    assert len(properties['templates']) == 1
+    assert sorted(int(color[0]) for _, _, color in instances) == list(range(n))
+    rotations = parameters['rotations'] / np.linalg.norm(parameters['rotations'], axis=1, keepdims=True)
+    for placed, _, color in instances:
+        i = int(color[0])
+        # Back in the local frame the vertices lie on the superquadric surface
+        local = (placed - parameters['translations'][i]) @ quaternion_matrices(rotations[i:i + 1])[0]
+        r, s, t = parameters['exponents'][i]
+        x, y, z = (np.abs(local) / parameters['scalings'][i]).T
+        implicit = (x ** (2 / s) + y ** (2 / s)) ** (s / r) + z ** (2 / t)
+        np.testing.assert_allclose(implicit, 1.0, atol=1e-3)
+
+
+def test_bent_and_tapered_templates(tmp_path):
+    n = 6
+    parameters = random_superquadrics(n, seed=1)
+    parameters['scalings'][:] = [0.3, 0.4, 1.0]
+    parameters['tapering'] = np.tile([0.3, -0.2], (n, 1))
+    parameters['bending'] = np.zeros((n, 6))
+    parameters['bending'][n // 2:] = [0.5, 0.3, 0.0, 0.0, 0.2, 1.0]  # Half of them bent
+    v = viz.Visualizer()
+    v.add_superquadrics('Superquadrics', resolution=RESOLUTION, **parameters)
+    v.save(str(tmp_path), verbose=False, packed=True)
+    properties, instances = read_superquadrics(tmp_path, 'Superquadrics')
+
+    assert len(properties['templates']) == 2
+    rotations = parameters['rotations'] / np.linalg.norm(parameters['rotations'], axis=1, keepdims=True)
+    for placed, faces, color in instances:
+        i = int(color[0])
+        if i < n // 2:
+            continue  # Scaled unit template, its sampling differs from the mesh at full size
+        vertices, expected_faces = superquadric_mesh(parameters['scalings'][i], parameters['exponents'][i],
+                                                     RESOLUTION, parameters['tapering'][i], parameters['bending'][i])
+        expected = vertices @ quaternion_matrices(rotations[i:i + 1])[0].T + parameters['translations'][i]
+        np.testing.assert_array_equal(faces, expected_faces)
+        np.testing.assert_allclose(placed, expected, atol=1e-4)
@@ -0,0 +1,73 @@
+"""Triangle meshes store vertices, normals, faces and colors at the offsets get_binary_mesh() in scene.js reads."""
+import json
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+
+
+def grid_mesh(size=7, seed=0):
+    """Height field over a size x size grid with two counter-clockwise triangles per cell."""
+    rng = np.random.default_rng(seed)
+    x, y = np.meshgrid(np.arange(size), np.arange(size), indexing='ij')
+    vertices = np.stack([x.ravel(), y.ravel(), rng.random(size * size)], axis=1)  # float64, saved as float32
+    corners = (x[:-1, :-1] * size + y[:-1, :-1]).ravel()
+    faces = np.concatenate([np.stack([corners, corners + size, corners + 1], axis=1),
+                            np.stack([corners + 1, corners + size, corners + size + 1], axis=1)])
+    return vertices, faces  # int64 faces, saved as uint32
+
+
+def read_mesh(directory, name):
+    """Decode the .bin the way get_binary_mesh() does, returns the properties and the arrays."""
+    with open(directory / 'nodes.json') as f:
+        properties = json.load(f)[name]
+    with open(directory / properties['binary_filename'], 'rb') as f:
+        data = f.read()
+    num_vertices, num_faces = properties['num_vertices'], properties['num_faces']
+    offset = properties.get('binary_offset', 0)  # In a packed container
+    vertices = np.frombuffer(data, np.float32, 3 * num_vertices, offset).reshape(-1, 3)
+    normals = np.frombuffer(data, np.float32, 3 * num_vertices, offset + 12 * num_vertices).reshape(-1, 3)
+    faces = np.frombuffer(data, np.uint32, 3 * num_faces, offset + 24 * num_vertices).reshape(-1, 3)
+    size = 24 * num_vertices + 12 * num_faces
+    colors = None
+    if properties['has_colors']:
+        colors = np.frombuffer(data, np.uint8, 3 * num_vertices, offset + size).reshape(-1, 3)
+        size += 3 * num_vertices
+    if 'binary_offset' not in properties:
+        assert len(data) == size
+    return properties, vertices, normals, faces, colors
+
+
+@pytest.mark.parametrize('packed', [False, True])
+def test_vertices_normals_faces_and_colors(tmp_path, packed):
+    vertices, faces = grid_mesh()
+    colors = np.random.default_rng(1).integers(0, 256, (len(vertices), 3))
+    normals = np.random.default_rng(2).normal(size=(len(vertices), 3))
+    v = viz.Visualizer()
+    v.add_points('Points', vertices)  # Puts the mesh at a non-zero offset of the packed container
+    v.add_triangle_mesh('Mesh', vertices, faces, vertex_colors=colors, vertex_normals=normals)
+    v.save(str(tmp_path), verbose=False, packed=packed)
+    properties, saved_vertices, saved_normals, saved_faces, saved_colors = read_mesh(tmp_path, 'Mesh')
+
+    assert properties['type'] == 'mesh' and properties['has_colors']
+    assert (properties['num_vertices'], properties['num_faces']) == (len(vertices), len(faces))
+    if packed:
+        assert properties['binary_offset'] > 0
+    np.testing.assert_array_equal(saved_vertices, vertices.astype(np.float32))
+    np.testing.assert_array_equal(saved_normals, normals.astype(np.float32))
+    np.testing.assert_array_equal(saved_faces, faces)
+    np.testing.assert_array_equal(saved_colors, colors)
+
+
+def test_computed_normals_without_colors(tmp_path):
+    vertices, faces = grid_mesh()
+    vertices[:, 2] = 0.0  # Flat, so every normal points up
+    v = viz.Visualizer()
+    v.add_triangle_mesh('Mesh', vertices, faces, color=[10, 20, 30])
+    v.save(str(tmp_path), verbose=False)
+    properties, _, normals, saved_faces, colors = read_mesh(tmp_path, 'Mesh')
+
+    assert not properties['has_colors'] and colors is None
+    assert properties['color'] == [10, 20, 30]
+    np.testing.assert_allclose(normals, np.tile([0.0, 0.0, 1.0], (len(vertices), 1)), atol=1e-6)
+    np.testing.assert_array_equal(saved_faces, faces)
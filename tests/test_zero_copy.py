@@ -0,0 +1,52 @@
+"""add_points() and save() keep memory-mapped inputs on disk."""
+import tracemalloc
+
+import numpy as np
+import pytest
+import pyviz3d as viz
+from pyviz3d import encoding
+
+NUM_POINTS = 2000000  # 54 MB of float32 positions and normals plus colors
+MAX_PEAK_BYTES = 8 * 2**20
+
+
+def memmap_arrays(directory, mode='r'):
+    rng = np.random.default_rng(0)
+    arrays = []
+    for key, dtype in (('positions', np.float32), ('colors', np.uint8), ('normals', np.float32)):
+        path = str(directory / (key + '.raw'))
+        rng.integers(0, 255, (NUM_POINTS, 3)).astype(dtype).tofile(path)
+        arrays.append(np.memmap(path, dtype=dtype, mode=mode, shape=(NUM_POINTS, 3)))
+    return arrays
+
+
+def test_memmap_points_peak_memory_is_bounded(tmp_path):
+    positions, colors, normals = memmap_arrays(tmp_path)
+    v = viz.Visualizer()
+    tracemalloc.start()
+    try:
+        v.add_points('Scan', positions, colors, normals)
+        v.save(str(tmp_path / 'scene'), verbose=False)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < MAX_PEAK_BYTES
+
+    data = np.fromfile(tmp_path / 'scene' / 'Scan.bin', dtype=np.uint8)
+    expected = np.concatenate([np.asarray(a).reshape(-1).view(np.uint8) for a in (positions, normals, colors)])
+    np.testing.assert_array_equal(data, expected)
+
+
+@pytest.mark.parametrize('mode', ['r', 'r+', 'c'])
+def test_write_array_uses_memmap_contents_in_memory(tmp_path, mode):
+    path = str(tmp_path / 'positions.raw')
+    np.arange(3000, dtype=np.float32).tofile(path)
+    positions = np.memmap(path, dtype=np.float32, mode=mode, shape=(1000, 3))
+    if mode != 'r':
+        positions[10:20] = -1.0  # Not yet written to the file, never for mode 'c'
+    with open(tmp_path / 'out.bin', 'wb') as f:
+        f.write(b'head')
+        encoding.write_array(f, positions[5:500])
+    data = np.fromfile(tmp_path / 'out.bin', dtype=np.uint8)
+    assert data[:4].tobytes() == b'head'
+    np.testing.assert_array_equal(data[4:].view(np.float32).reshape(-1, 3), positions[5:500])